@@ -4,20 +4,41 @@ matplotlib.use('Agg')
 # -*- coding: utf-8 -*-
 
 import argparse
+import asyncio
 import csv
 import os
 import sys
 import time
 import re
 import io
+import socket
 import json
+import multiprocessing
 import statistics
 import base64
+import codecs
+import hashlib
+import heapq
+import ipaddress
+import queue
+import random
+import threading
 import webbrowser
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait as wait_connections
 from datetime import datetime
-from urllib.parse import urljoin, urlparse, parse_qs
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, parse_qsl, urlencode
+from xml.etree import ElementTree
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from bs4 import BeautifulSoup
 from colorama import Fore, Style, init
 from tqdm import tqdm
@@ -25,1822 +46,6917 @@ from PIL import Image
 import matplotlib.pyplot as plt
 from jinja2 import Template, Environment, FileSystemLoader
 
+# Backend asyncio opcional: requer o pacote aiohttp
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# TTL real dos registros DNS no cache de resolução: requer o pacote dnspython
+try:
+    from dns import resolver as dns_resolver
+except ImportError:
+    dns_resolver = None
+
 # Inicializar colorama para formatação de saída colorida
 init(autoreset=True)
 
+class TransportError(requests.RequestException):
+    """
+    Erro de rede levantado pelos transportes que não usam requests,
+    para que o tratamento de erros seja o mesmo em todos os backends
+    """
+
 
-class WebsitePerformanceTester:
-    def __init__(self, url, output_dir="reports", progress_callback=None):
+class DeadlineExceeded(requests.Timeout):
+    """
+    O orçamento de tempo da análise (ou da fase atual) se esgotou
+    """
+
+
+class AnalysisDeadline:
+    """
+    Orçamento de tempo de uma análise, distribuído entre as fases
+
+    Ao iniciar, cada fase recebe uma fração do tempo que ainda resta; o que uma fase
+    não usa fica disponível para as seguintes. Sem orçamento (total=None) não há limite.
+    """
+    # Fração do tempo restante concedida a cada fase, na ordem em que são executadas
+    # (sem o HTML principal não há o que analisar, então ele pode usar todo o prazo)
+    PHASE_SHARES = {
+        'html': 1.0,
+        'scripts': 0.3,
+        'resources': 0.8,
+        'probe': 1.0,
+        # No modo pipeline as etapas são simultâneas e compartilham todo o prazo
+        'pipeline': 1.0,
+        # Medições repetidas (--samples): orçamento próprio, depois da análise
+        'sampling': 1.0
+    }
+
+    def __init__(self, total=None):
+        self.total = total
+        self.started_at = time.time()
+        self.ends_at = self.started_at + total if total else None
+        self.phase = None
+        self.phase_ends_at = self.ends_at
+
+    def start_phase(self, phase):
+        self.phase = phase
+        if self.ends_at is None:
+            return
+        remaining = max(0.0, self.ends_at - time.time())
+        self.phase_ends_at = time.time() + remaining * self.PHASE_SHARES.get(phase, 1.0)
+
+    def remaining(self):
+        """
+        Segundos restantes na fase atual (None = sem limite)
+        """
+        if self.phase_ends_at is None:
+            return None
+        return max(0.0, self.phase_ends_at - time.time())
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def clamp(self, timeout):
+        """
+        Limita um timeout ao tempo restante; levanta DeadlineExceeded se não resta tempo
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded(f"prazo da fase '{self.phase}' esgotado")
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+class FetchRequest:
+    """
+    Descreve uma requisição HTTP a ser executada por um transporte
+    """
+    def __init__(self, method, url, headers=None, timeout=10, allow_redirects=True,
+                 keep_body=True, max_bytes=None, deadline=None, on_body=None):
         """
-        Inicializa o testador de desempenho com a URL fornecida
-        
         Args:
-            url (str): URL do site a ser analisado
-            output_dir (str): Diretório onde os relatórios serão salvos
-            progress_callback (callable): Função de callback para atualizar o progresso
-                                        Recebe: (percent, message, resource_info)
+            keep_body (bool|callable): Se o corpo deve ser mantido em memória. Pode ser uma
+                                       função que recebe os cabeçalhos da resposta e decide.
+                                       Sem corpo, os bytes são apenas contados.
+            max_bytes (int): Limite de bytes lidos do corpo; acima dele a leitura é interrompida
+                             e o resultado é marcado como truncado
+            deadline (float): Instante (time.time()) após o qual a leitura é abandonada com
+                              DeadlineExceeded, mesmo que o servidor continue enviando dados
+            on_body (callable): Chamada com os cabeçalhos de uma resposta bem-sucedida
+                                (status < 400); pode retornar uma função que recebe cada
+                                bloco do corpo assim que ele chega
         """
+        self.method = method
         self.url = url
-        self.base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
-        self.domain = urlparse(url).netloc
-        self.progress_callback = progress_callback
-        # Carregar as configurações do arquivo config.json
-        self.config = self._load_config()
-        self.resources = {
-            "images": [],
-            "css": [],
-            "js": [],
-            "fonts": [],
-            "videos": [],
-            "others": []
-        }
-        # Novo dicionário para armazenar APIs e solicitações XHR/AJAX
-        self.apis = {
-            "xhr": [],      # XMLHttpRequests
-            "fetch": [],    # Fetch API calls
-            "json": [],     # JSON endpoints
-            "rest": [],     # RESTful APIs
-            "products": [], # APIs de produtos
-            "graphql": []   # GraphQL APIs
-        }
-        self.output_dir = output_dir
-        self.total_load_time = 0
-        self.page_size = 0
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/105.0.0.0 Safari/537.36',
-            'Accept': '*/*',  # Aceitar todos os tipos de conteúdo
-            'Accept-Language': 'en-US,en;q=0.9,pt;q=0.8'
-        })
-        
-        # Estatísticas gerais de HTTP
-        self.http_stats = {
-            "status_codes": {},
-            "content_types": {},
-            "response_times": [],
-            "total_requests": 0,
-            "failed_requests": 0
-        }
-        
-        # Carregar as configurações do arquivo config.json
-        self.config = self._load_config()
-        
-        # Lista para armazenar gráficos base64 para o relatório HTML
-        self.graph_images = {}
-        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Criar diretórios de relatórios se não existirem
-        self.graphs_dir = f"{output_dir}/graphs"
-        
-        # Primeiro, procurar templates no diretório do script
-        script_templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
-        
-        # Em seguida, verificar se existe o diretório "templates" no diretório atual (para o Flask)
-        current_templates_dir = os.path.join(os.getcwd(), "templates")
-        
-        # Usar o diretório de templates que contém o arquivo report_template.html
-        if os.path.exists(os.path.join(current_templates_dir, "report_template.html")):
-            self.templates_dir = current_templates_dir
-        else:
-            self.templates_dir = script_templates_dir
-            
-        print(f"Usando diretório de templates: {self.templates_dir}")
-            
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        if not os.path.exists(self.graphs_dir):
-            os.makedirs(self.graphs_dir)
-    
-    def _load_config(self):
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.allow_redirects = allow_redirects
+        self.keep_body = keep_body
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.on_body = on_body
+
+    def effective_timeout(self):
         """
-        Carrega as configurações do arquivo config.json
+        Timeout a usar no envio: o configurado, limitado ao que resta até o prazo
+
+        Calculado no momento do envio, pois a requisição pode ter esperado na fila
+        de concorrência desde que foi criada.
         """
-        default_config = {
-            "theme": "default",  # Tema padrão (claro)
-        }
-        
-        config_file = "config.json"
-        
-        try:
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                print(f"{Fore.GREEN}Configurações carregadas de {config_file}")
-                # Mesclar com valores padrão para garantir que todas as configurações existam
-                merged_config = {**default_config, **config}
-                return merged_config
-            else:
-                print(f"{Fore.YELLOW}Arquivo de configuração não encontrado. Usando configurações padrão.")
-                return default_config
-        except Exception as e:
-            print(f"{Fore.RED}Erro ao carregar configurações: {e}. Usando configurações padrão.")
-            return default_config
+        if self.deadline is None:
+            return self.timeout
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            raise DeadlineExceeded("prazo esgotado antes do envio da requisição")
+        return remaining if self.timeout is None else min(self.timeout, remaining)
 
-    def analyze_website(self):
+
+class FetchResult:
+    """
+    Resposta HTTP normalizada, independente do transporte que a executou
+    """
+    def __init__(self, url, status_code, headers, content, load_time,
+                 time_to_first_byte, redirects=0, encoding=None,
+                 size=None, truncated=False, body_kept=True,
+                 timings=None, connection_reused=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        # load_time vai do envio da requisição ao último byte do corpo
+        self.load_time = load_time
+        self.time_to_first_byte = time_to_first_byte
+        self.redirects = redirects
+        self.encoding = encoding
+        # Bytes lidos do corpo, mesmo quando o corpo não foi mantido em memória
+        self.size = len(content) if size is None else size
+        self.truncated = truncated
+        self.body_kept = body_kept
+        # Duração de cada fase da rede em segundos: dns, connect, tls, wait
+        # (espera do servidor até o primeiro byte) e download. None = não medido.
+        self.timings = timings or {}
+        self.connection_reused = connection_reused
+        # Reenvios feitos após 429/503 com Retry-After (HostConcurrencyController)
+        self.throttle_retries = 0
+
+    @property
+    def time_to_last_byte(self):
+        return self.load_time
+
+    @property
+    def throughput(self):
         """
-        Analisa o site e coleta informações sobre seus recursos
+        Vazão do download do corpo em bytes por segundo
         """
-        print(f"{Fore.CYAN}Analisando o site: {self.url}")
-        start_time = time.time()
-        
+        download_time = self.load_time - self.time_to_first_byte
+        if download_time <= 0:
+            download_time = self.load_time
+        return self.size / download_time if download_time > 0 else 0
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+# Fases de rede medidas pelos transportes, na ordem em que acontecem
+NETWORK_PHASES = ('dns', 'connect', 'tls', 'wait', 'download')
+
+
+class DnsCache:
+    """
+    Cache de resolução DNS compartilhado pelos transportes de uma análise
+
+    prefetch() resolve vários hosts ao mesmo tempo em um pool de threads; as conexões
+    abertas depois usam o endereço em cache em vez de resolver o nome de novo. Cada
+    host é resolvido uma única vez mesmo quando várias conexões pedem o mesmo nome
+    simultaneamente. As entradas valem pelo TTL do registro DNS (lido com o pacote
+    opcional dnspython, em segundo plano depois da resolução) ou por default_ttl
+    segundos; falhas ficam em cache por NEGATIVE_TTL segundos.
+
+    O tempo de uma resolução antecipada não aparece em nenhuma conexão, então ele é
+    atribuído, uma única vez, à fase DNS da primeira conexão aberta para o host,
+    preservando o tempo de um carregamento sem cache de DNS. Com exclude_from_timings,
+    a fase DNS é descontada de todas as requisições, para que os tempos possam ser
+    comparados entre execuções independentemente do estado dos caches de DNS.
+    """
+    NEGATIVE_TTL = 5
+
+    def __init__(self, default_ttl=60, max_workers=16, exclude_from_timings=False):
+        self.default_ttl = default_ttl
+        self.exclude_from_timings = exclude_from_timings
+        self.started_at = time.time()
+        self._entries = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    @staticmethod
+    def is_ip_address(host):
         try:
-            # Atualizar progresso - Iniciando análise
-            if self.progress_callback:
-                self.progress_callback(5, "Iniciando requisição para o site...", {"url": self.url})
-            
-            # Requisição inicial para obter o HTML da página
-            response = self.session.get(self.url)
-            response.raise_for_status()
-            
-            # Tempo de carregamento do HTML inicial
-            html_load_time = time.time() - start_time
-            self.page_size = len(response.content)
-            
-            print(f"{Fore.GREEN}HTML carregado em {html_load_time:.2f} segundos")
-            print(f"{Fore.GREEN}Tamanho da página HTML: {self.page_size/1024:.2f} KB")
-            
-            # Atualizar progresso - HTML carregado
-            if self.progress_callback:
-                self.progress_callback(15, "HTML principal carregado, analisando conteúdo...", 
-                                     {"size": f"{self.page_size/1024:.2f} KB", 
-                                      "time": f"{html_load_time:.2f} s"})
-            
-            # Registrar a requisição inicial nas estatísticas HTTP
-            self._record_http_stats(response, html_load_time)
-            
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Atualizar progresso - Extração de recursos
-            if self.progress_callback:
-                self.progress_callback(25, "Extraindo informações sobre recursos (imagens, scripts, estilos)...", {})
-            
-            # Extrair recursos
-            self._extract_resources(soup)
-            
-            # Atualizar progresso - Detecção de APIs
-            if self.progress_callback:
-                self.progress_callback(60, "Analisando possíveis APIs e endpoints...", {})
-                
-            # Procurar possíveis APIs no JavaScript
-            self._detect_apis(soup)
-            
-            # Analisar recursos encontrados e suas respostas HTTP
-            self._analyze_resources()
-            
-            # Tentar acessar API endpoints conhecidos comuns
-            self._probe_common_api_endpoints()
-            
-            # Analisar URLs para identificar padrões de API
-            self._analyze_urls_for_api_patterns()
-            
-            # Calcular tempo total de carregamento
-            self.total_load_time = time.time() - start_time
-            print(f"{Fore.CYAN}Análise concluída em {self.total_load_time:.2f} segundos")
-            
-        except requests.RequestException as e:
-            print(f"{Fore.RED}Erro ao acessar o site: {e}")
-            self.http_stats["failed_requests"] += 1
-            sys.exit(1)
-    
-    def _record_http_stats(self, response, load_time):
+            ipaddress.ip_address(host.strip('[]'))
+            return True
+        except ValueError:
+            return False
+
+    def _host_stats(self, host):
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = {'lookups': 0, 'hits': 0, 'source': None, 'dns_time': None, 'addresses': [],
+                     'ttl': None, 'ttl_source': None, 'resolved_at': None, 'error': None, 'charged': False}
+            self._stats[host] = stats
+        return stats
+
+    def prefetch(self, hosts):
         """
-        Registra estatísticas de respostas HTTP
+        Inicia a resolução dos hosts que ainda não estão em cache, sem esperar por ela
         """
-        status_code = response.status_code
-        content_type = response.headers.get('content-type', 'unknown').split(';')[0]
-        
-        # Incrementar contador de status code
-        self.http_stats["status_codes"][status_code] = self.http_stats["status_codes"].get(status_code, 0) + 1
-        
-        # Incrementar contador de content type
-        self.http_stats["content_types"][content_type] = self.http_stats["content_types"].get(content_type, 0) + 1
-        
-        # Adicionar tempo de resposta
-        self.http_stats["response_times"].append(load_time)
-        
-        # Incrementar total de requisições
-        self.http_stats["total_requests"] += 1
-    
-    def _detect_apis(self, soup):
+        with self._lock:
+            for host in hosts:
+                if host and not self.is_ip_address(host):
+                    self._entry(host, 'antecipada')
+
+    def _entry(self, host, source):
         """
-        Analisa o JavaScript da página para detectar padrões de chamadas de API
+        Entrada válida do host; inicia a resolução se não houver (chamado com o lock)
         """
-        print(f"{Fore.YELLOW}Procurando por chamadas de API no código JavaScript...")
-        
-        # Examinar scripts incorporados
-        for script in soup.find_all('script'):
-            if script.string:
-                self._analyze_js_for_api_calls(script.string)
-        
-        # Baixar e analisar arquivos JavaScript externos
-        for script in soup.find_all('script', src=True):
-            src = script.get('src')
-            if src:
-                try:
-                    full_url = urljoin(self.url, src)
-                    response = self.session.get(full_url, timeout=10)
-                    if response.status_code == 200:
-                        self._analyze_js_for_api_calls(response.text, full_url)
-                except Exception as e:
-                    print(f"{Fore.RED}Erro ao analisar script externo {src}: {e}")
-    
-    def _analyze_js_for_api_calls(self, js_content, script_url=None):
+        entry = self._entries.get(host)
+        if entry is not None and (entry['expires_at'] is None or entry['expires_at'] > time.time()):
+            return entry, False
+        entry = {'future': self._executor.submit(self._lookup, host, source), 'expires_at': None}
+        self._entries[host] = entry
+        return entry, True
+
+    def _lookup(self, host, source):
+        start_time = time.perf_counter()
+        error = None
+        try:
+            addresses = socket.getaddrinfo(host, 0, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            addresses, error = None, e
+        dns_time = time.perf_counter() - start_time
+        # O TTL do registro é consultado depois, em outra tarefa: as conexões esperam por
+        # este future, e as consultas A/AAAA extras inflariam a fase DNS delas
+        ttl, ttl_source = (self.default_ttl, 'padrão') if addresses else (self.NEGATIVE_TTL, 'falha')
+        with self._lock:
+            entry = self._entries[host]
+            entry['expires_at'] = time.time() + ttl
+            stats = self._host_stats(host)
+            stats.update({
+                'source': source, 'dns_time': dns_time, 'ttl': ttl, 'ttl_source': ttl_source,
+                'resolved_at': round(time.time() - self.started_at, 3),
+                'addresses': sorted({address[4][0] for address in addresses or []}),
+                'error': str(error) if error else None, 'charged': False
+            })
+        if error is not None:
+            raise error
+        if dns_resolver is not None:
+            try:
+                self._executor.submit(self._update_ttl, host, entry)
+            except RuntimeError:
+                # Cache já fechado: a entrada fica com default_ttl
+                pass
+        return addresses, dns_time
+
+    def _update_ttl(self, host, entry):
         """
-        Analisa o conteúdo JavaScript para encontrar padrões de chamadas de API
+        Troca o default_ttl da entrada pelo TTL do registro DNS (consultado com dnspython)
         """
-        # Padrões para detectar chamadas de API em JavaScript
-        api_patterns = {
-            "fetch": r'fetch\([\'"]([^\'"]+)[\'"]',
-            "xhr": r'\.open\([\'"](?:GET|POST|PUT|DELETE)[\'"],\s*[\'"]([^\'"]+)[\'"]',
-            "ajax": r'\.ajax\(\s*{\s*url:\s*[\'"]([^\'"]+)[\'"]',
-            "axios": r'axios\.(?:get|post|put|delete)\([\'"]([^\'"]+)[\'"]',
-            "api_url": r'(?:api_url|apiUrl|API_URL|url|URL)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
-            "endpoint": r'(?:endpoint|Endpoint|ENDPOINT)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
-            "service_url": r'(?:service|serviceUrl|service_url)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
-            "graphql": r'(?:graphql|GraphQL)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
-            "products": r'(?:products|product|productId|productIds)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]'
-        }
-        
-        for pattern_name, pattern in api_patterns.items():
-            matches = re.findall(pattern, js_content)
-            for match in matches:
-                full_url = urljoin(self.url, match)
-                
-                # Determinar o tipo de API com base no padrão e URL
-                api_type = "xhr"  # Padrão
-                
-                # Verificar se é uma API de produtos (muito comum em sites de e-commerce)
-                if "product" in match.lower() or "sku" in match.lower() or "catalog" in match.lower():
-                    api_type = "products"
-                # Verificar se é API JSON ou API REST
-                elif "json" in match.lower() or "api" in match.lower():
-                    api_type = "json"
-                elif "/api/" in match or "/v1/" in match or "/v2/" in match or "/rest/" in match:
-                    api_type = "rest"
-                elif "/graphql" in match.lower() or "/gql" in match.lower():
-                    api_type = "graphql"
-                elif pattern_name == "fetch":
-                    api_type = "fetch"
-                elif pattern_name == "products":
-                    api_type = "products"
-                
-                # Adicionar à lista apropriada se ainda não existe
-                if full_url not in [api["url"] for api in self.apis[api_type]]:
-                    self.apis[api_type].append({
-                        "url": full_url,
-                        "pattern_detected": pattern_name,
-                        "source_script": script_url,
-                        "analyzed": False
-                    })
-    
-    def _probe_common_api_endpoints(self):
+        ttls = []
+        for record_type in ('A', 'AAAA'):
+            try:
+                ttls.append(dns_resolver.resolve(host, record_type).rrset.ttl)
+            except Exception:
+                continue
+        if not ttls:
+            return
+        with self._lock:
+            # A entrada pode ter expirado e sido substituída enquanto isso
+            if self._entries.get(host) is not entry:
+                return
+            entry['expires_at'] = time.time() + min(ttls)
+            self._stats[host].update({'ttl': min(ttls), 'ttl_source': 'registro DNS'})
+
+    def resolve(self, host, port):
         """
-        Tenta acessar endpoints comuns de API para verificar existência
+        Endereços do host no formato de socket.getaddrinfo, usando o cache
+
+        Raises:
+            socket.gaierror: Se o nome não puder ser resolvido
         """
-        print(f"{Fore.YELLOW}Verificando endpoints comuns de API...")
-        
-        common_endpoints = [
-            "/api",
-            "/api/v1",
-            "/api/v2",
-            "/v1",
-            "/v2",
-            "/rest",
-            "/graphql",
-            "/data",
-            "/service",
-            "/services",
-            "/wp-json",  # WordPress REST API
-            "/produtos",  # Produtos (PT)
-            "/products",  # Produtos (EN)
-            "/product",   # Produto singular
-            "/catalog",   # Catálogo 
-            "/catalogo",  # Catálogo (PT)
-            "/vitrine",   # Vitrine (PT)
-            "/showcase"   # Vitrine (EN)
-        ]
-        
-        for endpoint in common_endpoints:
-            try:
-                url = urljoin(self.url, endpoint)
-                start_time = time.time()
-                response = self.session.get(url, timeout=5, allow_redirects=False)
-                load_time = time.time() - start_time
-                
-                # Registrar estatísticas HTTP
-                self._record_http_stats(response, load_time)
-                
-                # Verificar se parece uma API por tipo de conteúdo ou status code
-                is_api = False
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'application/json' in content_type or 'application/xml' in content_type:
-                    is_api = True
-                elif response.status_code == 200:
-                    # Tentar analisar como JSON
-                    try:
-                        json_data = response.json()
-                        is_api = True
-                    except:
-                        pass
-                
-                if is_api:
-                    api_type = "rest" if "json" in content_type else "xhr"
-                    self.apis[api_type].append({
-                        "url": url,
-                        "pattern_detected": "common_endpoint",
-                        "status_code": response.status_code,
-                        "content_type": content_type,
-                        "load_time": load_time,
-                        "size": len(response.content),
-                        "analyzed": True
-                    })
-            except Exception as e:
-                # Ignorar erros silenciosamente durante a sondagem
-                pass
-    
-    def _analyze_urls_for_api_patterns(self):
+        if self.is_ip_address(host):
+            return socket.getaddrinfo(host.strip('[]'), port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            entry, started = self._entry(host, 'conexão')
+            stats = self._host_stats(host)
+            stats['lookups'] += 1
+            if not started:
+                stats['hits'] += 1
+        addresses, _ = entry['future'].result()
+        return [(family, socktype, proto, canonname, (sockaddr[0], port) + tuple(sockaddr[2:]))
+                for family, socktype, proto, canonname, sockaddr in addresses]
+
+    def timing_adjustment(self, host, measured):
         """
-        Analisa todas as URLs dos recursos para identificar padrões comuns de API
+        Ajuste da fase DNS de uma conexão que levou measured segundos resolvendo o host
+
+        Returns:
+            float: -measured se o DNS fica fora dos tempos; senão, na primeira conexão, a
+                   parte da resolução antecipada que a conexão não esperou, e 0 nas demais
         """
-        print(f"{Fore.YELLOW}Analisando URLs para identificar possíveis APIs...")
-        
-        # Padrões comuns que indicam que uma URL é uma API
-        api_url_patterns = [
-            r'\.json($|\?)',                    # Termina com .json
-            r'/api/',                           # Contém /api/
-            r'/rest/',                          # Contém /rest/
-            r'/graphql',                        # GraphQL endpoint
-            r'/v[0-9]+/',                       # Versão da API (/v1/, /v2/, etc)
-            r'/product(?:s|os)?/',              # Produtos (inglês/português)
-            r'/catalog(?:o)?/',                 # Catálogo (inglês/português)
-            r'/data/',                          # Endpoint de dados
-            r'/services?/',                     # Serviços
-            r'/[^/]+\.php\?',                   # Script PHP com parâmetros
-            r'/(?:get|fetch|search|query)[A-Z]' # getNomeRecurso, fetchData, etc
-        ]
+        if self.exclude_from_timings:
+            return -measured
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None or stats['source'] != 'antecipada' or stats['charged'] or stats['error']:
+                return 0.0
+            stats['charged'] = True
+            # A conexão que esperou uma resolução ainda em andamento já mediu parte dela
+            return max(0.0, stats['dns_time'] - measured)
+
+    def report(self):
+        """
+        Resolução de cada host: tempo, endereços, TTL, origem, consultas e acertos
+        """
+        with self._lock:
+            return {
+                host: {key: value for key, value in stats.items() if key != 'charged'}
+                for host, stats in self._stats.items()
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class AioDnsCacheResolver:
+    """
+    Resolvedor do aiohttp (interface de aiohttp.abc.AbstractResolver) que usa o DnsCache
+    """
+    def __init__(self, dns_cache):
+        self.dns_cache = dns_cache
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        loop = asyncio.get_running_loop()
+        # socket.gaierror é um OSError: o aiohttp o converte em ClientConnectorDNSError
+        addresses = await loop.run_in_executor(None, self.dns_cache.resolve, host, port)
+        return [
+            {'hostname': host, 'host': sockaddr[0], 'port': sockaddr[1], 'family': address_family,
+             'proto': proto, 'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV}
+            for address_family, _, proto, _, sockaddr in addresses
+            if family in (0, socket.AF_UNSPEC, address_family)
+        ]
+
+    async def close(self):
+        pass
+
+
+# Contexto das requisições feitas na thread atual pelo RequestsTransport: as conexões
+# de um pool compartilhado entre análises resolvem nomes pelo DnsCache da análise
+# que as abriu, e não de quem criou o pool
+_connection_context = threading.local()
+
+
+class _TimedConnectionMixin:
+    """
+    Mede resolução DNS, conexão TCP e handshake TLS das conexões do urllib3
+
+    As durações ficam na própria conexão; ``pft_fresh`` indica que ela acabou de ser
+    aberta e ainda não teve suas fases atribuídas a uma resposta. Os nomes são
+    resolvidos pelo DnsCache da requisição em andamento na thread, se houver.
+    """
+    pft_fresh = False
+    pft_phases = None
+    # Quando a conexão voltou ao pool (time.monotonic()); None enquanto está em uso
+    pft_idle_since = None
+
+    def _new_conn(self):
+        resolver = getattr(_connection_context, 'resolver', None)
+        dns_start = time.perf_counter()
+        try:
+            if resolver is not None:
+                addresses = resolver.resolve(self._dns_host, self.port)
+            else:
+                addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Deixar o urllib3 produzir o erro de resolução padrão
+            return super()._new_conn()
+        dns_time = time.perf_counter() - dns_start
+        # Resolução antecipada atribuída à conexão, ou DNS descontado dos tempos (ver DnsCache)
+        dns_adjustment = resolver.timing_adjustment(self._dns_host, dns_time) if resolver is not None else 0.0
+
+        connect_start = time.perf_counter()
+        original_host = self._dns_host
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except Exception as e:
+                    last_error = e
+            else:
+                raise last_error
+        finally:
+            self._dns_host = original_host
+
+        self.pft_phases = {'dns': dns_time + dns_adjustment, 'connect': time.perf_counter() - connect_start,
+                           'tls': 0.0, 'dns_adjustment': dns_adjustment}
+        return sock
+
+    def connect(self):
+        start_time = time.perf_counter()
+        super().connect()
+        total = time.perf_counter() - start_time
+        phases = self.pft_phases or {'dns': 0.0, 'connect': total, 'tls': 0.0}
+        if isinstance(self, HTTPSConnection):
+            measured_dns = phases['dns'] - phases.get('dns_adjustment', 0.0)
+            phases['tls'] = max(0.0, total - measured_dns - phases['connect'])
+        self.pft_phases = phases
+        self.pft_fresh = True
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedPoolMixin:
+    """
+    Contagem de conexões novas e reaproveitadas e fechamento de conexões ociosas
+
+    Uma conexão parada no pool há mais de ``pft_idle_timeout`` segundos é fechada em
+    vez de reaproveitada (o servidor provavelmente já a encerrou), e a requisição abre
+    uma nova.
+    """
+    pft_idle_timeout = None
+    pft_stats = None
+
+    def _pft_idle_expired(self, conn, now):
+        return (self.pft_idle_timeout is not None and conn.pft_idle_since is not None
+                and getattr(conn, 'sock', None) is not None
+                and now - conn.pft_idle_since > self.pft_idle_timeout)
+
+    def _pft_count(self, event):
+        if self.pft_stats is not None:
+            self.pft_stats.count(f"{self.host}:{self.port}", event)
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        if self._pft_idle_expired(conn, time.monotonic()):
+            conn.close()
+            self._pft_count('idle_closed')
+        conn.pft_idle_since = None
+        self._pft_count('reused' if getattr(conn, 'sock', None) is not None else 'new')
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn.pft_idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+    def pft_close_idle(self):
+        """
+        Fecha as conexões ociosas paradas no pool; retorna quantas foram fechadas
+        """
+        if self.pft_idle_timeout is None:
+            return 0
+        held = []
+        try:
+            while True:
+                held.append(self.pool.get(block=False))
+        except (queue.Empty, AttributeError):
+            # AttributeError: pool fechado (self.pool é None)
+            pass
+        now = time.monotonic()
+        closed = 0
+        for conn in held:
+            if conn is not None and self._pft_idle_expired(conn, now):
+                conn.close()
+                self._pft_count('idle_closed')
+                closed += 1
+        # Devolver na ordem original (a fila é LIFO)
+        for conn in reversed(held):
+            try:
+                self.pool.put(conn, block=False)
+            except (queue.Full, AttributeError):
+                if conn is not None:
+                    conn.close()
+        return closed
+
+
+class TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class ConnectionPoolStats:
+    """
+    Uso das conexões de um pool por host: novas, reaproveitadas e fechadas por ociosidade
+    """
+    EVENTS = ('new', 'reused', 'idle_closed')
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def count(self, host, event):
+        with self._lock:
+            counts = self._hosts.setdefault(host, dict.fromkeys(self.EVENTS, 0))
+            counts[event] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {host: dict(counts) for host, counts in self._hosts.items()}
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter cujas conexões registram a duração de DNS, TCP e TLS
+
+    Conta por host as conexões novas e reaproveitadas (pool_stats) e, com idle_timeout,
+    fecha as que ficaram ociosas por mais tempo que isso. Essas opções vão como
+    atributos de subclasses dos pools, pois o urllib3 não aceita parâmetros
+    desconhecidos nas chaves dos pools.
+    """
+    def __init__(self, *args, idle_timeout=None, **kwargs):
+        # init_poolmanager é chamado pelo construtor do HTTPAdapter
+        self.idle_timeout = idle_timeout
+        self.pool_stats = ConnectionPoolStats()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(pool_class.__name__, (pool_class,),
+                         {'pft_idle_timeout': self.idle_timeout, 'pft_stats': self.pool_stats})
+            for scheme, pool_class in (('http', TimedHTTPConnectionPool), ('https', TimedHTTPSConnectionPool))
+        }
+
+    def close_idle_connections(self):
+        """
+        Fecha as conexões ociosas de todos os hosts; retorna quantas foram fechadas
+        """
+        pools = self.poolmanager.pools
+        with pools.lock:
+            host_pools = list(pools._container.values())
+        return sum(pool.pft_close_idle() for pool in host_pools)
+
+
+class SharedConnectionPool:
+    """
+    Conexões HTTP mantidas entre as análises do processo (backend requests)
+
+    No app Flask cada análise cria seu próprio testador; com este pool, as conexões
+    TCP/TLS abertas por uma análise ficam disponíveis para as seguintes nos mesmos
+    hosts (ex.: CDNs de várias páginas de uma loja). Cada host mantém até
+    pool_maxsize conexões e até max_hosts hosts ficam em memória (os menos usados são
+    descartados); conexões ociosas por mais de idle_timeout segundos são fechadas.
+    Análises que precisam de números de primeira visita não usam o pool.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, pool_maxsize=16, max_hosts=100, idle_timeout=60):
+        self.pool_maxsize = pool_maxsize
+        self.max_hosts = max_hosts
+        self.idle_timeout = idle_timeout
+        self.adapter = TimingHTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_maxsize,
+                                         idle_timeout=idle_timeout)
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, **kwargs):
+        """
+        Pool único do processo; os argumentos valem apenas na primeira chamada
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(**kwargs)
+            return cls._shared
+
+    def mount(self, session):
+        """
+        Faz a sessão usar as conexões do pool, fechando antes as que estão ociosas
+        """
+        self.adapter.close_idle_connections()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        with self._lock:
+            self.jobs += 1
+
+    def stats(self):
+        """
+        Configuração do pool, análises atendidas e uso das conexões por host
+        """
+        return {
+            'jobs': self.jobs,
+            'pool_maxsize': self.pool_maxsize,
+            'max_hosts': self.max_hosts,
+            'idle_timeout': self.idle_timeout,
+            'hosts': self.adapter.pool_stats.snapshot()
+        }
+
+    def close(self):
+        self.adapter.close()
+
+
+class StreamedBody:
+    """
+    Acumula um corpo de resposta lido em blocos
+
+    Conta os bytes recebidos, guarda o conteúdo apenas se solicitado e interrompe
+    a leitura ao atingir o limite de bytes, para que arquivos grandes (ex.: vídeos)
+    não sejam carregados inteiros na memória.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, keep, max_bytes=None, deadline=None, consumer=None):
+        self.keep = keep
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.consumer = consumer
+        self.size = 0
+        self.truncated = False
+        self._chunks = []
+
+    def feed(self, chunk):
+        """
+        Adiciona um bloco; retorna False quando a leitura deve ser interrompida
+        """
+        if self.deadline is not None and time.time() > self.deadline:
+            raise DeadlineExceeded("prazo esgotado durante o download do corpo")
+        if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            self.truncated = True
+        self.size += len(chunk)
+        if self.keep:
+            self._chunks.append(chunk)
+        if self.consumer is not None:
+            self.consumer(chunk)
+        return not self.truncated
+
+    @property
+    def content(self):
+        return b''.join(self._chunks)
+
+
+class BaseTransport:
+    """
+    Interface comum dos transportes HTTP
+
+    A análise de um recurso é escrita como um gerador que entrega FetchRequest
+    via ``yield`` e recebe de volta o FetchResult (ou a exceção do transporte).
+    Assim a mesma lógica roda tanto no pool de threads quanto no event loop.
+    """
+    name = None
+
+    def __init__(self, default_headers):
+        self.default_headers = default_headers
+
+    def _merge_headers(self, headers):
+        merged = dict(self.default_headers)
+        merged.update(headers or {})
+        return merged
+
+    @staticmethod
+    def _body_for(fetch_request, status_code, response_headers):
+        keep_body = fetch_request.keep_body
+        if callable(keep_body):
+            keep_body = keep_body(response_headers)
+        consumer = None
+        if fetch_request.on_body is not None and status_code < 400:
+            consumer = fetch_request.on_body(response_headers)
+        return StreamedBody(bool(keep_body), fetch_request.max_bytes, fetch_request.deadline, consumer)
+
+    def request(self, fetch_request):
+        raise NotImplementedError
+
+    def run(self, steps, request=None):
+        """
+        Executa um gerador de requisições de forma síncrona e retorna seu resultado
+        """
+        request = request or self.request
+        try:
+            fetch_request = next(steps)
+            while True:
+                try:
+                    result = request(fetch_request)
+                except Exception as e:
+                    fetch_request = steps.throw(e)
+                else:
+                    fetch_request = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def open_batch(self, max_workers, max_per_host, controller=None):
+        """
+        Abre um FetchBatch: geradores de requisições executados respeitando os limites
+        de concorrência, que podem ser adicionados enquanto os anteriores executam
+
+        Args:
+            controller (HostConcurrencyController): Limite adaptativo por host, usado no
+                                                    lugar do limite fixo max_per_host
+        """
+        raise NotImplementedError
+
+    def run_many(self, jobs, max_workers, max_per_host, on_done=None, controller=None):
+        """
+        Executa vários geradores de requisições respeitando os limites de concorrência
+        """
+        batch = self.open_batch(max_workers, max_per_host, controller)
+        try:
+            for steps in jobs:
+                batch.submit(steps, on_done)
+            batch.join()
+        finally:
+            batch.close()
+
+    def close(self):
+        pass
+
+
+class FetchBatch:
+    """
+    Conjunto dinâmico de geradores de requisições em execução em um transporte
+
+    submit() pode ser chamado a qualquer momento, inclusive de dentro de um gerador
+    ou do on_done de outro job; join() espera até que não reste nenhum job pendente.
+    """
+    def __init__(self):
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._error = None
+
+    def submit(self, steps, on_done=None):
+        with self._idle:
+            self._pending += 1
+        self._start(steps, on_done)
+
+    def _start(self, steps, on_done):
+        raise NotImplementedError
+
+    def _finished(self, error=None):
+        # Chamado depois do on_done, para que os jobs que ele adicionar já estejam pendentes
+        with self._idle:
+            self._pending -= 1
+            if error is not None and self._error is None:
+                self._error = error
+            self._idle.notify_all()
+
+    def join(self):
+        """
+        Espera todos os jobs; levanta a primeira exceção não tratada por um gerador
+        """
+        with self._idle:
+            while self._pending:
+                self._idle.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        pass
+
+
+class ThreadFetchBatch(FetchBatch):
+    """
+    FetchBatch do RequestsTransport: um gerador por vez em cada thread do pool
+    """
+    def __init__(self, transport, max_workers, max_per_host, controller=None):
+        super().__init__()
+        self.transport = transport
+        self.max_per_host = max_per_host
+        self.controller = controller
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _limited_request(self, fetch_request):
+        if self.controller is not None:
+            return self.controller.request(self.transport.request, fetch_request)
+        with self.transport._get_host_semaphore(fetch_request.url, self.max_per_host):
+            return self.transport.request(fetch_request)
+
+    def _start(self, steps, on_done):
+        self._executor.submit(self._run_job, steps, on_done)
+
+    def _run_job(self, steps, on_done):
+        error = None
+        try:
+            self.transport.run(steps, self._limited_request)
+            if on_done:
+                on_done()
+        except Exception as e:
+            error = e
+        finally:
+            self._finished(error)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class AsyncioFetchBatch(FetchBatch):
+    """
+    FetchBatch do AsyncioTransport: cada gerador vira uma tarefa no event loop
+    """
+    def __init__(self, transport, max_workers, max_per_host, controller=None):
+        super().__init__()
+        self.transport = transport
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.controller = controller
+        # Criados no event loop, na primeira requisição
+        self._global_semaphore = None
+        self._host_semaphores = {}
+
+    async def _limited_request(self, fetch_request):
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_workers)
+        if self.controller is not None:
+            async with self._global_semaphore:
+                return await self.controller.arequest(self.transport.arequest, fetch_request)
+        host = urlparse(fetch_request.url).netloc
+        host_semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with self._global_semaphore, host_semaphore:
+            return await self.transport.arequest(fetch_request)
+
+    def _start(self, steps, on_done):
+        asyncio.run_coroutine_threadsafe(self._run_job(steps, on_done), self.transport._loop)
+
+    async def _run_job(self, steps, on_done):
+        error = None
+        try:
+            await self.transport._arun(steps, self._limited_request)
+            if on_done:
+                on_done()
+        except Exception as e:
+            error = e
+        finally:
+            self._finished(error)
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Transporte baseado em requests.Session, com concorrência via pool de threads
+    """
+    name = "requests"
+
+    def __init__(self, session, dns_cache=None):
+        super().__init__(session.headers)
+        self.session = session
+        self.dns_cache = dns_cache
+        self._lock = threading.Lock()
+        self._host_semaphores = {}
+
+    def request(self, fetch_request):
+        timeout = fetch_request.effective_timeout()
+        # Lido pelas conexões abertas por esta requisição (ver _TimedConnectionMixin)
+        _connection_context.resolver = self.dns_cache
+        start_time = time.time()
+        response = self.session.request(
+            fetch_request.method, fetch_request.url,
+            headers=fetch_request.headers,
+            timeout=timeout,
+            allow_redirects=fetch_request.allow_redirects,
+            stream=True
+        )
+        headers_time = time.time() - start_time
+        time_to_first_byte = response.elapsed.total_seconds()
+        timings, connection_reused = self._connection_phases(response, time_to_first_byte)
+        # Ajuste da fase DNS (DnsCache) aplicado também ao TTFB e ao tempo total
+        dns_adjustment = timings.pop('dns_adjustment', 0.0)
+        time_to_first_byte += dns_adjustment
+        headers_time += dns_adjustment
+        start_time -= dns_adjustment
+        try:
+            body = self._body_for(fetch_request, response.status_code, response.headers)
+            for chunk in response.iter_content(chunk_size=StreamedBody.CHUNK_SIZE):
+                if not body.feed(chunk):
+                    break
+        finally:
+            response.close()
+        load_time = time.time() - start_time
+        timings['download'] = max(0.0, load_time - headers_time)
+        return FetchResult(
+            url=response.url,
+            status_code=response.status_code,
+            headers=response.headers,
+            content=body.content,
+            load_time=load_time,
+            time_to_first_byte=time_to_first_byte,
+            redirects=len(response.history),
+            encoding=response.encoding,
+            size=body.size,
+            truncated=body.truncated,
+            body_kept=body.keep,
+            timings=timings,
+            connection_reused=connection_reused
+        )
+
+    @staticmethod
+    def _connection_phases(response, time_to_first_byte):
+        """
+        Lê as fases de DNS/TCP/TLS da conexão usada pela resposta (última em caso de
+        redirecionamento). Conexões reaproveitadas não têm essas fases.
+        """
+        raw = response.raw
+        connection = getattr(raw, 'connection', None) or getattr(raw, '_connection', None)
+        phases = getattr(connection, 'pft_phases', None)
+        if connection is None or phases is None:
+            # Conexão sem instrumentação (ex.: adaptador personalizado)
+            return {'dns': None, 'connect': None, 'tls': None, 'wait': time_to_first_byte}, None
+        if connection.pft_fresh:
+            connection.pft_fresh = False
+            timings = dict(phases)
+            connection_reused = False
+        else:
+            timings = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+            connection_reused = True
+        # O ajuste da fase DNS (DnsCache) não faz parte do tempo medido
+        dns_adjustment = timings.pop('dns_adjustment', 0.0)
+        timings['wait'] = max(0.0, time_to_first_byte - (timings['dns'] - dns_adjustment)
+                              - timings['connect'] - timings['tls'])
+        timings['dns_adjustment'] = dns_adjustment
+        return timings, connection_reused
+
+    def _get_host_semaphore(self, url, max_per_host):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(max_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def open_batch(self, max_workers, max_per_host, controller=None):
+        return ThreadFetchBatch(self, max_workers, max_per_host, controller)
+
+
+class AsyncioTransport(BaseTransport):
+    """
+    Transporte baseado em asyncio/aiohttp: centenas de requisições simultâneas
+    em um único event loop, executado em uma thread dedicada
+    """
+    name = "asyncio"
+
+    def __init__(self, default_headers, max_connections=200, dns_cache=None):
+        if aiohttp is None:
+            raise RuntimeError("O backend asyncio requer o pacote aiohttp (pip install aiohttp)")
+        super().__init__(default_headers)
+        self.max_connections = max_connections
+        self.dns_cache = dns_cache
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _get_session(self):
+        if self._session is None:
+            if self.dns_cache is not None:
+                # Cache próprio do aiohttp desligado: vale o TTL do DnsCache
+                connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=0,
+                                                 resolver=AioDnsCacheResolver(self.dns_cache),
+                                                 use_dns_cache=False)
+            else:
+                connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=0)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  trace_configs=[self._timing_trace_config(self.dns_cache)])
+        return self._session
+
+    @staticmethod
+    def _timing_trace_config(dns_cache=None):
+        """
+        Hooks do aiohttp que medem DNS e conexão de cada requisição. O aiohttp abre
+        TCP e TLS numa única etapa, então o TLS fica incluído em 'connect'. Com
+        dns_cache, a resolução antecipada do host é atribuída à primeira conexão.
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_dns_start(session, context, params):
+            context.trace_request_ctx['dns_start'] = time.perf_counter()
+
+        async def on_dns_end(session, context, params):
+            phases = context.trace_request_ctx
+            dns_time = time.perf_counter() - phases.pop('dns_start', time.perf_counter())
+            phases['dns'] += dns_time
+            if dns_cache is not None:
+                dns_adjustment = dns_cache.timing_adjustment(params.host, dns_time)
+                phases['dns'] += dns_adjustment
+                phases['dns_adjustment'] += dns_adjustment
+
+        async def on_connection_start(session, context, params):
+            context.trace_request_ctx['connection_start'] = time.perf_counter()
+
+        async def on_connection_end(session, context, params):
+            phases = context.trace_request_ctx
+            phases['connect'] += time.perf_counter() - phases.pop('connection_start', time.perf_counter())
+            phases['reused'] = False
+
+        async def on_connection_reused(session, context, params):
+            context.trace_request_ctx['reused'] = True
+
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connection_start)
+        trace_config.on_connection_create_end.append(on_connection_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        return trace_config
+
+    async def arequest(self, fetch_request):
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(total=fetch_request.effective_timeout())
+        phases = {'dns': 0.0, 'dns_adjustment': 0.0, 'connect': 0.0, 'reused': None}
+        start_time = time.time()
+        try:
+            async with session.request(
+                fetch_request.method, fetch_request.url,
+                headers=self._merge_headers(fetch_request.headers),
+                allow_redirects=fetch_request.allow_redirects,
+                timeout=timeout,
+                trace_request_ctx=phases
+            ) as response:
+                # Ajuste da fase DNS (DnsCache) aplicado também ao TTFB e ao tempo total
+                start_time -= phases['dns_adjustment']
+                time_to_first_byte = time.time() - start_time
+                headers = requests.structures.CaseInsensitiveDict(response.headers)
+                body = self._body_for(fetch_request, response.status, headers)
+                async for chunk in response.content.iter_chunked(StreamedBody.CHUNK_SIZE):
+                    if not body.feed(chunk):
+                        break
+                load_time = time.time() - start_time
+                return FetchResult(
+                    url=str(response.url),
+                    status_code=response.status,
+                    headers=headers,
+                    content=body.content,
+                    load_time=load_time,
+                    time_to_first_byte=time_to_first_byte,
+                    redirects=len(response.history),
+                    encoding=response.charset,
+                    size=body.size,
+                    truncated=body.truncated,
+                    body_kept=body.keep,
+                    timings={
+                        'dns': phases['dns'],
+                        # Inclui o handshake TLS (não separável no aiohttp)
+                        'connect': max(0.0, phases['connect'] - (phases['dns'] - phases['dns_adjustment'])),
+                        'tls': None,
+                        'wait': max(0.0, time_to_first_byte - phases['dns_adjustment'] - phases['connect']),
+                        'download': max(0.0, load_time - time_to_first_byte)
+                    },
+                    connection_reused=phases['reused']
+                )
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(f"tempo limite excedido ({timeout.total:.1f}s)") from e
+        except aiohttp.ClientError as e:
+            raise TransportError(str(e) or e.__class__.__name__) from e
+
+    def request(self, fetch_request):
+        return self._submit(self.arequest(fetch_request))
+
+    async def _arun(self, steps, request):
+        try:
+            fetch_request = next(steps)
+            while True:
+                try:
+                    result = await request(fetch_request)
+                except Exception as e:
+                    fetch_request = steps.throw(e)
+                else:
+                    fetch_request = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def open_batch(self, max_workers, max_per_host, controller=None):
+        return AsyncioFetchBatch(self, max_workers, max_per_host, controller)
+
+    def close(self):
+        if self._session is not None:
+            self._submit(self._session.close())
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class HostConcurrencyController:
+    """
+    Limite de requisições simultâneas por host ajustado durante a análise (AIMD)
+
+    Cada host começa com o limite inicial. Enquanto o tempo até o primeiro byte (TTFB)
+    se mantém próximo do menor valor observado, o limite cresce cerca de uma unidade
+    por rodada de respostas (aumento aditivo). Respostas 429/503, erros de conexão e
+    TTFB em alta reduzem o limite (redução multiplicativa); um Retry-After pausa o host
+    pelo tempo indicado e a requisição é reenviada em seguida. O limite em que o host
+    respondeu 429/503 não é mais alcançado, evitando novas rodadas de bloqueio. Cada mudança de limite
+    fica registrada na linha do tempo do host, para distinguir limitação imposta pelo
+    servidor de lentidão real.
+    """
+    THROTTLE_STATUS = (429, 503)
+    # Fator de redução em 429/503 e erros de conexão, e quando o TTFB sobe
+    THROTTLE_DECREASE = 0.5
+    LATENCY_DECREASE = 0.75
+    # TTFB considerado estável: até LATENCY_TOLERANCE x o menor TTFB (+ margem em segundos)
+    LATENCY_TOLERANCE = 2.0
+    LATENCY_MARGIN = 0.02
+    TTFB_SMOOTHING = 0.3
+    # Reenvios após Retry-After e maior espera aceita (acima disso a resposta é mantida)
+    MAX_RETRIES = 2
+    MAX_RETRY_AFTER = 30
+
+    def __init__(self, initial=4, max_limit=32, min_limit=1):
+        self.initial = initial
+        self.max_limit = max(max_limit, initial)
+        self.min_limit = min_limit
+        self.started_at = time.time()
+        self._hosts = {}
+        self._lock = threading.Condition()
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                'limit': float(self.initial), 'ceiling': None, 'in_flight': 0, 'blocked_until': 0.0,
+                'ttfb_min': None, 'ttfb_ewma': None, 'last_decrease': 0.0,
+                'peak': self.initial, 'responses': 0, 'throttled': 0, 'retries': 0, 'errors': 0,
+                'timeline': [(0.0, self.initial, 'início')], 'async_waiters': []
+            }
+            self._hosts[host] = state
+        return state
+
+    def _try_acquire(self, state):
+        """
+        Ocupa uma vaga; senão devolve quanto esperar (None = até uma vaga ser liberada)
+        """
+        now = time.time()
+        if state['blocked_until'] > now:
+            return state['blocked_until'] - now
+        if state['in_flight'] < int(state['limit']):
+            state['in_flight'] += 1
+            return 0
+        return None
+
+    def acquire(self, host):
+        with self._lock:
+            state = self._state(host)
+            while True:
+                delay = self._try_acquire(state)
+                if delay == 0:
+                    return
+                self._lock.wait(delay)
+
+    async def aacquire(self, host):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                state = self._state(host)
+                delay = self._try_acquire(state)
+                if delay == 0:
+                    return
+                waiter = loop.create_future()
+                state['async_waiters'].append(waiter)
+            try:
+                await asyncio.wait_for(waiter, delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _wake(self, state):
+        self._lock.notify_all()
+        waiters, state['async_waiters'] = state['async_waiters'], []
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(lambda w=waiter: w.done() or w.set_result(None))
+
+    def _set_limit(self, state, limit, reason):
+        previous = int(state['limit'])
+        state['limit'] = min(float(self.max_limit), max(float(self.min_limit), limit))
+        if int(state['limit']) != previous:
+            state['peak'] = max(state['peak'], int(state['limit']))
+            state['timeline'].append((round(time.time() - self.started_at, 3), int(state['limit']), reason))
+
+    def _decrease(self, state, factor, reason):
+        # No máximo uma redução por rodada: as respostas já em andamento refletem o limite anterior
+        now = time.time()
+        if now - state['last_decrease'] < max(state['ttfb_ewma'] or 0.0, 0.1):
+            return False
+        state['last_decrease'] = now
+        self._set_limit(state, state['limit'] * factor, reason)
+        return True
+
+    @staticmethod
+    def _retry_after(headers):
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def release(self, host, result=None, error=None):
+        """
+        Libera a vaga e ajusta o limite com o resultado da requisição
+
+        Returns:
+            bool: True se a requisição deve ser reenviada (Retry-After aceito)
+        """
+        retry = False
+        with self._lock:
+            state = self._state(host)
+            state['in_flight'] -= 1
+            if error is not None:
+                # Prazo da análise esgotado não diz nada sobre o servidor
+                if not isinstance(error, DeadlineExceeded):
+                    state['errors'] += 1
+                    self._decrease(state, self.THROTTLE_DECREASE, 'erro de conexão')
+            elif result.status_code in self.THROTTLE_STATUS:
+                state['throttled'] += 1
+                throttled_at = int(state['limit'])
+                if self._decrease(state, self.THROTTLE_DECREASE, f'status {result.status_code}'):
+                    state['ceiling'] = max(self.min_limit, throttled_at - 1)
+                retry_after = self._retry_after(result.headers)
+                if retry_after is not None and retry_after <= self.MAX_RETRY_AFTER:
+                    state['blocked_until'] = max(state['blocked_until'], time.time() + retry_after)
+                    state['timeline'].append((round(time.time() - self.started_at, 3), int(state['limit']),
+                                              f'Retry-After {retry_after:.1f}s'))
+                    retry = True
+            else:
+                state['responses'] += 1
+                ttfb = result.time_to_first_byte
+                state['ttfb_min'] = ttfb if state['ttfb_min'] is None else min(state['ttfb_min'], ttfb)
+                state['ttfb_ewma'] = ttfb if state['ttfb_ewma'] is None else \
+                    state['ttfb_ewma'] + self.TTFB_SMOOTHING * (ttfb - state['ttfb_ewma'])
+                if state['ttfb_ewma'] > state['ttfb_min'] * self.LATENCY_TOLERANCE + self.LATENCY_MARGIN:
+                    self._decrease(state, self.LATENCY_DECREASE, 'TTFB em alta')
+                elif state['in_flight'] + 1 >= int(state['limit']):
+                    # Só cresce quando o limite atual está de fato em uso
+                    limit = state['limit'] + 1 / state['limit']
+                    if state['ceiling'] is not None:
+                        limit = min(limit, state['ceiling'])
+                    self._set_limit(state, limit, 'TTFB estável')
+            self._wake(state)
+        return retry
+
+    def request(self, send, fetch_request):
+        """
+        Executa send(fetch_request) dentro do limite do host, reenviando após Retry-After
+        """
+        host = urlparse(fetch_request.url).netloc
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.acquire(host)
+            try:
+                result = send(fetch_request)
+            except Exception as e:
+                self.release(host, error=e)
+                raise
+            if not self.release(host, result) or attempt == self.MAX_RETRIES:
+                break
+            self._count_retry(host)
+        result.throttle_retries = attempt
+        return result
+
+    async def arequest(self, send, fetch_request):
+        host = urlparse(fetch_request.url).netloc
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self.aacquire(host)
+            try:
+                result = await send(fetch_request)
+            except Exception as e:
+                self.release(host, error=e)
+                raise
+            if not self.release(host, result) or attempt == self.MAX_RETRIES:
+                break
+            self._count_retry(host)
+        result.throttle_retries = attempt
+        return result
+
+    def _count_retry(self, host):
+        with self._lock:
+            self._state(host)['retries'] += 1
+
+    def snapshot(self):
+        """
+        Estado de cada host: limite final e máximo, TTFB, eventos e linha do tempo
+        """
+        with self._lock:
+            return {
+                host: {
+                    'limit': int(state['limit']),
+                    'peak': state['peak'],
+                    'ceiling': state['ceiling'],
+                    'ttfb_min': state['ttfb_min'],
+                    'ttfb_ewma': state['ttfb_ewma'],
+                    'responses': state['responses'],
+                    'throttled': state['throttled'],
+                    'retries': state['retries'],
+                    'errors': state['errors'],
+                    'timeline': list(state['timeline'])
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências em buckets logarítmicos (no estilo HDR), em memória constante
+
+    Os valores são registrados em microssegundos. Até SUB_BUCKETS µs cada valor tem
+    seu bucket; acima disso, cada potência de 2 é dividida em SUB_BUCKETS / 2 buckets,
+    então o erro relativo de qualquer percentil fica abaixo de 1% e uma hora cabe em
+    menos de 2 mil buckets, não importa quantas amostras. Contagem, soma, mínimo e
+    máximo são exatos. Histogramas de threads, processos (são serializáveis) ou
+    páginas diferentes são somados com merge().
+    """
+    SUB_BUCKETS = 128
+    PERCENTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, micros):
+        if micros < cls.SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - cls.SUB_BUCKETS.bit_length() + 1
+        half = cls.SUB_BUCKETS // 2
+        return cls.SUB_BUCKETS + (shift - 1) * half + (micros >> shift) - half
+
+    @classmethod
+    def _bucket_value(cls, index):
+        """
+        Ponto médio do bucket, em segundos
+        """
+        if index < cls.SUB_BUCKETS:
+            return index / 1e6
+        half = cls.SUB_BUCKETS // 2
+        shift = (index - cls.SUB_BUCKETS) // half + 1
+        low = ((index - cls.SUB_BUCKETS) % half + half) << shift
+        return (low + (1 << shift) / 2) / 1e6
+
+    def record(self, seconds, count=1):
+        seconds = max(0.0, seconds)
+        index = self._index(int(seconds * 1e6))
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += seconds * count
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        """
+        Soma as amostras de outro histograma a este
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    @classmethod
+    def merged(cls, histograms):
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, fraction):
+        """
+        Latência em segundos abaixo da qual está a fração pedida das amostras (ex.: 0.99)
+        """
+        if not self.count:
+            return 0
+        target = max(1, fraction * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self):
+        """
+        Resumo com contagem, média, mínimo, máximo e os percentis de PERCENTILES
+        """
+        summary = {'count': self.count, 'mean': self.mean, 'min': self.min or 0, 'max': self.max or 0}
+        for fraction in self.PERCENTILES:
+            summary[self.percentile_label(fraction)] = self.percentile(fraction)
+        return summary
+
+    @staticmethod
+    def percentile_label(fraction):
+        return f"p{fraction * 100:g}"
+
+
+class ResourceRecord:
+    """
+    Registro de um recurso medido, com os campos lidos pelos relatórios
+
+    Os dicionários de self.resources continuam sendo a forma de trabalho durante a
+    análise (cada etapa grava neles os campos que quiser) e não são descartados; o
+    ResourceRecord é a cópia de atributos fixos (__slots__) que os relatórios leem.
+    Os campos que só aparecem no CSV ficam em details, na ordem de DETAIL_FIELDS.
+    """
+    # Resumo das medições repetidas (--samples)
+    SAMPLE_FIELDS = ('load_time_cold', 'load_time_median', 'load_time_p25', 'load_time_p75', 'load_time_iqr',
+                     'load_time_cv', 'load_time_warm_min', 'load_time_warm_max')
+    DETAIL_FIELDS = ('server', 'etag', 'expires', 'last_modified', 'content_encoding', 'element_type', 'media',
+                     'integrity', 'async', 'defer', 'type', 'alt_text', 'loading', 'redirects',
+                     'img_width', 'img_height', 'img_format', 'img_mode', 'img_colors', 'img_aspect_ratio',
+                     'error', 'connection', 'x_content_type_options', 'strict_transport_security',
+                     'access_control_allow_origin', 'from_response_cache', 'fetch_strategy', 'round_trips',
+                     'bytes_transferred', 'img_metadata_only', 'img_error', 'time_to_last_byte',
+                     'throughput_kbps', 'truncated', 'skipped', 'alias_of', 'throttle_retries',
+                     'warm_samples', 'sample_errors', 'samples_skipped') + SAMPLE_FIELDS
+    __slots__ = ('resource_type', 'url', 'size', 'load_time', 'robust_time', 'load_time_cold',
+                 'load_time_iqr', 'load_time_cv', 'time_to_first_byte', 'status_code', 'content_type',
+                 'cache_control', 'connection_reused', 'phase_times', 'alias', 'shared_asset', 'details')
+
+    def __init__(self, resource_type, resource):
+        self.resource_type = resource_type
+        self.url = resource.get('url', 'N/A')
+        self.size = resource.get('size') or 0
+        self.load_time = resource.get('load_time') or 0
+        # Tempo usado nos rankings: a mediana das medições quentes (--samples), se houver
+        self.robust_time = resource.get('load_time_median', self.load_time)
+        self.load_time_cold = resource.get('load_time_cold', self.load_time)
+        self.load_time_iqr = resource.get('load_time_iqr')
+        self.load_time_cv = resource.get('load_time_cv')
+        self.time_to_first_byte = resource.get('time_to_first_byte') or 0
+        self.status_code = resource.get('status_code')
+        self.content_type = resource.get('content_type')
+        self.cache_control = resource.get('cache_control') or ''
+        self.connection_reused = resource.get('connection_reused')
+        # Uma duração por fase de NETWORK_PHASES (None = não medida)
+        self.phase_times = tuple(resource.get(f'{phase}_time') for phase in NETWORK_PHASES)
+        self.alias = 'alias_of' in resource
+        self.shared_asset = bool(resource.get('shared_asset'))
+        # Campos ausentes do dicionário ficam como None (célula vazia no CSV)
+        self.details = tuple(resource.get(field) for field in self.DETAIL_FIELDS)
+
+    @property
+    def cached(self):
+        return 'max-age' in self.cache_control
+
+    def detail(self, field, default=None):
+        value = self.details[self.DETAIL_FIELDS.index(field)]
+        return default if value is None else value
+
+
+class ResourceTypeStats:
+    """
+    Totais de um tipo de recurso (images, css, js...) acumulados por ResourceSummary
+    """
+    __slots__ = ('count', 'size', 'load_time', 'robust_time', 'timed', 'timed_total', 'timed_max',
+                 'ttfb_count', 'ttfb_total', 'formats', 'no_alt_text', 'async_scripts', 'defer_scripts')
+
+    def __init__(self):
+        self.count = 0
+        self.size = 0
+        self.load_time = 0.0
+        self.robust_time = 0.0
+        # Apenas recursos com tempo medido (load_time > 0), usados nos gráficos
+        self.timed = 0
+        self.timed_total = 0.0
+        self.timed_max = 0.0
+        self.ttfb_count = 0
+        self.ttfb_total = 0.0
+        self.formats = {}
+        self.no_alt_text = 0
+        self.async_scripts = 0
+        self.defer_scripts = 0
+
+    @property
+    def avg_time(self):
+        return self.robust_time / self.count if self.count else 0
+
+    @property
+    def avg_timed(self):
+        return self.timed_total / self.timed if self.timed else 0
+
+    @property
+    def avg_ttfb(self):
+        return self.ttfb_total / self.ttfb_count if self.ttfb_count else 0
+
+
+class ResourceSummary:
+    """
+    Registros compactos e estatísticas agregadas dos recursos de uma página
+
+    Uma única passada por self.resources produz os ResourceRecord e todos os totais que
+    os relatórios (HTML, CSV, tabelas, gráficos e resumo no terminal) usam: tamanho e
+    tempo por tipo, recursos com cache e comprimidos, lentos, compartilhados e as
+    contagens específicas de imagens e scripts. add() também pode ser chamado à medida
+    que os recursos ficam prontos.
+    """
+    SLOW_THRESHOLD = 0.5
+
+    def __init__(self):
+        self.records = []
+        self.by_type = {}
+        # Totais apenas dos recursos que não são outra referência (alias_of) a uma URL
+        # já medida; os aliases entram só em records, para as linhas dos relatórios
+        self.unique = 0
+        self.unique_size = 0
+        self.load_time = 0.0
+        self.cached = 0
+        self.compressed = 0
+        self.slow = 0
+        self.shared_assets = 0
+
+    @classmethod
+    def from_resources(cls, resources):
+        summary = cls()
+        for resource_type, type_resources in resources.items():
+            for resource in type_resources:
+                summary.add(resource_type, resource)
+        return summary
+
+    def add(self, resource_type, resource):
+        record = ResourceRecord(resource_type, resource)
+        self.records.append(record)
+        if record.alias:
+            return record
+        stats = self.by_type.get(resource_type)
+        if stats is None:
+            stats = self.by_type[resource_type] = ResourceTypeStats()
+        stats.count += 1
+        stats.size += record.size
+        stats.load_time += record.load_time
+        stats.robust_time += record.robust_time
+        if record.load_time > 0:
+            stats.timed += 1
+            stats.timed_total += record.load_time
+            stats.timed_max = max(stats.timed_max, record.load_time)
+        if record.time_to_first_byte:
+            stats.ttfb_count += 1
+            stats.ttfb_total += record.time_to_first_byte
+        if resource_type == 'images':
+            image_format = resource.get('img_format', 'Unknown')
+            stats.formats[image_format] = stats.formats.get(image_format, 0) + 1
+            if not resource.get('alt_text'):
+                stats.no_alt_text += 1
+        elif resource_type == 'js':
+            if resource.get('async') == 'async':
+                stats.async_scripts += 1
+            if resource.get('defer') == 'defer':
+                stats.defer_scripts += 1
+        
+        self.unique += 1
+        self.unique_size += record.size
+        self.load_time += record.load_time
+        if record.cached:
+            self.cached += 1
+        if resource.get('content_encoding') not in ['none', None, '']:
+            self.compressed += 1
+        if record.robust_time > self.SLOW_THRESHOLD:
+            self.slow += 1
+        if record.shared_asset:
+            self.shared_assets += 1
+        return record
+
+    def percent(self, count):
+        return count / self.unique * 100 if self.unique else 0
+
+    def _measured(self):
+        return (record for record in self.records if not record.alias)
+
+    def slowest(self, limit=10):
+        return heapq.nlargest(limit, self._measured(), key=lambda record: record.robust_time)
+
+    def largest(self, limit=10):
+        return heapq.nlargest(limit, self._measured(), key=lambda record: (record.size, record.robust_time))
+
+
+class ResponseCache:
+    """
+    Cache de respostas por URL compartilhado entre as etapas de uma análise
+
+    Guarda o FetchResult da primeira requisição real (corpo, cabeçalhos e tempos)
+    para que etapas posteriores não baixem o mesmo recurso de novo. O total de bytes
+    armazenados é limitado; ao exceder o limite, as entradas menos usadas recentemente
+    são descartadas.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            result = self._entries.get(url)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return result
+
+    def put(self, url, result):
+        # Só respostas completas e com corpo em memória podem ser reaproveitadas
+        if not result.body_kept or result.truncated:
+            return
+        size = len(result.content)
+        # Corpos maiores que o limite total nunca são armazenados
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self.current_bytes -= len(previous.content)
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted.content)
+                self.evictions += 1
+            self._entries[url] = result
+            self.current_bytes += size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Forma canônica de uma URL para deduplicação
+
+    Remove o fragmento e a porta padrão do esquema, coloca esquema e host em
+    minúsculas e ordena os parâmetros da query string.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    if parsed.username:
+        userinfo = parsed.username + (f":{parsed.password}" if parsed.password else '')
+        netloc = f"{userinfo}@{netloc}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, query, ''))
+
+
+class UrlRegistry:
+    """
+    Índice de URLs de recursos e APIs com deduplicação em tempo constante
+
+    Cada URL normalizada tem uma entrada principal, a única requisitada. Quando a
+    mesma URL aparece em outro grupo (ex.: <img> e <source>, ou recurso e API), a
+    nova entrada vira um alias: é listada no seu grupo, mas não é requisitada, e
+    recebe os resultados da principal em propagate().
+    """
+    NEW = 'new'
+    DUPLICATE = 'duplicate'
+    ALIAS = 'alias'
+
+    def __init__(self):
+        self._primary = {}
+        self._groups = {}
+        self._aliases = []
+        self._lock = threading.Lock()
+
+    def register(self, group, entry):
+        """
+        Registra a entrada no grupo informado
+
+        Returns:
+            str: NEW (entrada principal, deve ser requisitada), ALIAS (URL já conhecida
+                 em outro grupo; entrada marcada com 'alias_of') ou DUPLICATE (URL já
+                 presente no mesmo grupo; a entrada deve ser descartada)
+        """
+        key = normalize_url(entry['url'])
+        with self._lock:
+            primary = self._primary.get(key)
+            if primary is None:
+                self._primary[key] = entry
+                self._groups[key] = [group]
+                return self.NEW
+            if group in self._groups[key]:
+                return self.DUPLICATE
+            self._groups[key].append(group)
+            entry['alias_of'] = primary['url']
+            self._aliases.append((entry, primary))
+            return self.ALIAS
+
+    def __contains__(self, url):
+        return normalize_url(url) in self._primary
+
+    def contains(self, group, url):
+        groups = self._groups.get(normalize_url(url))
+        return groups is not None and group in groups
+
+    def groups(self, url):
+        """
+        Grupos em que a URL aparece, na ordem em que foi encontrada
+        """
+        return list(self._groups.get(normalize_url(url), []))
+
+    def propagate(self):
+        """
+        Copia para cada alias os resultados obtidos pela entrada principal
+        """
+        with self._lock:
+            for alias, primary in self._aliases:
+                for key, value in primary.items():
+                    alias.setdefault(key, value)
+
+
+class SharedAssetResults:
+    """
+    Medições de recursos compartilhadas pelas páginas de uma varredura do site
+
+    A primeira página que encontra uma URL (normalizada) a mede; as demais recebem
+    uma cópia do resultado, então um bundle presente em todas as páginas é baixado
+    uma única vez por varredura. Guarda também em quantas páginas cada URL apareceu.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def claim(self, url):
+        """
+        Registra a URL em mais uma página
+
+        Returns:
+            bool: True se quem chamou deve medir o recurso e depois chamar publish()
+        """
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = {'done': threading.Event(), 'fields': None, 'pages': 1}
+                return True
+            entry['pages'] += 1
+            self.hits += 1
+            return False
+
+    def publish(self, url, fields):
+        entry = self._entries[normalize_url(url)]
+        entry['fields'] = fields
+        entry['done'].set()
+
+    def wait(self, url, timeout=None):
+        """
+        Resultado da medição da URL, ou None se ela não terminar dentro do timeout
+        """
+        entry = self._entries[normalize_url(url)]
+        entry['done'].wait(timeout)
+        return entry['fields']
+
+    def assets(self):
+        """
+        (url, campos medidos, páginas) de cada recurso medido
+        """
+        with self._lock:
+            return [(url, entry['fields'], entry['pages'])
+                    for url, entry in self._entries.items() if entry['fields'] is not None]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def parse_srcset(value):
+    """
+    URLs de um atributo srcset ("a.png 1x, b.png 2x"), sem os descritores
+
+    A URL vai até o primeiro espaço; vírgulas no fim dela separam candidatos sem
+    descritor. Assim URLs com vírgula (ex.: data:) não são quebradas.
+    """
+    urls = []
+    position = 0
+    while position < len(value):
+        match = SRCSET_URL.match(value, position)
+        url = match.group(1)
+        position = match.end()
+        if not url:
+            break
+        if url.endswith(','):
+            url = url.rstrip(',')
+        else:
+            # Descritores (1x, 480w) até a próxima vírgula
+            comma = value.find(',', position)
+            position = len(value) if comma == -1 else comma + 1
+        if url and not url.startswith('data:'):
+            urls.append(url)
+    return urls
+
+
+SRCSET_URL = re.compile(r'[\s,]*(\S*)')
+CSS_IMPORT = re.compile(r'@import\s+[\'"]([^\'"]+)[\'"]')
+
+
+class PageResources:
+    """
+    Candidatos a recurso encontrados no HTML, agrupados como em self.resources
+
+    Preenchido por um dos extratores (HtmlResourceExtractor ou o caminho com
+    BeautifulSoup); cada grupo mantém a ordem do documento. Os valores de atributos
+    sem valor (ex.: <script async>) são '' como no BeautifulSoup.
+    """
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.images = []
+        self.stylesheets = []
+        self.scripts = []
+        self.fonts = []
+        self.css_imports = []
+        self.videos = []
+        self.others = []
+        # Conteúdo dos <script> e src dos externos, para a detecção de APIs
+        self.inline_scripts = []
+        self.script_srcs = []
+        # Destinos dos <a href>, para a varredura do site
+        self.links = []
+
+    def add_img(self, attrs):
+        src = attrs.get('src')
+        common = {
+            'element_type': 'img',
+            'alt_text': attrs.get('alt', ''),
+            'width': attrs.get('width', ''),
+            'height': attrs.get('height', ''),
+            'loading': attrs.get('loading', '')
+        }
+        if src:
+            self.images.append({'url': urljoin(self.base_url, src), **common})
+        for url in parse_srcset(attrs.get('srcset') or ''):
+            self.images.append({'url': urljoin(self.base_url, url), **common, 'srcset': True})
+
+    def add_picture_source(self, attrs):
+        for url in parse_srcset(attrs.get('srcset') or ''):
+            self.images.append({
+                'url': urljoin(self.base_url, url),
+                'element_type': 'img',
+                'alt_text': '',
+                'width': attrs.get('width', ''),
+                'height': attrs.get('height', ''),
+                'loading': '',
+                'srcset': True
+            })
+
+    def add_link(self, attrs, rel_tokens):
+        href = attrs.get('href')
+        if not href:
+            return
+        if 'stylesheet' in rel_tokens:
+            self.stylesheets.append({
+                'url': urljoin(self.base_url, href),
+                'element_type': 'css',
+                'media': attrs.get('media', 'all'),
+                'integrity': attrs.get('integrity', '')
+            })
+        if any('font' in token for token in rel_tokens):
+            self.fonts.append({
+                'url': urljoin(self.base_url, href),
+                'element_type': 'font'
+            })
+
+    def add_script(self, attrs):
+        src = attrs.get('src')
+        if src:
+            self.script_srcs.append(src)
+            self.scripts.append({
+                'url': urljoin(self.base_url, src),
+                'element_type': 'js',
+                'async': 'async' if attrs.get('async') else 'false',
+                'defer': 'defer' if attrs.get('defer') else 'false',
+                'type': attrs.get('type', 'text/javascript')
+            })
+
+    def add_inline_script(self, text):
+        if text:
+            self.inline_scripts.append(text)
+
+    def add_style(self, text):
+        if text:
+            for url in CSS_IMPORT.findall(text):
+                self.css_imports.append({
+                    'url': urljoin(self.base_url, url),
+                    'element_type': 'css-import'
+                })
+
+    def add_media(self, attrs):
+        src = attrs.get('src')
+        if src:
+            self.videos.append({
+                'url': urljoin(self.base_url, src),
+                'element_type': 'video',
+                'type': attrs.get('type', '')
+            })
+
+    def add_iframe(self, attrs):
+        src = attrs.get('src')
+        if src:
+            self.others.append({
+                'url': urljoin(self.base_url, src),
+                'element_type': 'iframe'
+            })
+
+    def add_anchor(self, attrs):
+        href = (attrs.get('href') or '').strip()
+        if href and not href.startswith('#') and not href.lower().startswith(('javascript:', 'mailto:', 'tel:')):
+            try:
+                self.links.append(urljoin(self.base_url, href))
+            except ValueError:
+                # Link malformado (ex.: host IPv6 sem o "]") não derruba a análise
+                pass
+
+
+# Como os navegadores, procura a declaração de charset só no início do documento
+HTML_SNIFF_BYTES = 1024
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:+-]+)', re.I)
+_BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+
+
+def html_encoding(headers, head):
+    """
+    Codificação de um documento HTML
+
+    Ordem: BOM, charset do Content-Type, <meta charset> (ou http-equiv) nos primeiros
+    bytes e, na falta de todos, UTF-8. Ao contrário de requests, um text/html sem
+    charset não vira ISO-8859-1.
+
+    Args:
+        headers: Cabeçalhos da resposta
+        head (bytes): Primeiros bytes do corpo (HTML_SNIFF_BYTES bastam)
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    candidates = []
+    header_charset = _HEADER_CHARSET.search(headers.get('Content-Type') or '')
+    if header_charset:
+        candidates.append(header_charset.group(1))
+    meta_charset = _META_CHARSET.search(head[:HTML_SNIFF_BYTES])
+    if meta_charset:
+        candidates.append(meta_charset.group(1).decode('ascii'))
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+class HtmlStreamDecoder:
+    """
+    Decodifica em partes o HTML que chega pela rede, com a codificação de html_encoding
+
+    Os primeiros HTML_SNIFF_BYTES ficam retidos até a codificação ser conhecida.
+    """
+    def __init__(self, headers):
+        self.headers = headers
+        self.encoding = None
+        self._decoder = None
+        self._head = b''
+
+    def _start(self):
+        self.encoding = html_encoding(self.headers, self._head)
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        head, self._head = self._head, b''
+        return self._decoder.decode(head)
+
+    def decode(self, chunk):
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < HTML_SNIFF_BYTES:
+                return ''
+            return self._start()
+        return self._decoder.decode(chunk)
+
+    def finish(self):
+        text = self._start() if self._decoder is None else ''
+        return text + self._decoder.decode(b'', final=True)
+
+
+class HtmlResourceExtractor(HTMLParser):
+    """
+    Extrai os recursos do HTML em uma única passada, sem montar a árvore do documento
+
+    Os eventos do tokenizador (o mesmo usado pelo BeautifulSoup com 'html.parser')
+    são tratados à medida que chegam, então o HTML pode ser entregue em partes com
+    feed(). O resultado é um PageResources.
+    """
+    # Elementos cujo texto interno é coletado
+    TEXT_TAGS = ('script', 'style')
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.page = PageResources(base_url)
+        self._picture_depth = 0
+        self._text_tag = None
+        self._text_parts = []
+
+    @classmethod
+    def extract(cls, html, base_url):
+        extractor = cls(base_url)
+        extractor.feed(html)
+        extractor.close()
+        return extractor.page
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: '' if value is None else value for name, value in attrs}
+        if tag == 'img':
+            self.page.add_img(attrs)
+        elif tag == 'link':
+            self.page.add_link(attrs, attrs.get('rel', '').split())
+        elif tag == 'script':
+            self.page.add_script(attrs)
+            self._start_text(tag)
+        elif tag == 'style':
+            self._start_text(tag)
+        elif tag in ('video', 'source'):
+            self.page.add_media(attrs)
+            if tag == 'source' and self._picture_depth:
+                self.page.add_picture_source(attrs)
+        elif tag == 'iframe':
+            self.page.add_iframe(attrs)
+        elif tag == 'a':
+            self.page.add_anchor(attrs)
+        elif tag == 'picture':
+            self._picture_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in self.TEXT_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == 'picture' and self._picture_depth:
+            self._picture_depth -= 1
+        elif tag == self._text_tag:
+            text = ''.join(self._text_parts)
+            if tag == 'style':
+                self.page.add_style(text)
+            else:
+                self.page.add_inline_script(text)
+            self._text_tag = None
+            self._text_parts = []
+
+    def handle_data(self, data):
+        if self._text_tag:
+            self._text_parts.append(data)
+
+    def _start_text(self, tag):
+        self._text_tag = tag
+        self._text_parts = []
+
+
+def extract_page_resources_bs4(html, base_url):
+    """
+    Extração com BeautifulSoup: monta a árvore e a percorre uma vez por tipo de elemento
+
+    Mantida como alternativa (--html-parser bs4) e como referência do HtmlResourceExtractor.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    page = PageResources(base_url)
+
+    for tag in soup.find_all(['img', 'source']):
+        if tag.name == 'img':
+            page.add_img(tag)
+        elif tag.find_parent('picture'):
+            page.add_picture_source(tag)
+    for link in soup.find_all('link', rel=True):
+        page.add_link(link, link.get('rel'))
+    for script in soup.find_all('script'):
+        page.add_script(script)
+        page.add_inline_script(script.string)
+    for style in soup.find_all('style'):
+        page.add_style(style.string)
+    for video in soup.find_all(['video', 'source']):
+        page.add_media(video)
+    for iframe in soup.find_all('iframe'):
+        page.add_iframe(iframe)
+    for anchor in soup.find_all('a', href=True):
+        page.add_anchor(anchor)
+    return page
+
+
+# stream: HtmlResourceExtractor (passada única); bs4: árvore do BeautifulSoup
+HTML_PARSERS = ('stream', 'bs4')
+
+
+JS_API_KEYWORDS = {
+    "api_url": ("api_url", "apiUrl", "API_URL", "url", "URL"),
+    "endpoint": ("endpoint", "Endpoint", "ENDPOINT"),
+    "service_url": ("service", "serviceUrl", "service_url"),
+    "graphql": ("graphql", "GraphQL"),
+    "products": ("products", "product", "productId", "productIds")
+}
+
+
+def _patterns_by_keyword(keywords):
+    """
+    Padrões que casam a partir de cada palavra-chave
+
+    Uma palavra-chave que termina com outra (service_url termina com url) também
+    produz os padrões da mais curta, como acontecia com um re.findall por padrão.
+    """
+    return {
+        keyword: [name for name, candidates in keywords.items()
+                  if any(keyword.endswith(candidate) for candidate in candidates)]
+        for candidates in keywords.values() for keyword in candidates
+    }
+
+
+class JsApiScanner:
+    """
+    Detector de chamadas de API em JavaScript com uma única passada pelo texto
+
+    Equivale a aplicar os padrões abaixo um a um com re.findall, mas todos são
+    combinados em uma expressão pré-compilada. Como todo padrão termina na string
+    com a URL ('...' ou "..."), a busca é feita sobre o texto invertido: assim a
+    expressão sempre começa por uma aspa e o motor de regex só tenta casar nas
+    aspas, em vez de testar alternativas como url|URL em cada posição do bundle.
+
+    Padrões (na forma original, antes da inversão):
+        fetch:       fetch('URL'
+        xhr:         .open('GET', 'URL'
+        ajax:        .ajax({ url: 'URL'
+        axios:       axios.get('URL'
+        api_url, endpoint, service_url, graphql, products:
+                     <palavra-chave> = 'URL' (ou :), ver JS_API_KEYWORDS
+    """
+    PATTERNS_BY_KEYWORD = _patterns_by_keyword(JS_API_KEYWORDS)
+
+    # (?=(?P<value>[^'"]+))(?P=value) emula um grupo atômico (o possessivo [^'"]++ só
+    # existe a partir do Python 3.11): quando o restante do padrão falha, não há
+    # retrocesso caractere a caractere pelo conteúdo da string
+    REVERSED_SOURCE = (
+        r'[\'"](?=(?P<value>[^\'"]+))(?P=value)[\'"](?:'
+        r'(?P<ajax>)\s*:lru\s*{\s*\(xaja\.'
+        r'|(?P<fetch>)\(hctef'
+        r'|(?P<xhr>)\s*,[\'"](?:TEG|TSOP|TUP|ETELED)[\'"]\(nepo\.'
+        r'|(?P<axios>)\((?:teg|tsop|tup|eteled)\.soixa'
+        r'|\s*[=:]\s*[\'"]?(?P<keyword>'
+        + '|'.join(re.escape(keyword[::-1])
+                   for keyword in sorted(PATTERNS_BY_KEYWORD, key=len, reverse=True))
+        + r'))'
+    )
+    REVERSED_PATTERN = re.compile(REVERSED_SOURCE)
+    # Mesma expressão para bytes: evita decodificar bundles grandes só para a busca
+    REVERSED_BYTES_PATTERN = re.compile(REVERSED_SOURCE.encode('ascii'))
+
+    def scan(self, js_content):
+        """
+        Encontra as URLs de API no conteúdo JavaScript
+
+        Args:
+            js_content (str | bytes): Código do script; com bytes (UTF-8) as posições
+                                      são em bytes e as URLs são decodificadas
+
+        Returns:
+            list: Tuplas (padrão, url, posição) em ordem de posição no texto
+        """
+        is_bytes = isinstance(js_content, (bytes, bytearray))
+        pattern = self.REVERSED_BYTES_PATTERN if is_bytes else self.REVERSED_PATTERN
+        matches = []
+        length = len(js_content)
+        for match in pattern.finditer(js_content[::-1]):
+            url = match.group('value')[::-1]
+            if is_bytes:
+                url = url.decode('utf-8', errors='replace')
+            offset = length - match.end()
+            if match.lastgroup == 'keyword':
+                keyword = match.group('keyword')[::-1]
+                if is_bytes:
+                    keyword = keyword.decode('ascii')
+                for pattern_name in self.PATTERNS_BY_KEYWORD[keyword]:
+                    matches.append((pattern_name, url, offset))
+            else:
+                matches.append((match.lastgroup, url, offset))
+                # .ajax({url: '...'}) também satisfaz o padrão api_url
+                if match.lastgroup == 'ajax':
+                    url_offset = js_content.rfind(b'url' if is_bytes else 'url',
+                                                  offset, length - match.end('value') - 1)
+                    matches.append(('api_url', url, url_offset))
+        matches.sort(key=lambda item: item[2])
+        return matches
+
+
+def _scan_shared_chunk(shm_name, length, start, end, overlap):
+    """
+    Executada nos processos do pool: busca APIs em um trecho de um script em memória compartilhada
+
+    Lê a partir de start - overlap até end + overlap, estendido até a próxima aspa, para
+    que ocorrências que atravessam a fronteira do trecho não se percam, mas só devolve
+    as que começam em [start, end); as demais pertencem ao trecho vizinho. Uma string
+    aberta antes de end + overlap termina na primeira aspa a partir daí, por mais longa
+    que seja.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        low = max(0, start - overlap)
+        high = min(length, end + overlap)
+        while high < length:
+            block = bytes(shm.buf[high:min(length, high + overlap)])
+            quotes = [position for position in (block.find(b'"'), block.find(b"'")) if position != -1]
+            if quotes:
+                high += min(quotes) + 1
+                break
+            high += len(block)
+        data = bytes(shm.buf[low:high])
+    finally:
+        shm.close()
+    return [(pattern_name, url, low + offset)
+            for pattern_name, url, offset in JsApiScanner().scan(data)
+            if start <= low + offset < end]
+
+
+def _char_offsets(data, matches):
+    """
+    Troca as posições em bytes UTF-8 das ocorrências pelas posições em caracteres do texto decodificado
+
+    As ocorrências precisam estar em ordem de posição; o texto é decodificado uma única vez.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    converted = []
+    position = characters = 0
+    for pattern_name, url, offset in matches:
+        characters += len(decoder.decode(data[position:offset]))
+        position = offset
+        converted.append((pattern_name, url, characters))
+    return converted
+
+
+class ScriptScanJob:
+    """
+    Busca de APIs de um script em andamento no ScriptScanPool
+    """
+    def __init__(self, shm, futures, data):
+        self.size = shm.size
+        self._data = data
+        self._shm = shm
+        self._futures = futures
+        self._matches = None
+        self._error = None
+        self._finished = False
+        # result() pode ser chamado por mais de uma thread (ex.: _wait_for_room)
+        self._lock = threading.Lock()
+
+    def result(self):
+        """
+        Aguarda os trechos e devolve as ocorrências na ordem do texto
+
+        As posições são em caracteres, como as de JsApiScanner.scan() sobre o texto, para
+        que source_offset não dependa de o script ter passado pelo pool.
+        """
+        with self._lock:
+            if not self._finished:
+                try:
+                    matches = []
+                    for future in self._futures:
+                        matches.extend(future.result())
+                    matches.sort(key=lambda item: item[2])
+                    self._matches = _char_offsets(self._data, matches)
+                except Exception as e:
+                    self._error = e
+                finally:
+                    # A memória compartilhada é liberada assim que o script termina
+                    self._shm.close()
+                    self._shm.unlink()
+                    self._data = None
+                    self._finished = True
+        if self._error is not None:
+            raise self._error
+        return self._matches
+
+    def done(self):
+        return self._finished
+
+
+class ScriptScanPool:
+    """
+    Pool de processos para a detecção de APIs em scripts grandes
+
+    A busca por regex é limitada pela CPU e, em threads, segura o GIL (no app Flask,
+    isso trava o acompanhamento de progresso e as outras análises). Aqui o corpo do
+    script é copiado uma vez para memória compartilhada e dividido em trechos com
+    sobreposição; os processos recebem apenas o nome do bloco e os limites do trecho,
+    não uma cópia serializada do conteúdo. O total de bytes em memória compartilhada
+    é limitado: ao excedê-lo, submit() espera os scripts mais antigos terminarem.
+    """
+    CHUNK_BYTES = 1024 * 1024
+    # Trecho lido além da fronteira (estendido até a próxima aspa, ver _scan_shared_chunk)
+    CHUNK_OVERLAP = 64 * 1024
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, processes, max_inflight_bytes=128 * 1024 * 1024):
+        self.processes = processes
+        self.max_inflight_bytes = max_inflight_bytes
+        # spawn: não herda threads nem conexões abertas do processo pai (ex.: app Flask)
+        self._executor = ProcessPoolExecutor(max_workers=processes,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._pending = []
+        self._lock = threading.Lock()
+        # Inicia os processos já (cada um importa este módulo, o que leva alguns
+        # segundos) para que estejam prontos quando o primeiro script chegar
+        for _ in range(processes):
+            self._executor.submit(os.getpid)
+
+    @classmethod
+    def shared(cls, processes):
+        """
+        Pool compartilhado por todas as análises do processo com o mesmo número de processos
+        """
+        with cls._shared_lock:
+            pool = cls._shared.get(processes)
+            if pool is None:
+                pool = cls._shared[processes] = cls(processes)
+            return pool
+
+    def submit(self, js_bytes):
+        """
+        Envia o script (bytes UTF-8) para busca nos processos do pool
+
+        Returns:
+            ScriptScanJob: Use result() para obter as ocorrências
+        """
+        self._wait_for_room(len(js_bytes))
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(js_bytes)))
+        shm.buf[:len(js_bytes)] = js_bytes
+        futures = [
+            self._executor.submit(_scan_shared_chunk, shm.name, len(js_bytes), start,
+                                  min(start + self.CHUNK_BYTES, len(js_bytes)), self.CHUNK_OVERLAP)
+            for start in range(0, max(1, len(js_bytes)), self.CHUNK_BYTES)
+        ]
+        job = ScriptScanJob(shm, futures, js_bytes)
+        with self._lock:
+            self._pending.append(job)
+        return job
+
+    def _wait_for_room(self, size):
+        while True:
+            with self._lock:
+                self._pending = [job for job in self._pending if not job.done()]
+                inflight = sum(job.size for job in self._pending)
+                if not self._pending or inflight + size <= self.max_inflight_bytes:
+                    return
+                oldest = self._pending[0]
+            oldest.result()
+
+    def close(self):
+        self._executor.shutdown()
+
+
+TRANSPORT_BACKENDS = {
+    "requests": RequestsTransport,
+    "asyncio": AsyncioTransport
+}
+
+
+class AnalysisPipeline:
+    """
+    Etapas simultâneas da análise no modo pipeline
+
+    Os downloads rodam em um FetchBatch do transporte e a detecção de APIs em um pool
+    de threads próprio, então cada etapa alimenta a seguinte sem esperar que a anterior
+    termine. O trabalho de descoberta (scripts a baixar e analisar) é contado à parte:
+    a sondagem de endpoints só começa quando todas as APIs dos scripts são conhecidas.
+    """
+    def __init__(self, batch, scan_workers=1, on_fetched=None):
+        """
+        Args:
+            batch (FetchBatch): Lote do transporte que executa os downloads
+            scan_workers (int): Threads da detecção de APIs
+            on_fetched (callable): Chamada a cada download concluído com (concluídos, enviados)
+        """
+        self.batch = batch
+        self.on_fetched = on_fetched
+        self.submitted = 0
+        self.completed = 0
+        self._scan_executor = ThreadPoolExecutor(max_workers=scan_workers)
+        self._scan_futures = []
+        self._claimed_scripts = set()
+        self._discovery = 0
+        self._lock = threading.Condition()
+
+    def fetch(self, steps, discovery=False):
+        """
+        Envia um gerador de requisições para download
+        """
+        with self._lock:
+            self.submitted += 1
+            if discovery:
+                self._discovery += 1
+        self.batch.submit(self._tracked(steps, discovery))
+
+    def _tracked(self, steps, discovery):
+        try:
+            return (yield from steps)
+        finally:
+            with self._lock:
+                self.completed += 1
+                completed, submitted = self.completed, self.submitted
+                if discovery:
+                    self._discovery -= 1
+                    self._lock.notify_all()
+            if self.on_fetched:
+                self.on_fetched(completed, submitted)
+
+    def scan(self, function, *args):
+        """
+        Executa uma etapa de detecção de APIs (CPU) fora das threads de download
+        """
+        with self._lock:
+            self._discovery += 1
+            self._scan_futures.append(self._scan_executor.submit(self._run_scan, function, args))
+
+    def _run_scan(self, function, args):
+        try:
+            function(*args)
+        finally:
+            with self._lock:
+                self._discovery -= 1
+                self._lock.notify_all()
+
+    def claim_script(self, url):
+        """
+        Reserva a análise de um script; False se ele já foi enviado à detecção de APIs
+        """
+        key = normalize_url(url)
+        with self._lock:
+            if key in self._claimed_scripts:
+                return False
+            self._claimed_scripts.add(key)
+            return True
+
+    def wait_discovery(self):
+        """
+        Espera os scripts pendentes serem baixados e analisados
+        """
+        with self._lock:
+            while self._discovery:
+                self._lock.wait()
+
+    def join(self):
+        """
+        Espera todos os downloads e análises, inclusive os adicionados durante a espera
+        """
+        while True:
+            self.batch.join()
+            with self._lock:
+                futures, self._scan_futures = self._scan_futures, []
+            if not futures:
+                return
+            for future in futures:
+                future.result()
+
+    def close(self):
+        self._scan_executor.shutdown(wait=True)
+        self.batch.close()
+
+
+class WebsitePerformanceTester:
+    def __init__(self, url, output_dir="reports", progress_callback=None,
+                 max_workers=None, max_per_host=4, sequential=False, backend="requests",
+                 response_cache_bytes=64 * 1024 * 1024, image_metadata_only=False,
+                 max_resource_bytes=None, request_timeout=10, deadline=None, scan_processes=0,
+                 html_parser='stream', pipeline=False, probe_wordlist=None, probe_deadline=15,
+                 adaptive_concurrency=False, dns_prefetch=True, exclude_dns=False, dns_ttl=60,
+                 connection_pool=None, asset_results=None, response_cache=None, samples=1):
+        """
+        Inicializa o testador de desempenho com a URL fornecida
+        
+        Args:
+            url (str): URL do site a ser analisado
+            output_dir (str): Diretório onde os relatórios serão salvos
+            progress_callback (callable): Função de callback para atualizar o progresso
+                                        Recebe: (percent, message, resource_info)
+            max_workers (int): Limite global de requisições simultâneas na análise de recursos
+                               (padrão: 8 para o backend requests, 100 para o asyncio)
+            max_per_host (int): Limite de requisições simultâneas para um mesmo host
+            sequential (bool): Se True, analisa os recursos um a um (modo original)
+            backend (str): Transporte HTTP utilizado ('requests' ou 'asyncio')
+            response_cache_bytes (int): Limite de memória do cache de respostas da análise
+            image_metadata_only (bool): Se True, imagens são lidas apenas até o cabeçalho
+                                        (dimensões, formato e modo) via requisições Range
+            max_resource_bytes (int): Limite de bytes lidos por recurso; recursos maiores são
+                                      marcados como truncados (None = sem limite)
+            request_timeout (float): Timeout em segundos de cada requisição
+            deadline (float): Orçamento total em segundos da análise; requisições pendentes
+                              são ignoradas quando ele se esgota (None = sem limite)
+            scan_processes (int): Processos usados na detecção de APIs em scripts grandes
+                                  (0 = detecção na própria thread da análise)
+            html_parser (str): Extrator de recursos do HTML ('stream' ou 'bs4')
+            pipeline (bool): Se True, as etapas da análise rodam simultaneamente: recursos são
+                             baixados assim que aparecem no HTML e as APIs encontradas nos
+                             scripts voltam para a fila de downloads
+            probe_wordlist (str): Arquivo com os caminhos a sondar em busca de APIs, um por
+                                  linha (padrão: COMMON_API_ENDPOINTS)
+            probe_deadline (float): Tempo máximo em segundos de toda a sondagem de endpoints
+                                    (None = limitado apenas pelo prazo da análise)
+            adaptive_concurrency (bool): Se True, o limite por host começa em max_per_host e é
+                                         ajustado durante a análise (até max_workers) conforme
+                                         o TTFB, respostas 429/503 e erros de conexão
+            dns_prefetch (bool): Se True, os hosts de todos os recursos encontrados no HTML são
+                                 resolvidos simultaneamente antes dos downloads
+            exclude_dns (bool): Se True, a resolução DNS fica fora dos tempos das requisições
+                                (TTFB e tempo total), tornando-os comparáveis entre execuções
+            dns_ttl (float): Validade em segundos das resoluções em cache quando o TTL do
+                             registro não está disponível (requer dnspython)
+            connection_pool (SharedConnectionPool): Pool de conexões compartilhado entre as
+                                                    análises do processo (apenas backend
+                                                    requests); None = conexões novas, para
+                                                    medir uma primeira visita
+            asset_results (SharedAssetResults): Medições de recursos compartilhadas com as
+                                                outras páginas de uma varredura do site
+            response_cache (ResponseCache): Cache de respostas compartilhado (ex.: entre as
+                                            páginas de uma varredura); por padrão, um cache
+                                            próprio de response_cache_bytes
+            samples (int): Medições de cada recurso. Com mais de uma, depois da análise cada
+                           recurso é requisitado de novo samples - 1 vezes (conexão e cache
+                           da CDN já aquecidos); a medição da análise fica separada como a fria
+        """
+        self.url = url
+        self.base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+        self.domain = urlparse(url).netloc
+        self.progress_callback = progress_callback
+        # Carregar as configurações do arquivo config.json
+        self.config = self._load_config()
+        self.resources = {
+            "images": [],
+            "css": [],
+            "js": [],
+            "fonts": [],
+            "videos": [],
+            "others": []
+        }
+        # Índice de URLs compartilhado por recursos e APIs (deduplicação)
+        self.url_registry = UrlRegistry()
+        self.js_api_scanner = JsApiScanner()
+        self.scan_processes = scan_processes
+        self.scan_pool = ScriptScanPool.shared(scan_processes) if scan_processes else None
+        # Novo dicionário para armazenar APIs e solicitações XHR/AJAX
+        self.apis = {
+            "xhr": [],      # XMLHttpRequests
+            "fetch": [],    # Fetch API calls
+            "json": [],     # JSON endpoints
+            "rest": [],     # RESTful APIs
+            "products": [], # APIs de produtos
+            "graphql": []   # GraphQL APIs
+        }
+        self.output_dir = output_dir
+        self.total_load_time = 0
+        self.page_size = 0
+        if html_parser not in HTML_PARSERS:
+            raise ValueError(f"Extrator de HTML desconhecido: {html_parser}")
+        self.html_parser = html_parser
+        self.pipelined = pipeline
+        # AnalysisPipeline em execução (apenas durante analyze_website no modo pipeline)
+        self._pipeline = None
+        if backend not in TRANSPORT_BACKENDS:
+            raise ValueError(f"Backend de transporte desconhecido: {backend}")
+        if max_workers is None:
+            max_workers = 100 if backend == "asyncio" else 8
+        self.max_workers = max(1, int(max_workers))
+        self.max_per_host = max(1, int(max_per_host))
+        self.sequential = sequential or self.max_workers == 1
+        # Limite adaptativo por host, compartilhado por todos os lotes de requisições
+        self.concurrency = HostConcurrencyController(initial=self.max_per_host, max_limit=self.max_workers) \
+            if adaptive_concurrency else None
+        self.image_metadata_only = image_metadata_only
+        self.max_resource_bytes = max_resource_bytes
+        self.request_timeout = request_timeout
+        self.deadline_seconds = deadline
+        self.deadline = AnalysisDeadline(deadline)
+        # Requisições não executadas por falta de tempo: {'url', 'phase', 'reason'}
+        self.skipped = []
+        # Sondagem de endpoints: caminhos, resultados por caminho e estado por origem
+        self.probe_paths = self._load_probe_wordlist(probe_wordlist)
+        self.probe_deadline = probe_deadline
+        self.probes = []
+        self._probe_origins = {}
+        # Cache de DNS usado pelas conexões dos dois backends; tempos de resolução por host
+        self.dns_prefetch = dns_prefetch
+        self.exclude_dns = exclude_dns
+        self.dns_cache = DnsCache(default_ttl=dns_ttl, exclude_from_timings=exclude_dns)
+        if connection_pool is not None and backend != "requests":
+            raise ValueError("O pool de conexões compartilhado requer o backend requests")
+        self.connection_pool = connection_pool
+        self.session = requests.Session()
+        if connection_pool is not None:
+            # Conexões já abertas por análises anteriores são reaproveitadas
+            connection_pool.mount(self.session)
+            self.adapter = connection_pool.adapter
+        else:
+            # Pool de conexões dimensionado para o número de workers concorrentes
+            # O adaptador instrumentado mede DNS, conexão TCP e TLS de cada nova conexão
+            self.adapter = TimingHTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            self.session.mount('http://', self.adapter)
+            self.session.mount('https://', self.adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/105.0.0.0 Safari/537.36',
+            'Accept': '*/*',  # Aceitar todos os tipos de conteúdo
+            'Accept-Language': 'en-US,en;q=0.9,pt;q=0.8'
+        })
+        
+        # Transporte HTTP usado por todas as requisições da análise. O backend asyncio
+        # compartilha os cabeçalhos da sessão, então alterações em session.headers
+        # (ex.: User-Agent personalizado) valem para os dois backends.
+        if backend == "asyncio":
+            self.transport = AsyncioTransport(self.session.headers, max_connections=self.max_workers,
+                                              dns_cache=self.dns_cache)
+        else:
+            self.transport = RequestsTransport(self.session, dns_cache=self.dns_cache)
+        
+        # Cache de respostas da análise: scripts baixados por _detect_apis são
+        # reaproveitados por _analyze_resources em vez de serem baixados novamente
+        self.response_cache = response_cache if response_cache is not None \
+            else ResponseCache(max_bytes=response_cache_bytes)
+        self.asset_results = asset_results
+        self.samples = max(1, int(samples))
+        # Registros compactos e totais dos recursos, montados sob demanda pelos relatórios
+        self._resource_summary = None
+        # Links da página (<a href>) e tempo do HTML principal, usados pela varredura do site
+        self.page_links = []
+        self.html_load_time = 0
+        
+        # Estatísticas gerais de HTTP
+        self.http_stats = {
+            "status_codes": {},
+            "content_types": {},
+            # Latências em histogramas: no total, por tipo de recurso e por host
+            "latency": LatencyHistogram(),
+            "latency_by_type": {},
+            "latency_by_host": {},
+            "total_requests": 0,
+            "failed_requests": 0,
+            "analysis_mode": "pipeline" if self.pipelined else "sequential" if self.sequential else "concurrent",
+            "transport_backend": self.transport.name,
+            "resource_analysis_time": 0,
+            # Agregados por fase de rede (em segundos)
+            "phase_times": {phase: {"count": 0, "total": 0.0, "max": 0.0} for phase in NETWORK_PHASES},
+            "connections_new": 0,
+            "connections_reused": 0,
+            "adaptive_concurrency": self.concurrency is not None,
+            # Por host: limite final e máximo, 429/503, reenvios e linha do tempo do limite
+            "host_concurrency": {},
+            "dns_excluded": exclude_dns,
+            "shared_connection_pool": connection_pool is not None,
+            # Por host: conexões novas, reaproveitadas e fechadas por ociosidade nesta análise
+            "connection_pool": {},
+            # Por host: tempo de resolução, endereços, TTL, origem, consultas e acertos do cache
+            "dns": {}
+        }
+        
+        # Lock para atualizações de http_stats e self.apis vindas de vários workers
+        self._lock = threading.RLock()
+        
+        # Carregar as configurações do arquivo config.json
+        self.config = self._load_config()
+        
+        # Lista para armazenar gráficos base64 para o relatório HTML
+        self.graph_images = {}
+        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Criar diretórios de relatórios se não existirem
+        self.graphs_dir = f"{output_dir}/graphs"
+        
+        # Primeiro, procurar templates no diretório do script
+        script_templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+        
+        # Em seguida, verificar se existe o diretório "templates" no diretório atual (para o Flask)
+        current_templates_dir = os.path.join(os.getcwd(), "templates")
+        
+        # Usar o diretório de templates que contém o arquivo report_template.html
+        if os.path.exists(os.path.join(current_templates_dir, "report_template.html")):
+            self.templates_dir = current_templates_dir
+        else:
+            self.templates_dir = script_templates_dir
+            
+        print(f"Usando diretório de templates: {self.templates_dir}")
+            
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        if not os.path.exists(self.graphs_dir):
+            os.makedirs(self.graphs_dir)
+    
+    def close(self):
+        """
+        Libera os recursos do transporte HTTP (conexões, event loop, resolução DNS)
+        """
+        self.transport.close()
+        self.dns_cache.close()
+    
+    def _new_request(self, method, url, timeout_limit=None, deadline=None, **kwargs):
+        """
+        Cria uma FetchRequest com o timeout configurado, limitado ao prazo da fase atual
+        
+        Args:
+            deadline (float): Prazo adicional (time.time()), ex.: o orçamento da sondagem;
+                              vale o que terminar primeiro
+        
+        Raises:
+            DeadlineExceeded: Se o orçamento de tempo da fase já se esgotou
+        """
+        timeout = self.request_timeout
+        if timeout_limit is not None:
+            timeout = min(timeout, timeout_limit) if timeout else timeout_limit
+        timeout = self.deadline.clamp(timeout)
+        ends_at = self.deadline.phase_ends_at
+        if deadline is not None:
+            ends_at = deadline if ends_at is None else min(ends_at, deadline)
+        return FetchRequest(method, url, timeout=timeout, deadline=ends_at, **kwargs)
+    
+    def _is_deadline_error(self, error):
+        """
+        Indica se a falha se deve ao prazo da análise, e não a um problema do servidor
+
+        Um timeout que acontece depois de o prazo da fase se esgotar foi causado pelo
+        limite imposto por ele, não pela lentidão que o timeout normal detectaria.
+        """
+        if isinstance(error, DeadlineExceeded):
+            return True
+        return isinstance(error, requests.Timeout) and self.deadline.expired()
+    
+    def _add_resource(self, resource_type, resource):
+        """
+        Adiciona um recurso ao grupo, ignorando URLs repetidas no mesmo grupo
+        
+        Returns:
+            bool: True se o recurso foi adicionado
+        """
+        status = self.url_registry.register(resource_type, resource)
+        if status == UrlRegistry.DUPLICATE:
+            return False
+        resource.setdefault("resource_type", resource_type)
+        self.resources[resource_type].append(resource)
+        self._resource_summary = None
+        # No modo pipeline o download começa assim que o recurso é descoberto
+        if self._pipeline is not None and status == UrlRegistry.NEW:
+            self._prefetch_dns([resource['url']])
+            if resource_type == 'js' and self._pipeline.claim_script(resource['url']):
+                self._pipeline.fetch(self._script_scan_requests(resource['url'],
+                                                                self._resource_requests(resource)),
+                                     discovery=True)
+            else:
+                self._pipeline.fetch(self._resource_requests(resource))
+        return True
+    
+    def _add_api(self, api_type, api):
+        """
+        Adiciona uma API ao grupo, ignorando URLs repetidas no mesmo grupo
+        
+        Returns:
+            bool: True se a API foi adicionada
+        """
+        status = self.url_registry.register(f"api:{api_type}", api)
+        if status == UrlRegistry.DUPLICATE:
+            return False
+        self.apis[api_type].append(api)
+        if self._pipeline is not None and status == UrlRegistry.NEW and not api.get("analyzed", False):
+            api["resource_type"] = api_type
+            self._prefetch_dns([api['url']])
+            self._pipeline.fetch(self._api_requests(api))
+        return True
+    
+    def _prefetch_dns(self, urls):
+        """
+        Inicia a resolução DNS simultânea dos hosts das URLs ainda fora do cache
+        """
+        if self.dns_prefetch:
+            self.dns_cache.prefetch({urlparse(url).hostname for url in urls})
+    
+    def _record_skipped(self, url, reason):
+        """
+        Registra uma requisição que não foi executada (ex.: prazo da análise esgotado)
+        """
+        with self._lock:
+            self.skipped.append({'url': url, 'phase': self.deadline.phase, 'reason': reason})
+    
+    def _deadline_description(self):
+        """
+        Prazos em vigor na análise, para as mensagens sobre requisições ignoradas
+        """
+        limits = []
+        if self.deadline_seconds:
+            limits.append(f"prazo de {self.deadline_seconds} s")
+        if self.probe_deadline:
+            limits.append(f"sondagem limitada a {self.probe_deadline} s")
+        return ', '.join(limits)
+    
+    def _load_probe_wordlist(self, path):
+        """
+        Lê os caminhos da sondagem de endpoints: um por linha, ignorando linhas vazias
+        e comentários (#). Caminhos sem barra inicial são relativos à raiz do site.
+        """
+        if path is None:
+            return list(self.COMMON_API_ENDPOINTS)
+        paths = []
+        with open(path, encoding='utf-8') as wordlist:
+            for line in wordlist:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if '://' not in line and not line.startswith('/'):
+                    line = '/' + line
+                if line not in paths:
+                    paths.append(line)
+        if not paths:
+            raise ValueError(f"Nenhum caminho encontrado na lista de sondagem: {path}")
+        return paths
+    
+    def _load_config(self):
+        """
+        Carrega as configurações do arquivo config.json
+        """
+        default_config = {
+            "theme": "default",  # Tema padrão (claro)
+        }
+        
+        config_file = "config.json"
+        
+        try:
+            if os.path.exists(config_file):
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                print(f"{Fore.GREEN}Configurações carregadas de {config_file}")
+                # Mesclar com valores padrão para garantir que todas as configurações existam
+                merged_config = {**default_config, **config}
+                return merged_config
+            else:
+                print(f"{Fore.YELLOW}Arquivo de configuração não encontrado. Usando configurações padrão.")
+                return default_config
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao carregar configurações: {e}. Usando configurações padrão.")
+            return default_config
+
+    def analyze_website(self):
+        """
+        Analisa o site e coleta informações sobre seus recursos
+        """
+        print(f"{Fore.CYAN}Analisando o site: {self.url}")
+        start_time = time.time()
+        self.deadline = AnalysisDeadline(self.deadline_seconds)
+        
+        try:
+            # Atualizar progresso - Iniciando análise
+            if self.progress_callback:
+                self.progress_callback(5, "Iniciando requisição para o site...", {"url": self.url})
+            
+            if self.pipelined:
+                self._analyze_pipelined(start_time)
+            else:
+                self._analyze_phased(start_time)
+            if self.concurrency is not None:
+                self.http_stats["host_concurrency"] = self.concurrency.snapshot()
+            self.http_stats["dns"] = self.dns_cache.report()
+            
+            # Calcular tempo total de carregamento
+            self.total_load_time = time.time() - start_time
+            print(f"{Fore.CYAN}Análise concluída em {self.total_load_time:.2f} segundos")
+            
+            # Medições repetidas ficam fora do tempo total da página
+            if self.samples > 1:
+                self._sample_resources()
+            self._resource_summary = None
+            if self.skipped:
+                print(f"{Fore.YELLOW}{len(self.skipped)} requisições ignoradas por falta de tempo "
+                      f"({self._deadline_description()})")
+            
+        except requests.RequestException as e:
+            print(f"{Fore.RED}Erro ao acessar o site: {e}")
+            self._record_failed_request()
+            raise
+    
+    def _analyze_phased(self, start_time):
+        """
+        Análise em fases: HTML, extração, scripts, downloads e sondagem, uma após a outra
+        """
+        # Requisição inicial para obter o HTML da página
+        self.deadline.start_phase('html')
+        response = self.transport.request(self._new_request('GET', self.url))
+        response.raise_for_status()
+        
+        # Tempo de carregamento do HTML inicial
+        self._main_page_loaded(response, time.time() - start_time)
+        
+        # Parse do HTML
+        if self.html_parser == 'bs4':
+            page = extract_page_resources_bs4(response.content, self.url)
+        else:
+            encoding = html_encoding(response.headers, response.content[:HTML_SNIFF_BYTES])
+            page = HtmlResourceExtractor.extract(response.content.decode(encoding, errors='replace'), self.url)
+        
+        # Atualizar progresso - Extração de recursos
+        if self.progress_callback:
+            self.progress_callback(25, "Extraindo informações sobre recursos (imagens, scripts, estilos)...", {})
+        
+        # Extrair recursos
+        self._extract_resources(page)
+        self.page_links = page.links
+        
+        # Resolver os hosts de todos os recursos enquanto os scripts são analisados
+        self._prefetch_dns(resource['url'] for resources in self.resources.values() for resource in resources)
+        
+        # Atualizar progresso - Detecção de APIs
+        if self.progress_callback:
+            self.progress_callback(60, "Analisando possíveis APIs e endpoints...", {})
+            
+        # Procurar possíveis APIs no JavaScript
+        self.deadline.start_phase('scripts')
+        self._detect_apis(page)
+        self._prefetch_dns(api['url'] for apis in self.apis.values() for api in apis)
+        
+        # Analisar URLs para identificar padrões de API (antes da análise dos recursos,
+        # para que essas APIs, aliases de recursos, recebam os resultados em propagate())
+        self._analyze_urls_for_api_patterns()
+        
+        # Analisar recursos encontrados e suas respostas HTTP
+        self.deadline.start_phase('resources')
+        self._analyze_resources()
+        
+        # Tentar acessar API endpoints conhecidos comuns
+        self.deadline.start_phase('probe')
+        self._probe_common_api_endpoints()
+    
+    def _main_page_loaded(self, response, html_load_time):
+        """
+        Registra o HTML principal carregado (tamanho, progresso e estatísticas HTTP)
+        """
+        self.page_size = len(response.content)
+        self.html_load_time = html_load_time
+        
+        print(f"{Fore.GREEN}HTML carregado em {html_load_time:.2f} segundos")
+        print(f"{Fore.GREEN}Tamanho da página HTML: {self.page_size/1024:.2f} KB")
+        
+        # Atualizar progresso - HTML carregado
+        if self.progress_callback:
+            self.progress_callback(15, "HTML principal carregado, analisando conteúdo...", 
+                                 {"size": f"{self.page_size/1024:.2f} KB", 
+                                  "time": f"{html_load_time:.2f} s"})
+        
+        # Registrar a requisição inicial nas estatísticas HTTP
+        self._record_http_stats(response, html_load_time, 'html')
+    
+    def _analyze_pipelined(self, start_time):
+        """
+        Análise em pipeline: descoberta, downloads e detecção de APIs simultâneos
+        
+        Os recursos seguem para o transporte assim que o extrator os encontra no HTML
+        (lido em streaming), cada script baixado vai para a detecção de APIs e as APIs
+        encontradas voltam para a fila de downloads. O tempo total tende ao da etapa
+        mais lenta, e não à soma das fases.
+        """
+        self.deadline.start_phase('pipeline')
+        progress_bar = tqdm(total=0, desc="Analisando recursos")
+        
+        def on_fetched(completed, submitted):
+            progress_bar.total = submitted
+            progress_bar.update(1)
+            if self.progress_callback and completed % 10 == 0:
+                percent = 25 + int(completed / submitted * 60)
+                self.progress_callback(percent, f"Requisições concluídas: {completed}/{submitted}", {})
+        
+        pipeline = AnalysisPipeline(self.transport.open_batch(self.max_workers, self.max_per_host, self.concurrency),
+                                    scan_workers=max(1, self.scan_processes), on_fetched=on_fetched)
+        self._pipeline = pipeline
+        try:
+            self._stream_main_page(start_time)
+            
+            # Com todas as APIs dos scripts conhecidas, a sondagem não repete URLs;
+            # os downloads dos demais recursos continuam enquanto isso
+            pipeline.wait_discovery()
+            self._analyze_urls_for_api_patterns()
+            self._probe_common_api_endpoints(pipeline)
+            pipeline.join()
+            self._register_probe_hits()
+        finally:
+            self._pipeline = None
+            pipeline.close()
+            progress_bar.close()
+        
+        # Os aliases recebem os resultados da requisição da URL principal
+        for apis in self.apis.values():
+            for api in apis:
+                if 'alias_of' in api:
+                    api["analyzed"] = True
+        self._fill_shared_assets()
+        self.url_registry.propagate()
+        
+        elapsed = time.time() - start_time
+        self.http_stats["resource_analysis_time"] = elapsed
+        self._print_resource_counts()
+        print(f"{Fore.GREEN}{pipeline.completed} recursos, APIs e sondagens analisados em {elapsed:.2f} segundos "
+              f"(modo pipeline, {self.max_workers} workers, {self.max_per_host} por host, "
+              f"backend {self.transport.name})")
+    
+    def _stream_main_page(self, start_time):
+        """
+        Baixa o HTML principal enviando os recursos ao pipeline enquanto ele chega
+        
+        O download roda em outra thread e entrega blocos já decodificados por uma fila;
+        o extrator em streaming processa cada bloco assim que ele chega. Com o extrator
+        'bs4' a página é analisada inteira ao final do download.
+        """
+        chunks = queue.Queue()
+        decoders = []
+        
+        def on_body(headers):
+            # A codificação só é escolhida depois de ver o <meta charset> do início do corpo
+            decoder = HtmlStreamDecoder(headers)
+            decoders.append(decoder)
+            return lambda chunk: chunks.put(decoder.decode(chunk))
+        
+        streaming = self.html_parser == 'stream'
+        main_request = self._new_request('GET', self.url, on_body=on_body if streaming else None)
+        
+        def fetch_main_page():
+            try:
+                chunks.put(self.transport.request(main_request))
+            except Exception as e:
+                chunks.put(e)
+        
+        threading.Thread(target=fetch_main_page, daemon=True).start()
+        
+        extractor = HtmlResourceExtractor(self.url)
+        positions = {}
+        while True:
+            item = chunks.get()
+            if isinstance(item, Exception):
+                raise item
+            if not isinstance(item, str):
+                response = item
+                break
+            extractor.feed(item)
+            self._dispatch_page_resources(extractor.page, positions)
+        
+        response.raise_for_status()
+        self._main_page_loaded(response, time.time() - start_time)
+        
+        if streaming:
+            if decoders:
+                extractor.feed(decoders[-1].finish())
+            extractor.close()
+            page = extractor.page
+        else:
+            page = extract_page_resources_bs4(response.content, self.url)
+        self._dispatch_page_resources(page, positions)
+        self.page_links = page.links
+    
+    # Listas do PageResources e o grupo de recursos correspondente, na ordem de _extract_resources
+    PAGE_RESOURCE_GROUPS = (
+        ('images', 'images'),
+        ('stylesheets', 'css'),
+        ('scripts', 'js'),
+        ('fonts', 'fonts'),
+        ('css_imports', 'css'),
+        ('videos', 'videos'),
+        ('others', 'others')
+    )
+    
+    def _dispatch_page_resources(self, page, positions):
+        """
+        Registra (e envia ao pipeline) os candidatos do extrator ainda não vistos
+        
+        Args:
+            page (PageResources): Candidatos encontrados até agora
+            positions (dict): Quantos itens de cada lista já foram processados; atualizado
+        """
+        for attribute, resource_type in self.PAGE_RESOURCE_GROUPS:
+            entries = getattr(page, attribute)
+            for entry in entries[positions.get(attribute, 0):]:
+                self._add_resource(resource_type, entry)
+            positions[attribute] = len(entries)
+        
+        for script_text in page.inline_scripts[positions.get('inline_scripts', 0):]:
+            self._pipeline.scan(self._analyze_js_for_api_calls, script_text)
+        positions['inline_scripts'] = len(page.inline_scripts)
+        
+        # Scripts que não foram enviados como recurso (ex.: URL já registrada em outro grupo)
+        for src in page.script_srcs[positions.get('script_srcs', 0):]:
+            if src:
+                full_url = urljoin(self.url, src)
+                if self._pipeline.claim_script(full_url):
+                    self._pipeline.fetch(self._script_scan_requests(full_url), discovery=True)
+        positions['script_srcs'] = len(page.script_srcs)
+    
+    def _script_scan_requests(self, url, steps=None):
+        """
+        Gerador que baixa um script externo e o envia à detecção de APIs do pipeline
+        
+        Quando o script também é um recurso da página, a análise do recurso (steps) vem
+        antes e o corpo baixado por ela é reaproveitado pelo cache de respostas.
+        """
+        if steps is not None:
+            yield from steps
+        try:
+            response = yield from self._cached_get_requests(url)
+        except Exception as e:
+            if self._is_deadline_error(e):
+                self._record_skipped(url, str(e))
+            else:
+                print(f"{Fore.RED}Erro ao analisar script externo {url}: {e}")
+            return
+        if response.status_code == 200:
+            self._pipeline.scan(self._scan_script, response, url)
+    
+    def _scan_script(self, response, url):
+        """
+        Detecta as APIs de um script baixado (no pool de processos, se for grande)
+        """
+        try:
+            if self._use_scan_pool(response):
+                matches = self.scan_pool.submit(response.content).result()
+            else:
+                matches = self.js_api_scanner.scan(self._script_text(response))
+            self._register_js_api_calls(matches, url)
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao analisar script externo {url}: {e}")
+    
+    def _api_requests(self, api):
+        """
+        Gerador com a análise de uma API descoberta durante o pipeline
+        """
+        yield from self._resource_requests(api, is_api=True)
+        api["analyzed"] = True
+    
+    def _record_http_stats(self, response, load_time, resource_type='others'):
+        """
+        Registra estatísticas de respostas HTTP
+        """
+        host = urlparse(response.url).netloc
+        status_code = response.status_code
+        content_type = response.headers.get('content-type', 'unknown').split(';')[0]
+        
+        with self._lock:
+            # Incrementar contador de status code
+            self.http_stats["status_codes"][status_code] = self.http_stats["status_codes"].get(status_code, 0) + 1
+            
+            # Incrementar contador de content type
+            self.http_stats["content_types"][content_type] = self.http_stats["content_types"].get(content_type, 0) + 1
+            
+            # Adicionar tempo de resposta aos histogramas
+            self.http_stats["latency"].record(load_time)
+            self.http_stats["latency_by_type"].setdefault(resource_type, LatencyHistogram()).record(load_time)
+            self.http_stats["latency_by_host"].setdefault(host, LatencyHistogram()).record(load_time)
+            
+            # Incrementar total de requisições
+            self.http_stats["total_requests"] += 1
+            
+            # Agregar as fases de rede medidas pelo transporte
+            for phase, duration in getattr(response, 'timings', {}).items():
+                if duration is None:
+                    continue
+                phase_stats = self.http_stats["phase_times"][phase]
+                phase_stats["count"] += 1
+                phase_stats["total"] += duration
+                phase_stats["max"] = max(phase_stats["max"], duration)
+            connection_reused = getattr(response, 'connection_reused', None)
+            if connection_reused is True:
+                self.http_stats["connections_reused"] += 1
+            elif connection_reused is False:
+                self.http_stats["connections_new"] += 1
+            # Por host, a partir das respostas desta análise: os contadores do pool
+            # compartilhado somariam as conexões de outras análises simultâneas
+            if connection_reused is not None:
+                host_connections = self.http_stats["connection_pool"].setdefault(host, {'new': 0, 'reused': 0})
+                host_connections['reused' if connection_reused else 'new'] += 1
+    
+    def _latency_summary(self):
+        """
+        Percentis de latência no total, por tipo de recurso e por host
+
+        Returns:
+            list: (grupo, nome, resumo de LatencyHistogram.percentiles())
+        """
+        with self._lock:
+            rows = [('total', 'total', self.http_stats['latency'].percentiles())]
+            for resource_type, histogram in sorted(self.http_stats['latency_by_type'].items()):
+                rows.append(('tipo', resource_type, histogram.percentiles()))
+            for host, histogram in sorted(self.http_stats['latency_by_host'].items()):
+                rows.append(('host', host, histogram.percentiles()))
+        return rows
+    
+    def _record_failed_request(self):
+        """
+        Incrementa o contador de requisições com falha de forma segura entre threads
+        """
+        with self._lock:
+            self.http_stats["failed_requests"] += 1
+    
+    def _detect_apis(self, page):
+        """
+        Analisa o JavaScript da página para detectar padrões de chamadas de API
+        """
+        print(f"{Fore.YELLOW}Procurando por chamadas de API no código JavaScript...")
+        
+        # Examinar scripts incorporados
+        for script_text in page.inline_scripts:
+            self._analyze_js_for_api_calls(script_text)
+        
+        # Baixar e analisar arquivos JavaScript externos; os grandes seguem para o
+        # pool de processos enquanto os próximos são baixados
+        scan_jobs = []
+        for src in page.script_srcs:
+            if src:
+                full_url = urljoin(self.url, src)
+                try:
+                    response = self._cached_get(full_url)
+                    if response.status_code == 200:
+                        if self._use_scan_pool(response):
+                            scan_jobs.append((self.scan_pool.submit(response.content), src, full_url))
+                        else:
+                            self._analyze_js_for_api_calls(self._script_text(response), full_url)
+                except Exception as e:
+                    if self._is_deadline_error(e):
+                        self._record_skipped(full_url, str(e))
+                    else:
+                        print(f"{Fore.RED}Erro ao analisar script externo {src}: {e}")
+        
+        for job, src, full_url in scan_jobs:
+            try:
+                self._register_js_api_calls(job.result(), full_url)
+            except Exception as e:
+                print(f"{Fore.RED}Erro ao analisar script externo {src}: {e}")
+    
+    def _cached_get(self, url):
+        """
+        Executa um GET consultando antes o cache de respostas da análise
+        """
+        return self.transport.run(self._cached_get_requests(url))
+    
+    def _cached_get_requests(self, url):
+        """
+        Gerador de _cached_get, para uso dentro de outros geradores de requisições
+        """
+        response = self.response_cache.get(url)
+        if response is None:
+            response = yield self._new_request('GET', url, max_bytes=self.max_resource_bytes)
+            if response.status_code == 200:
+                self.response_cache.put(url, response)
+        return response
+    
+    # Scripts menores que isso são analisados na própria thread: o custo de enviá-los
+    # ao pool de processos seria maior que o da busca
+    SCAN_POOL_MIN_BYTES = 256 * 1024
+    
+    @staticmethod
+    def _script_encoding(response):
+        """
+        Codificação de um script: o charset do Content-Type ou, sem ele, UTF-8 (e não o
+        ISO-8859-1 que requests supõe para text/javascript)
+        """
+        charset = _HEADER_CHARSET.search(response.headers.get('Content-Type') or '')
+        if charset:
+            try:
+                return codecs.lookup(charset.group(1)).name
+            except LookupError:
+                pass
+        return 'utf-8'
+    
+    def _script_text(self, response):
+        return response.content.decode(self._script_encoding(response), errors='replace')
+    
+    def _use_scan_pool(self, response):
+        """
+        Scripts grandes em UTF-8 vão para o pool de processos, que busca sobre os bytes
+        """
+        return (self.scan_pool is not None and len(response.content) >= self.SCAN_POOL_MIN_BYTES
+                and self._script_encoding(response) == 'utf-8')
+    
+    def _analyze_js_for_api_calls(self, js_content, script_url=None):
+        """
+        Analisa o conteúdo JavaScript para encontrar padrões de chamadas de API
+        """
+        self._register_js_api_calls(self.js_api_scanner.scan(js_content), script_url)
+    
+    def _register_js_api_calls(self, matches, script_url=None):
+        """
+        Classifica e registra as ocorrências (padrão, url, posição) encontradas em um script
+        """
+        for pattern_name, match, offset in matches:
+            full_url = urljoin(self.url, match)
+            
+            # Determinar o tipo de API com base no padrão e URL
+            api_type = "xhr"  # Padrão
+            
+            # Verificar se é uma API de produtos (muito comum em sites de e-commerce)
+            if "product" in match.lower() or "sku" in match.lower() or "catalog" in match.lower():
+                api_type = "products"
+            # Verificar se é API JSON ou API REST
+            elif "json" in match.lower() or "api" in match.lower():
+                api_type = "json"
+            elif "/api/" in match or "/v1/" in match or "/v2/" in match or "/rest/" in match:
+                api_type = "rest"
+            elif "/graphql" in match.lower() or "/gql" in match.lower():
+                api_type = "graphql"
+            elif pattern_name == "fetch":
+                api_type = "fetch"
+            elif pattern_name == "products":
+                api_type = "products"
+            
+            # Adicionar à lista apropriada se ainda não existe
+            self._add_api(api_type, {
+                "url": full_url,
+                "pattern_detected": pattern_name,
+                "source_script": script_url,
+                "source_offset": offset,
+                "analyzed": False
+            })
+    
+    # Caminhos sondados quando nenhuma lista (probe_wordlist) é informada
+    COMMON_API_ENDPOINTS = (
+        "/api",
+        "/api/v1",
+        "/api/v2",
+        "/v1",
+        "/v2",
+        "/rest",
+        "/graphql",
+        "/data",
+        "/service",
+        "/services",
+        "/wp-json",  # WordPress REST API
+        "/produtos",  # Produtos (PT)
+        "/products",  # Produtos (EN)
+        "/product",   # Produto singular
+        "/catalog",   # Catálogo 
+        "/catalogo",  # Catálogo (PT)
+        "/vitrine",   # Vitrine (PT)
+        "/showcase"   # Vitrine (EN)
+    )
+    
+    # Timeout de cada sondagem e bytes lidos do corpo (suficiente para o hash e o JSON)
+    PROBE_TIMEOUT = 5
+    PROBE_MAX_BYTES = 256 * 1024
+    
+    # Respostas 200 com o mesmo corpo (hash) a partir das quais a origem é tratada como
+    # catch-all, ex.: SPA que devolve o mesmo HTML para qualquer caminho
+    PROBE_CATCH_ALL_REPEATS = 3
+    
+    def _probe_common_api_endpoints(self, pipeline=None):
+        """
+        Tenta acessar endpoints comuns de API para verificar existência
+        
+        As sondagens rodam simultaneamente, limitadas por probe_deadline e pelo prazo da
+        análise. Quando uma origem devolve o mesmo corpo para vários caminhos (catch-all),
+        as sondagens restantes dela são canceladas.
+        
+        Args:
+            pipeline (AnalysisPipeline): No modo pipeline, as sondagens são enviadas a ele e
+                                         _register_probe_hits deve ser chamado após pipeline.join()
+        """
+        ends_at = time.time() + self.probe_deadline if self.probe_deadline else None
+        batch = None
+        if pipeline is None:
+            batch = self.transport.open_batch(self.max_workers, self.max_per_host, self.concurrency)
+        
+        submitted = 0
+        try:
+            for path in self.probe_paths:
+                url = urljoin(self.url, path)
+                # URLs já conhecidas como recurso ou API já foram requisitadas
+                if url in self.url_registry:
+                    continue
+                origin = urlparse(url).netloc
+                self._probe_origins.setdefault(origin, {'hashes': {}, 'catch_all': None})
+                probe = {'url': url, 'origin': origin, 'result': 'pending'}
+                self.probes.append(probe)
+                steps = self._probe_requests(probe, ends_at)
+                if pipeline is not None:
+                    pipeline.fetch(steps)
+                else:
+                    batch.submit(steps)
+                submitted += 1
+            print(f"{Fore.YELLOW}Verificando {submitted} endpoints comuns de API...")
+            if batch is not None:
+                batch.join()
+        finally:
+            if batch is not None:
+                batch.close()
+        if batch is not None:
+            self._register_probe_hits()
+    
+    def _probe_requests(self, probe, ends_at=None):
+        """
+        Gerador com a sondagem de um endpoint comum de API
+        
+        Args:
+            probe (dict): Registro da sondagem, preenchido com status, tempos e resultado
+            ends_at (float): Fim do orçamento da sondagem (time.time())
+        """
+        url = probe['url']
+        origin_state = self._probe_origins[probe['origin']]
+        if origin_state['catch_all']:
+            probe['result'] = 'skipped'
+            probe['error'] = 'origem com resposta catch-all'
+            return
+        try:
+            response = yield self._new_request('GET', url, timeout_limit=self.PROBE_TIMEOUT, deadline=ends_at,
+                                               allow_redirects=False, max_bytes=self.PROBE_MAX_BYTES)
+        except Exception as e:
+            probe['error'] = str(e)
+            if self._is_deadline_error(e) or (ends_at is not None and time.time() >= ends_at):
+                probe['result'] = 'skipped'
+                self._record_skipped(url, str(e))
+            else:
+                probe['result'] = 'error'
+            return
+        
+        load_time = response.load_time
+        content_type = response.headers.get('content-type', '').lower()
+        probe.update({
+            'status_code': response.status_code,
+            'content_type': content_type,
+            'load_time': load_time,
+            'time_to_first_byte': response.time_to_first_byte,
+            'size': response.size
+        })
+        
+        # Registrar estatísticas HTTP
+        self._record_http_stats(response, load_time, 'probe')
+        
+        if response.status_code == 200:
+            probe['body_hash'] = hashlib.sha1(response.content).hexdigest()
+            if self._count_probe_body(probe['origin'], probe['body_hash']):
+                probe['result'] = 'catch_all'
+                return
+        
+        # Verificar se parece uma API por tipo de conteúdo ou status code
+        is_api = False
+        if 'application/json' in content_type or 'application/xml' in content_type:
+            is_api = True
+        elif response.status_code == 200:
+            # Tentar analisar como JSON
+            try:
+                json_data = response.json()
+                is_api = True
+            except:
+                pass
+        probe['result'] = 'api' if is_api else 'not_api'
+    
+    def _count_probe_body(self, origin, body_hash):
+        """
+        Conta um corpo de resposta da origem; True se ele é a resposta catch-all dela
+        """
+        with self._lock:
+            state = self._probe_origins[origin]
+            state['hashes'][body_hash] = state['hashes'].get(body_hash, 0) + 1
+            if state['catch_all'] is None and state['hashes'][body_hash] >= self.PROBE_CATCH_ALL_REPEATS:
+                state['catch_all'] = body_hash
+                print(f"{Fore.YELLOW}{origin} responde a qualquer caminho com o mesmo conteúdo; "
+                      f"sondagens restantes canceladas")
+            return body_hash == state['catch_all']
+    
+    def _register_probe_hits(self):
+        """
+        Registra como APIs as sondagens bem-sucedidas, descartando as respostas catch-all
+        
+        Feito ao final, pois as primeiras respostas catch-all chegam antes de a origem
+        ser reconhecida como tal.
+        """
+        for probe in self.probes:
+            catch_all = self._probe_origins[probe['origin']]['catch_all']
+            if catch_all is not None and probe.get('body_hash') == catch_all:
+                probe['result'] = 'catch_all'
+            if probe['result'] != 'api':
+                continue
+            content_type = probe['content_type']
+            api_type = "rest" if "json" in content_type else "xhr"
+            self._add_api(api_type, {
+                "url": probe['url'],
+                "pattern_detected": "common_endpoint",
+                "status_code": probe['status_code'],
+                "content_type": content_type,
+                "load_time": probe['load_time'],
+                "size": probe['size'],
+                "analyzed": True
+            })
+        
+        errors = sum(1 for probe in self.probes if probe['result'] == 'error')
+        if errors:
+            print(f"{Fore.YELLOW}{errors} sondagens de endpoints falharam (detalhes no relatório de sondagens)")
+    
+    def _analyze_urls_for_api_patterns(self):
+        """
+        Analisa todas as URLs dos recursos para identificar padrões comuns de API
+        """
+        print(f"{Fore.YELLOW}Analisando URLs para identificar possíveis APIs...")
+        
+        # Padrões comuns que indicam que uma URL é uma API
+        api_url_patterns = [
+            r'\.json($|\?)',                    # Termina com .json
+            r'/api/',                           # Contém /api/
+            r'/rest/',                          # Contém /rest/
+            r'/graphql',                        # GraphQL endpoint
+            r'/v[0-9]+/',                       # Versão da API (/v1/, /v2/, etc)
+            r'/product(?:s|os)?/',              # Produtos (inglês/português)
+            r'/catalog(?:o)?/',                 # Catálogo (inglês/português)
+            r'/data/',                          # Endpoint de dados
+            r'/services?/',                     # Serviços
+            r'/[^/]+\.php\?',                   # Script PHP com parâmetros
+            r'/(?:get|fetch|search|query)[A-Z]' # getNomeRecurso, fetchData, etc
+        ]
+        
+        api_url_regex = '|'.join(api_url_patterns)
+        
+        # Analisar todas as URLs dos recursos
+        for resource_type, resources in self.resources.items():
+            for resource in resources:
+                url = resource.get('url', '')
+                
+                # Verificar se a URL corresponde a algum padrão de API
+                if re.search(api_url_regex, url, re.IGNORECASE):
+                    # Determinar o tipo de API com base no padrão identificado
+                    api_type = "rest"  # Padrão
+                    
+                    # Análise mais específica do tipo de API
+                    if "graphql" in url.lower():
+                        api_type = "graphql"
+                    elif "product" in url.lower() or "produto" in url.lower() or "catalog" in url.lower():
+                        api_type = "products"
+                    elif ".json" in url.lower():
+                        api_type = "json"
+                    
+                    # Adicionar à lista de APIs se ainda não existir
+                    self._add_api(api_type, {
+                        "url": url,
+                        "pattern_detected": "url_pattern",
+                        "source": resource_type,
+                        "analyzed": False
+                    })
+    
+    def _extract_resources(self, page):
+        """
+        Registra os recursos (imagens, CSS, JS, fontes, vídeos, etc.) extraídos do HTML
+        
+        Args:
+            page (PageResources): Candidatos encontrados pelo extrator de HTML
+        """
+        print(f"{Fore.YELLOW}Extraindo recursos da página...")
+        
+        # Extrair imagens (src e srcset)
+        if self.progress_callback:
+            self.progress_callback(30, "Analisando imagens da página...", {"type": "images"})
+            
+        for img_data in page.images:
+            added = self._add_resource('images', img_data)
+            
+            # Atualizar com a imagem atual sendo analisada (a cada 5 imagens)
+            if added and self.progress_callback and len(self.resources['images']) % 5 == 0:
+                self.progress_callback(30, f"Analisando imagens ({len(self.resources['images'])} encontradas)...", 
+                                     {"type": "images", "url": img_data['url']})
+        
+        # Extrair CSS
+        if self.progress_callback:
+            self.progress_callback(35, "Analisando arquivos de estilo (CSS)...", {"type": "css"})
+            
+        for css_data in page.stylesheets:
+            self._add_resource('css', css_data)
+            
+            # Atualizar com o CSS atual sendo analisado
+            if self.progress_callback:
+                self.progress_callback(35, f"Analisando CSS: {css_data['url'].split('/')[-1]}", 
+                                     {"type": "css", "url": css_data['url']})
+        
+        # Extrair JavaScript
+        if self.progress_callback:
+            self.progress_callback(40, "Analisando scripts JavaScript...", {"type": "js"})
+            
+        for js_data in page.scripts:
+            self._add_resource('js', js_data)
+            
+            # Atualizar com o script atual sendo analisado
+            if self.progress_callback:
+                script_name = js_data['url'].split('/')[-1]
+                self.progress_callback(40, f"Analisando script: {script_name}", 
+                                     {"type": "js", "url": js_data['url']})
+        
+        # Extrair fontes
+        for font_data in page.fonts:
+            self._add_resource('fonts', font_data)
+        
+        # Extrair recursos de estilo @import dentro de CSS
+        for import_data in page.css_imports:
+            self._add_resource('css', import_data)
+        
+        # Extrair vídeos
+        for video_data in page.videos:
+            self._add_resource('videos', video_data)
+        
+        # Extrair outros recursos (iframes, objetos, etc.)
+        for other_data in page.others:
+            self._add_resource('others', other_data)
+                
+        self._print_resource_counts()
+        
+        # Atualizar progresso com resumo dos recursos encontrados
+        if self.progress_callback:
+            total_resources = sum(len(resources) for resources in self.resources.values())
+            resource_summary = {
+                "images": len(self.resources['images']),
+                "css": len(self.resources['css']),
+                "js": len(self.resources['js']),
+                "fonts": len(self.resources['fonts']),
+                "videos": len(self.resources['videos']),
+                "others": len(self.resources['others']),
+                "total": total_resources
+            }
+            self.progress_callback(45, f"Total de {total_resources} recursos encontrados", resource_summary)
+    
+    def _print_resource_counts(self):
+        """
+        Exibe a quantidade de recursos encontrados por grupo
+        """
+        print(f"{Fore.GREEN}Recursos encontrados:")
+        print(f"  - Imagens: {len(self.resources['images'])}")
+        print(f"  - CSS: {len(self.resources['css'])}")
+        print(f"  - JavaScript: {len(self.resources['js'])}")
+        print(f"  - Fontes: {len(self.resources['fonts'])}")
+        print(f"  - Vídeos: {len(self.resources['videos'])}")
+        print(f"  - Outros: {len(self.resources['others'])}")
+    
+    def _analyze_resources(self):
+        """
+        Analisa cada recurso encontrado para obter tamanho, tempo de carregamento e métricas detalhadas
+        """
+        print(f"{Fore.YELLOW}Analisando recursos...")
+        
+        if self.progress_callback:
+            self.progress_callback(50, "Analisando tempos de carregamento dos recursos...", {})
+        
+        # Aliases (URLs já presentes em outro grupo) não são requisitados de novo
+        all_resources = []
+        for resource_type, resources in self.resources.items():
+            all_resources.extend(resource for resource in resources if 'alias_of' not in resource)
+        
+        # Adicionar também as APIs detectadas para análise
+        api_resources = []
+        api_aliases = []
+        for api_type, apis in self.apis.items():
+            for api in apis:
+                if not api.get("analyzed", False):
+                    api["resource_type"] = api_type
+                    if 'alias_of' in api:
+                        api_aliases.append(api)
+                    else:
+                        api_resources.append(api)
         
-        api_url_regex = '|'.join(api_url_patterns)
+        print(f"{Fore.GREEN}Analisando {len(all_resources)} recursos e {len(api_resources)} possíveis APIs...")
         
-        # Analisar todas as URLs dos recursos
-        for resource_type, resources in self.resources.items():
-            for resource in resources:
-                url = resource.get('url', '')
+        start_time = time.time()
+        
+        if self.sequential:
+            # Analisar todos os recursos normais
+            for resource in tqdm(all_resources, desc="Analisando recursos"):
+                self._analyze_single_resource(resource)
                 
-                # Verificar se a URL corresponde a algum padrão de API
-                if re.search(api_url_regex, url, re.IGNORECASE):
-                    # Determinar o tipo de API com base no padrão identificado
-                    api_type = "rest"  # Padrão
+            # Analisar APIs detectadas
+            if api_resources:
+                for api in tqdm(api_resources, desc="Analisando APIs"):
+                    self._analyze_single_resource(api, is_api=True)
+                    api["analyzed"] = True
+        else:
+            jobs = [(resource, False) for resource in all_resources]
+            jobs.extend((api, True) for api in api_resources)
+            self._analyze_resources_concurrently(jobs)
+            for api in api_resources:
+                api["analyzed"] = True
+        
+        # Os aliases recebem os resultados da requisição da URL principal
+        for api in api_aliases:
+            api["analyzed"] = True
+        self._fill_shared_assets()
+        self.url_registry.propagate()
+        
+        elapsed = time.time() - start_time
+        self.http_stats["resource_analysis_time"] = elapsed
+        mode = "sequencial" if self.sequential else f"concorrente ({self.max_workers} workers, {self.max_per_host} por host)"
+        print(f"{Fore.GREEN}Recursos analisados em {elapsed:.2f} segundos "
+              f"(modo {mode}, backend {self.transport.name})")
+    
+    # Campos gravados em cada recurso por _sample_requests (além de warm_samples e sample_errors)
+    SAMPLE_FIELDS = ResourceRecord.SAMPLE_FIELDS
+    
+    def _sample_resources(self):
+        """
+        Requisita cada recurso mais samples - 1 vezes e resume os tempos das medições quentes
+        
+        A medição da análise (conexão nova, cache da CDN possivelmente frio) vira
+        load_time_cold; as demais dão a mediana, o intervalo interquartil e o coeficiente
+        de variação de cada recurso. Um recurso mede samples - 1 vezes em sequência, e os
+        recursos rodam em paralelo dentro dos limites de concorrência global e por host.
+        """
+        resources = [resource for resources in self.resources.values() for resource in resources
+                     if 'alias_of' not in resource and not resource.get('shared_asset')
+                     and not resource.get('error') and not resource.get('skipped')
+                     and 0 < (resource.get('status_code') or 0) < 400]
+        if not resources:
+            return
+        warm_samples = self.samples - 1
+        print(f"{Fore.YELLOW}Repetindo a medição de {len(resources)} recursos ({warm_samples} vezes cada)...")
+        start_time = time.time()
+        # O prazo da análise já foi consumido; as repetições recebem um --deadline novo
+        analysis_deadline, self.deadline = self.deadline, AnalysisDeadline(self.deadline_seconds)
+        self.deadline.start_phase('sampling')
+        progress_bar = tqdm(total=len(resources), desc="Medições repetidas")
+        try:
+            self.transport.run_many([self._sample_requests(resource, warm_samples) for resource in resources],
+                                    self.max_workers, self.max_per_host, lambda: progress_bar.update(1))
+        finally:
+            progress_bar.close()
+            self.deadline = analysis_deadline
+        self.http_stats["sampling"] = {
+            "samples": self.samples,
+            "resources": len(resources),
+            "warm_resources": sum(1 for resource in resources if resource.get('warm_samples')),
+            "requests": sum(resource.get('warm_samples', 0) + resource.get('sample_errors', 0)
+                            for resource in resources),
+            "skipped": sum(resource.get('samples_skipped', 0) for resource in resources),
+            "time": time.time() - start_time
+        }
+        print(f"{Fore.GREEN}Medições repetidas concluídas em {self.http_stats['sampling']['time']:.2f} segundos")
+    
+    def _sample_request(self, resource):
+        """
+        Método e cabeçalhos que repetem a última requisição da medição original do recurso
+        """
+        last_step = (resource.get('fetch_strategy') or 'get').split('+')[-1]
+        if last_step == 'head':
+            return 'HEAD', {}
+        if last_step == 'range':
+            return 'GET', {'Range': 'bytes=0-0'}
+        if last_step == 'image-range':
+            return 'GET', {'Range': f'bytes=0-{self.IMAGE_HEADER_BYTES - 1}'}
+        return 'GET', {}
+    
+    def _sample_requests(self, resource, count):
+        """
+        Gerador com as medições quentes de um recurso; grava o resumo no próprio recurso
+        """
+        method, headers = self._sample_request(resource)
+        times = []
+        errors = 0
+        skipped = 0
+        for index in range(count):
+            try:
+                response = yield self._new_request(method, resource['url'], headers=headers, keep_body=False,
+                                                   max_bytes=self.max_resource_bytes)
+            except Exception as e:
+                if self._is_deadline_error(e):
+                    # Falta de tempo, não erro do servidor: as medições restantes nem são feitas
+                    skipped = count - index
+                    break
+                errors += 1
+                continue
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                times.append(response.load_time)
+        resource['load_time_cold'] = resource.get('load_time', 0)
+        resource['warm_samples'] = len(times)
+        resource['sample_errors'] = errors
+        resource['samples_skipped'] = skipped
+        if times:
+            resource.update(self._robust_stats(times))
+    
+    @staticmethod
+    def _robust_stats(times):
+        """
+        Mediana, quartis, intervalo interquartil e coeficiente de variação das medições
+        """
+        ordered = sorted(times)
+        if len(ordered) > 1:
+            q1, median, q3 = statistics.quantiles(ordered, n=4, method='inclusive')
+        else:
+            q1 = median = q3 = ordered[0]
+        mean = statistics.mean(ordered)
+        return {
+            'load_time_median': median,
+            'load_time_p25': q1,
+            'load_time_p75': q3,
+            'load_time_iqr': q3 - q1,
+            'load_time_cv': statistics.pstdev(ordered) / mean if mean else 0,
+            'load_time_warm_min': ordered[0],
+            'load_time_warm_max': ordered[-1]
+        }
+    
+    def resource_summary(self):
+        """
+        ResourceSummary dos recursos analisados, calculado uma vez e compartilhado por todos os relatórios
+        """
+        if self._resource_summary is None:
+            self._resource_summary = ResourceSummary.from_resources(self.resources)
+        return self._resource_summary
+    
+    def _analyze_resources_concurrently(self, jobs):
+        """
+        Analisa os recursos respeitando os limites global e por host de concorrência
+        
+        Args:
+            jobs (list): Lista de tuplas (recurso, is_api). Os resultados são gravados
+                         diretamente em cada dicionário de recurso.
+        """
+        progress_bar = tqdm(total=len(jobs), desc="Analisando recursos")
+        completed = [0]
+        
+        def on_done():
+            progress_bar.update(1)
+            completed[0] += 1
+            if self.progress_callback and completed[0] % 10 == 0:
+                percent = 50 + int(completed[0] / len(jobs) * 10)
+                self.progress_callback(percent, f"Recursos analisados: {completed[0]}/{len(jobs)}", {})
+        
+        try:
+            self.transport.run_many(
+                [self._resource_requests(resource, is_api) for resource, is_api in jobs],
+                self.max_workers, self.max_per_host, on_done, self.concurrency
+            )
+        finally:
+            progress_bar.close()
+    
+    # Estratégia de requisição por element_type. 'get' baixa o corpo (necessário para
+    # analisar JSON, scripts e imagens), 'head' e 'range' obtêm apenas o tamanho.
+    FETCH_STRATEGY_BY_ELEMENT = {
+        'img': 'get',
+        'js': 'get',
+        'css': 'head',
+        'css-import': 'head',
+        'font': 'head',
+        'iframe': 'head',
+        'video': 'range'
+    }
+    
+    # Bytes iniciais pedidos no modo de metadados de imagem e limite de crescimento
+    IMAGE_HEADER_BYTES = 16 * 1024
+    IMAGE_HEADER_MAX_BYTES = 1024 * 1024
+    
+    def _plan_fetch_strategy(self, resource, is_api=False):
+        """
+        Escolhe a estratégia de requisição com menos round trips para o recurso
+        """
+        if is_api:
+            return 'get'
+        if self.image_metadata_only and resource.get('element_type') == 'img':
+            return 'image-range'
+        return self.FETCH_STRATEGY_BY_ELEMENT.get(resource.get('element_type'), 'get')
+    
+    @staticmethod
+    def _read_image_header(data):
+        """
+        Lê dimensões, formato e modo de uma imagem a partir de seus bytes iniciais
+        
+        Returns:
+            dict: Metadados da imagem ou None se o cabeçalho ainda não está completo
+        """
+        try:
+            # Image.open só lê o cabeçalho; os pixels não são decodificados
+            img = Image.open(io.BytesIO(data))
+            return {
+                'img_width': img.width,
+                'img_height': img.height,
+                'img_format': img.format,
+                'img_mode': img.mode,
+                'img_aspect_ratio': round(img.width / img.height, 2) if img.height > 0 else 0
+            }
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _declared_size(response):
+        """
+        Retorna o tamanho declarado em Content-Length ou None se ausente/inválido
+        """
+        try:
+            return int(response.headers.get('content-length'))
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _content_range_total(content_range):
+        """
+        Extrai o tamanho total de um cabeçalho Content-Range (ex.: 'bytes 0-0/12345')
+        """
+        if not content_range or '/' not in content_range:
+            return None
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    
+    def _body_needed(self, resource, is_api=False):
+        """
+        Indica se o corpo do recurso deve ser mantido em memória para análise posterior
+        
+        Scripts (busca de APIs) e APIs sempre precisam do corpo; imagens só quando o
+        conteúdo é de fato uma imagem; os demais apenas se a resposta for JSON.
+        Os outros corpos são lidos em streaming e apenas contados.
+        """
+        element_type = resource.get('element_type')
+        if is_api or element_type == 'js':
+            return True
+        if element_type == 'img':
+            return lambda headers: any(kind in headers.get('content-type', '').lower()
+                                       for kind in ('image', 'application/json'))
+        return lambda headers: 'application/json' in headers.get('content-type', '').lower()
+    
+    def _analyze_single_resource(self, resource, is_api=False):
+        """
+        Analisa um único recurso para obter informações detalhadas
+        """
+        self.transport.run(self._resource_requests(resource, is_api))
+    
+    # Espera máxima pela medição de um recurso feita por outra página da varredura
+    SHARED_ASSET_WAIT = 120
+    
+    def _resource_requests(self, resource, is_api=False):
+        """
+        Gerador com a análise de um único recurso
+        
+        Em uma varredura do site (asset_results), recursos já medidos por outra página
+        não são requisitados de novo: recebem uma cópia da medição em _fill_shared_assets.
+        """
+        if is_api or self.asset_results is None:
+            return (yield from self._fetch_resource_requests(resource, is_api))
+        if not self.asset_results.claim(resource['url']):
+            resource['shared_asset'] = True
+            return
+        known = dict(resource)
+        try:
+            yield from self._fetch_resource_requests(resource)
+        finally:
+            self.asset_results.publish(resource['url'], {
+                key: value for key, value in resource.items()
+                if key not in known or known[key] is not value
+            })
+    
+    def _fill_shared_assets(self):
+        """
+        Copia para os recursos marcados como shared_asset a medição da outra página
+        """
+        if self.asset_results is None:
+            return
+        for resources in self.resources.values():
+            for resource in resources:
+                if resource.get('shared_asset') and 'status_code' not in resource:
+                    fields = self.asset_results.wait(resource['url'], self.SHARED_ASSET_WAIT)
+                    if fields is None:
+                        resource.update(size=0, load_time=0, status_code=0,
+                                        error="medição compartilhada não concluída")
+                    else:
+                        resource.update(fields)
+    
+    def _fetch_resource_requests(self, resource, is_api=False):
+        """
+        Gerador com as requisições e a análise de um único recurso
+        
+        Cada ``yield`` entrega uma FetchRequest ao transporte e recebe o FetchResult
+        correspondente, de forma que a mesma lógica serve aos backends síncrono e asyncio.
+        """
+        try:
+            # Usar a sessão para aproveitar a conexão persistente
+            headers = {}
+            
+            # Para APIs, adicionar cabeçalhos específicos
+            if is_api:
+                headers = {
+                    'Accept': 'application/json, application/xml, */*',
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            
+            url = resource['url']
+            strategy = self._plan_fetch_strategy(resource, is_api)
+            keep_body = self._body_needed(resource, is_api)
+            steps = []
+            round_trips = 0
+            transferred = 0
+            size = None
+            
+            # Recursos já baixados em etapas anteriores (ex.: scripts lidos por
+            # _detect_apis) vêm do cache, com os tempos da primeira requisição real
+            response = None if is_api else self.response_cache.get(url)
+            if response is not None:
+                steps.append('cache')
+                resource['from_response_cache'] = True
+                size = response.size
+            
+            if response is None and strategy == 'head':
+                # Tipos em que só o tamanho interessa: HEAD seguindo redirecionamentos
+                response = yield self._new_request('HEAD', url, headers=headers)
+                steps.append('head')
+                round_trips += 1 + response.redirects
+                transferred += response.size
+                size = self._declared_size(response)
+                # Servidores que não aceitam HEAD ou não informam o tamanho: tentar Range
+                if response.status_code in (405, 501) or (response.status_code == 200 and size is None):
+                    strategy = 'range'
+                    response = None
+            
+            if response is None and strategy == 'range':
+                # GET com Range de 1 byte: o tamanho total vem de Content-Range
+                range_headers = dict(headers, Range='bytes=0-0')
+                response = yield self._new_request('GET', url, headers=range_headers,
+                                                   keep_body=keep_body, max_bytes=self.max_resource_bytes)
+                steps.append('range')
+                round_trips += 1 + response.redirects
+                transferred += response.size
+                if response.status_code == 206:
+                    size = self._content_range_total(response.headers.get('content-range'))
+                elif response.status_code == 416:
+                    size = 0
+                else:
+                    # Servidor ignorou o Range e devolveu o corpo completo (lido em streaming)
+                    size = response.size
+            
+            if response is None and strategy == 'image-range':
+                # Metadados de imagem: baixar só o início do arquivo, ampliando a faixa
+                # até o cabeçalho ser reconhecido. O tamanho total vem de Content-Range.
+                image_data = b''
+                range_end = self.IMAGE_HEADER_BYTES
+                while True:
+                    range_headers = dict(headers, Range=f'bytes={len(image_data)}-{range_end - 1}')
+                    response = yield self._new_request('GET', url, headers=range_headers,
+                                                       keep_body=keep_body, max_bytes=self.max_resource_bytes)
+                    steps.append('image-range')
+                    round_trips += 1 + response.redirects
+                    transferred += response.size
+                    if response.status_code != 206:
+                        # Range ignorado (ou erro): a resposta é tratada como um GET comum
+                        size = response.size
+                        break
+                    image_data += response.content
+                    size = self._content_range_total(response.headers.get('content-range'))
+                    image_info = self._read_image_header(image_data)
+                    if image_info:
+                        resource.update(image_info)
+                        resource['img_metadata_only'] = True
+                        break
+                    if (size is not None and len(image_data) >= size) or range_end >= self.IMAGE_HEADER_MAX_BYTES:
+                        resource['img_error'] = f"cabeçalho da imagem não reconhecido nos primeiros {len(image_data)} bytes"
+                        break
+                    range_end *= 4
+            
+            if response is None:
+                # Corpo necessário para análise (APIs, JSON, scripts, imagens): um único GET
+                response = yield self._new_request('GET', url, headers=headers,
+                                                   keep_body=keep_body, max_bytes=self.max_resource_bytes)
+                steps.append('get')
+                round_trips += 1 + response.redirects
+                transferred += response.size
+                size = response.size
+                if not is_api and response.status_code == 200:
+                    self.response_cache.put(url, response)
+            
+            # Conteúdo JSON descoberto por uma estratégia sem corpo: buscar o corpo
+            content_type = response.headers.get('content-type', 'unknown')
+            if steps[-1] in ('head', 'range') and response.status_code < 400 \
+                    and 'application/json' in content_type.lower():
+                response = yield self._new_request('GET', url, headers=headers,
+                                                   max_bytes=self.max_resource_bytes)
+                steps.append('get')
+                round_trips += 1 + response.redirects
+                transferred += response.size
+                size = response.size
+            
+            load_time = response.load_time
+            resource['fetch_strategy'] = '+'.join(steps)
+            resource['round_trips'] = round_trips
+            resource['bytes_transferred'] = transferred
+            resource['time_to_last_byte'] = response.time_to_last_byte
+            for phase in NETWORK_PHASES:
+                resource[f'{phase}_time'] = response.timings.get(phase)
+            resource['connection_reused'] = response.connection_reused
+            resource['throttle_retries'] = response.throttle_retries
+            resource['throughput_kbps'] = round(response.throughput / 1024, 2)
+            if response.truncated:
+                # O tamanho real é maior que o limite; size registra o que foi lido
+                resource['truncated'] = True
+            
+            # Registrar nas estatísticas HTTP
+            self._record_http_stats(response, load_time, resource.get('resource_type', 'others'))
+            
+            # Coletar informações dos cabeçalhos
+            headers = response.headers
+            content_type = headers.get('content-type', 'unknown')
+            resource['content_type'] = content_type
+            resource['server'] = headers.get('server', 'unknown')
+            
+            # Informações de cache
+            resource['cache_control'] = headers.get('cache-control', 'not-specified')
+            resource['etag'] = headers.get('etag', 'not-specified')
+            resource['expires'] = headers.get('expires', 'not-specified')
+            resource['last_modified'] = headers.get('last-modified', 'not-specified')
+            
+            # Informações de compressão
+            resource['content_encoding'] = headers.get('content-encoding', 'none')
+            
+            # Informações de segurança e CORS
+            resource['x_content_type_options'] = headers.get('x-content-type-options', 'not-specified')
+            resource['strict_transport_security'] = headers.get('strict-transport-security', 'not-specified')
+            resource['access_control_allow_origin'] = headers.get('access-control-allow-origin', 'not-specified')
+            
+            # Informações de conexão
+            resource['connection'] = headers.get('connection', 'not-specified')
+            
+            # Tamanho real do conteúdo baixado ou, nas estratégias sem corpo,
+            # o tamanho declarado em Content-Length/Content-Range
+            resource['size'] = size if size is not None else response.size
+            resource['load_time'] = load_time
+            resource['status_code'] = response.status_code
+            resource['time_to_first_byte'] = response.time_to_first_byte
+            resource['redirects'] = response.redirects
+            
+            # Para APIs, tentar analisar o conteúdo como JSON
+            if is_api or 'application/json' in content_type.lower():
+                try:
+                    json_data = json.loads(response.text)
+                    resource['is_json'] = True
                     
-                    # Análise mais específica do tipo de API
-                    if "graphql" in url.lower():
-                        api_type = "graphql"
-                    elif "product" in url.lower() or "produto" in url.lower() or "catalog" in url.lower():
-                        api_type = "products"
-                    elif ".json" in url.lower():
-                        api_type = "json"
+                    # Extrair informações básicas sobre a estrutura do JSON
+                    if isinstance(json_data, dict):
+                        resource['json_keys'] = list(json_data.keys())[:10]  # Primeiras 10 chaves
+                        resource['json_structure'] = 'object'
+                        
+                        # Detecção de APIs de produtos com base nas chaves do JSON
+                        product_keys = ['product', 'products', 'sku', 'items', 'catalog', 
+                                       'price', 'stock', 'inventory', 'categoria', 'category']
+                        api_keys = ['api', 'data', 'results', 'pagination', 'meta', 'response']
+                        
+                        # Verificar se é uma API de produtos
+                        if any(key.lower() in product_keys for key in json_data.keys()):
+                            # Este é um recurso de produtos, vamos adicioná-lo à lista de APIs
+                            if not is_api:  # Se ainda não foi identificado como API
+                                url = resource['url']
+                                with self._lock:
+                                    self._add_api("products", {
+                                        "url": url,
+                                        "pattern_detected": "json_content_analysis",
+                                        "content_type": content_type,
+                                        "analyzed": True,
+                                        "status_code": resource.get('status_code', 0),
+                                        "load_time": resource.get('load_time', 0),
+                                        "size": resource.get('size', 0)
+                                    })
+                    elif isinstance(json_data, list):
+                        resource['json_structure'] = 'array'
+                        resource['json_length'] = len(json_data)
+                        
+                        # Se a lista contém dicionários com chaves relacionadas a produtos
+                        if len(json_data) > 0 and isinstance(json_data[0], dict):
+                            sample_keys = set()
+                            for item in json_data[:5]:  # Analisar os primeiros 5 itens
+                                if isinstance(item, dict):
+                                    sample_keys.update(item.keys())
+                            
+                            # Verificar se tem chaves típicas de produtos
+                            product_item_keys = ['id', 'name', 'price', 'sku', 'image', 'description', 
+                                               'nome', 'preco', 'imagem', 'categoria']
+                            if any(key.lower() in product_item_keys for key in sample_keys):
+                                # Este parece ser uma API de produtos
+                                url = resource['url']
+                                with self._lock:
+                                    self._add_api("products", {
+                                        "url": url,
+                                        "pattern_detected": "json_array_analysis",
+                                        "content_type": content_type,
+                                        "analyzed": True,
+                                        "status_code": resource.get('status_code', 0),
+                                        "load_time": resource.get('load_time', 0),
+                                        "size": resource.get('size', 0)
+                                    })
                     
-                    # Adicionar à lista de APIs se ainda não existir
-                    if url not in [api["url"] for api in self.apis[api_type]]:
-                        self.apis[api_type].append({
-                            "url": url,
-                            "pattern_detected": "url_pattern",
-                            "source": resource_type,
-                            "analyzed": False
-                        })
-    
-    def _extract_resources(self, soup):
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    resource['is_json'] = False
+            
+            # Para imagens, obter dimensões e formato
+            # (no modo de metadados os campos já foram preenchidos a partir do cabeçalho)
+            if resource.get('element_type') == 'img' and 'image' in content_type.lower() \
+                    and 'img_width' not in resource and 'img_error' not in resource:
+                try:
+                    img = Image.open(io.BytesIO(response.content))
+                    resource['img_width'] = img.width
+                    resource['img_height'] = img.height
+                    resource['img_format'] = img.format
+                    resource['img_mode'] = img.mode
+                    resource['img_colors'] = len(img.getcolors(maxcolors=65536)) if img.getcolors(maxcolors=65536) else 'more than 65536'
+                    resource['img_aspect_ratio'] = round(img.width / img.height, 2) if img.height > 0 else 0
+                except Exception as img_e:
+                    resource['img_error'] = str(img_e)
+            
+        except Exception as e:
+            if self._is_deadline_error(e):
+                resource['skipped'] = 'deadline'
+                resource['error'] = str(e)
+                self._record_skipped(resource['url'], str(e))
+                return
+            resource['size'] = 0
+            resource['load_time'] = 0
+            resource['status_code'] = 0
+            resource['error'] = str(e)
+            self._record_failed_request()
+
+    def generate_report(self, fixed_name=False):
         """
-        Extrai recursos (imagens, CSS, JS, fontes, vídeos, etc.) do HTML
+        Gera relatório CSV com os resultados da análise e gráficos
+        
+        Args:
+            fixed_name (bool): Se True, usa um nome fixo para o relatório HTML
         """
-        print(f"{Fore.YELLOW}Extraindo recursos da página...")
+        # Atualizar progresso - Iniciando geração de relatório
+        if self.progress_callback:
+            self.progress_callback(75, "Gerando relatórios de performance...", {})
+        
+        # Se fixed_name for True, usar um nome consistente para o relatório HTML
+        timestamp = "latest" if fixed_name else self.report_timestamp
+        domain = self.domain.replace(".", "_")
+        
+        # Gerar relatório CSV principal
+        main_filename = f"{self.output_dir}/performance_report_{domain}_{timestamp}.csv"
+        api_filename = f"{self.output_dir}/api_report_{domain}_{timestamp}.csv"
+        http_stats_filename = f"{self.output_dir}/http_stats_{domain}_{timestamp}.csv"
+        probe_filename = f"{self.output_dir}/probe_report_{domain}_{timestamp}.csv"
+        html_filename = f"{self.output_dir}/performance_report_{domain}_{timestamp}.html"
         
-        # Extrair imagens
-        if self.progress_callback:
-            self.progress_callback(30, "Analisando imagens da página...", {"type": "images"})
+        print(f"{Fore.CYAN}Gerando relatórios...")
+        
+        # Definir todos os campos possíveis para o CSV principal
+        fieldnames = [
+            'tipo', 'url', 'tamanho_kb', 'tempo_carregamento_s', 'time_to_first_byte_s',
+            'status_code', 'content_type', 'server', 'cache_control', 'etag', 'expires',
+            'last_modified', 'content_encoding', 'element_type', 'media', 'integrity',
+            'async', 'defer', 'type', 'alt_text', 'loading', 'redirects',
+            'img_width', 'img_height', 'img_format', 'img_mode', 'img_colors',
+            'img_aspect_ratio', 'error', 'connection', 'x_content_type_options',
+            'strict_transport_security', 'access_control_allow_origin',
+            'from_response_cache', 'fetch_strategy', 'round_trips', 'bytes_transferred',
+            'img_metadata_only', 'img_error', 'time_to_last_byte', 'throughput_kbps', 'truncated',
+            'dns_time_s', 'connect_time_s', 'tls_time_s', 'wait_time_s', 'download_time_s',
+            'connection_reused', 'skipped', 'alias_of', 'roles', 'throttle_retries',
+            'warm_samples', 'sample_errors', 'samples_skipped'
+        ] + list(self.SAMPLE_FIELDS)
+        
+        # Gerar o relatório CSV principal
+        with open(main_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
             
-        for img in soup.find_all('img'):
-            src = img.get('src')
-            if src:
-                full_url = urljoin(self.url, src)
-                img_data = {
-                    'url': full_url,
-                    'element_type': 'img',
-                    'alt_text': img.get('alt', ''),
-                    'width': img.get('width', ''),
-                    'height': img.get('height', ''),
-                    'loading': img.get('loading', '')
+            # Adicionar dados da página HTML principal
+            writer.writerow({
+                'tipo': 'html',
+                'url': self.url,
+                'tamanho_kb': round(self.page_size / 1024, 2),
+                'tempo_carregamento_s': round(self.total_load_time, 2),
+                'status_code': 200,
+                'content_type': 'text/html'
+            })
+            
+            # Adicionar dados de todos os recursos
+            for record in self.resource_summary().records:
+                # Criar um dicionário com todos os dados do recurso
+                resource_data = {
+                    'tipo': record.resource_type,
+                    'url': record.url,
+                    'tamanho_kb': round(record.size / 1024, 2),
+                    'tempo_carregamento_s': round(record.load_time, 2),
+                    'time_to_first_byte_s': round(record.time_to_first_byte, 3),
+                    'status_code': record.status_code or 0,
+                    'content_type': record.content_type,
+                    'cache_control': record.cache_control,
+                    'connection_reused': record.connection_reused
                 }
-                self.resources['images'].append(img_data)
                 
-                # Atualizar com a imagem atual sendo analisada (a cada 5 imagens)
-                if self.progress_callback and len(self.resources['images']) % 5 == 0:
-                    self.progress_callback(30, f"Analisando imagens ({len(self.resources['images'])} encontradas)...", 
-                                         {"type": "images", "url": full_url})
-        
-        # Extrair CSS
-        if self.progress_callback:
-            self.progress_callback(35, "Analisando arquivos de estilo (CSS)...", {"type": "css"})
-            
-        for css in soup.find_all('link', rel='stylesheet'):
-            href = css.get('href')
-            if href:
-                full_url = urljoin(self.url, href)
-                self.resources['css'].append({
-                    'url': full_url,
-                    'element_type': 'css',
-                    'media': css.get('media', 'all'),
-                    'integrity': css.get('integrity', '')
-                })
+                # Fases de rede (vazias quando o transporte não consegue medi-las)
+                for phase, duration in zip(NETWORK_PHASES, record.phase_times):
+                    resource_data[f'{phase}_time_s'] = round(duration, 4) if duration is not None else ''
                 
-                # Atualizar com o CSS atual sendo analisado
-                if self.progress_callback:
-                    self.progress_callback(35, f"Analisando CSS: {full_url.split('/')[-1]}", 
-                                         {"type": "css", "url": full_url})
-        
-        # Extrair JavaScript
-        if self.progress_callback:
-            self.progress_callback(40, "Analisando scripts JavaScript...", {"type": "js"})
-            
-        for script in soup.find_all('script', src=True):
-            src = script.get('src')
-            if src:
-                full_url = urljoin(self.url, src)
-                self.resources['js'].append({
-                    'url': full_url,
-                    'element_type': 'js',
-                    'async': 'async' if script.get('async') else 'false',
-                    'defer': 'defer' if script.get('defer') else 'false',
-                    'type': script.get('type', 'text/javascript')
-                })
+                # Grupos (recurso/API) em que a mesma URL aparece
+                resource_data['roles'] = ';'.join(self.url_registry.groups(record.url))
                 
-                # Atualizar com o script atual sendo analisado
-                if self.progress_callback:
-                    script_name = full_url.split('/')[-1]
-                    self.progress_callback(40, f"Analisando script: {script_name}", 
-                                         {"type": "js", "url": full_url})
+                # Adicionar todos os campos extras disponíveis
+                resource_data.update(zip(ResourceRecord.DETAIL_FIELDS, record.details))
+                resource_data['redirects'] = record.detail('redirects', 0)
+                
+                # Resumo das medições repetidas (--samples)
+                for field in self.SAMPLE_FIELDS:
+                    value = resource_data[field]
+                    if value is not None:
+                        resource_data[field] = round(value, 4)
+                
+                writer.writerow(resource_data)
         
-        # Extrair fontes
-        for font in soup.find_all('link', rel=lambda x: x and 'font' in x):
-            href = font.get('href')
-            if href:
-                full_url = urljoin(self.url, href)
-                self.resources['fonts'].append({
-                    'url': full_url,
-                    'element_type': 'font'
-                })
+        # Gerar relatório específico para APIs
+        api_fieldnames = [
+            'tipo', 'url', 'pattern_detected', 'source_script', 'source_offset', 'status_code', 
+            'tamanho_kb', 'tempo_carregamento_s', 'time_to_first_byte_s', 
+            'content_type', 'is_json', 'json_structure', 'json_keys', 'json_length',
+            'cache_control', 'server', 'access_control_allow_origin', 'error'
+        ]
         
-        # Extrair recursos de estilo @import dentro de CSS
-        for style in soup.find_all('style'):
-            style_text = style.string
-            if style_text:
-                import_urls = re.findall(r'@import\s+[\'"]([^\'"]+)[\'"]', style_text)
-                for url in import_urls:
-                    full_url = urljoin(self.url, url)
-                    self.resources['css'].append({
-                        'url': full_url,
-                        'element_type': 'css-import'
-                    })
+        with open(api_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=api_fieldnames)
+            writer.writeheader()
+            
+            # Adicionar dados de todas as APIs
+            for api_type, apis in self.apis.items():
+                for api in apis:
+                    if api.get('analyzed', False):
+                        api_data = {
+                            'tipo': api_type,
+                            'url': api['url'],
+                            'pattern_detected': api.get('pattern_detected', ''),
+                            'source_script': api.get('source_script', ''),
+                            'source_offset': api.get('source_offset', ''),
+                            'status_code': api.get('status_code', 0),
+                            'tamanho_kb': round(api.get('size', 0) / 1024, 2),
+                            'tempo_carregamento_s': round(api.get('load_time', 0), 2),
+                            'time_to_first_byte_s': round(api.get('time_to_first_byte', 0), 3),
+                            'content_type': api.get('content_type', 'unknown'),
+                            'is_json': api.get('is_json', False),
+                            'json_structure': api.get('json_structure', ''),
+                            'json_keys': ', '.join(api.get('json_keys', [])) if api.get('json_keys') else '',
+                            'json_length': api.get('json_length', 0),
+                            'cache_control': api.get('cache_control', 'not-specified'),
+                            'server': api.get('server', 'unknown'),
+                            'access_control_allow_origin': api.get('access_control_allow_origin', 'not-specified'),
+                            'error': api.get('error', '')
+                        }
+                        writer.writerow(api_data)
         
-        # Extrair vídeos
-        for video in soup.find_all(['video', 'source']):
-            src = video.get('src')
-            if src:
-                full_url = urljoin(self.url, src)
-                self.resources['videos'].append({
-                    'url': full_url,
-                    'element_type': 'video',
-                    'type': video.get('type', '')
-                })
+        # Gerar relatório da sondagem de endpoints (uma linha por caminho sondado)
+        probe_fieldnames = [
+            'url', 'origin', 'resultado', 'status_code', 'content_type', 'tamanho_kb',
+            'tempo_carregamento_s', 'time_to_first_byte_s', 'body_hash', 'error'
+        ]
         
-        # Extrair outros recursos (iframes, objetos, etc.)
-        for iframe in soup.find_all('iframe'):
-            src = iframe.get('src')
-            if src:
-                full_url = urljoin(self.url, src)
-                self.resources['others'].append({
-                    'url': full_url,
-                    'element_type': 'iframe'
+        with open(probe_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=probe_fieldnames)
+            writer.writeheader()
+            for probe in self.probes:
+                writer.writerow({
+                    'url': probe['url'],
+                    'origin': probe['origin'],
+                    'resultado': probe['result'],
+                    'status_code': probe.get('status_code', ''),
+                    'content_type': probe.get('content_type', ''),
+                    'tamanho_kb': round(probe['size'] / 1024, 2) if 'size' in probe else '',
+                    'tempo_carregamento_s': round(probe['load_time'], 3) if 'load_time' in probe else '',
+                    'time_to_first_byte_s': round(probe['time_to_first_byte'], 3) if 'time_to_first_byte' in probe else '',
+                    'body_hash': probe.get('body_hash', ''),
+                    'error': probe.get('error', '')
                 })
-                
-        print(f"{Fore.GREEN}Recursos encontrados:")
-        print(f"  - Imagens: {len(self.resources['images'])}")
-        print(f"  - CSS: {len(self.resources['css'])}")
-        print(f"  - JavaScript: {len(self.resources['js'])}")
-        print(f"  - Fontes: {len(self.resources['fonts'])}")
-        print(f"  - Vídeos: {len(self.resources['videos'])}")
-        print(f"  - Outros: {len(self.resources['others'])}")
         
-        # Atualizar progresso com resumo dos recursos encontrados
-        if self.progress_callback:
-            total_resources = sum(len(resources) for resources in self.resources.values())
-            resource_summary = {
-                "images": len(self.resources['images']),
-                "css": len(self.resources['css']),
-                "js": len(self.resources['js']),
-                "fonts": len(self.resources['fonts']),
-                "videos": len(self.resources['videos']),
-                "others": len(self.resources['others']),
-                "total": total_resources
-            }
-            self.progress_callback(45, f"Total de {total_resources} recursos encontrados", resource_summary)
-
-    def _analyze_resources(self):
-        """
-        Analisa cada recurso encontrado para obter tamanho, tempo de carregamento e métricas detalhadas
-        """
-        print(f"{Fore.YELLOW}Analisando recursos...")
+        # Gerar relatório de estatísticas HTTP
+        with open(http_stats_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            
+            # Cabeçalho
+            writer.writerow(['Métrica', 'Valor'])
+            
+            # Estatísticas gerais
+            writer.writerow(['Total de Requisições', self.http_stats['total_requests']])
+            writer.writerow(['Requisições com Falha', self.http_stats['failed_requests']])
+            writer.writerow(['Modo de Análise', self.http_stats['analysis_mode']])
+            writer.writerow(['Concorrência por Host', 'adaptativa' if self.concurrency else f'fixa ({self.max_per_host})'])
+            writer.writerow(['Backend de Transporte', self.http_stats['transport_backend']])
+            writer.writerow(['Timeout por Requisição (s)', self.request_timeout])
+            writer.writerow(['Prazo da Análise (s)', self.deadline_seconds if self.deadline_seconds else 'sem limite'])
+            writer.writerow(['Requisições Ignoradas por Prazo', len(self.skipped)])
+            probe_summary = self._probe_summary()
+            writer.writerow(['Prazo da Sondagem (s)', self.probe_deadline if self.probe_deadline else 'sem limite'])
+            writer.writerow(['Sondagens de Endpoints', probe_summary['total']])
+            writer.writerow(['Sondagens com Erro', probe_summary['error']])
+            writer.writerow(['Origens Catch-all', ';'.join(probe_summary['catch_all_origins'])])
+            
+            # Cache de respostas
+            cache_stats = self.response_cache.stats()
+            writer.writerow(['Cache de Respostas - Acertos', cache_stats['hits']])
+            writer.writerow(['Cache de Respostas - Falhas', cache_stats['misses']])
+            writer.writerow(['Cache de Respostas - Descartes', cache_stats['evictions']])
+            writer.writerow(['Cache de Respostas - Bytes em Memória', cache_stats['bytes']])
+            writer.writerow(['Tempo de Análise dos Recursos (s)', round(self.http_stats['resource_analysis_time'], 3)])
+            
+            # Tempos de resposta
+            latency = self.http_stats['latency']
+            if latency.count:
+                writer.writerow(['Tempo Médio de Resposta (s)', round(latency.mean, 3)])
+                writer.writerow(['Tempo Mínimo de Resposta (s)', round(latency.min, 3)])
+                writer.writerow(['Tempo Máximo de Resposta (s)', round(latency.max, 3)])
+                for fraction in LatencyHistogram.PERCENTILES:
+                    writer.writerow([f'Tempo de Resposta {LatencyHistogram.percentile_label(fraction).upper()} (s)',
+                                     round(latency.percentile(fraction), 3)])
+            
+            # Percentis de latência por tipo de recurso e por host
+            writer.writerow(['', ''])
+            writer.writerow(['Latência', 'Grupo', 'Requisições', 'Média (ms)']
+                            + [f'{LatencyHistogram.percentile_label(fraction).upper()} (ms)'
+                               for fraction in LatencyHistogram.PERCENTILES] + ['Máximo (ms)'])
+            for group, name, summary in self._latency_summary():
+                writer.writerow([name, group, summary['count'], round(summary['mean'] * 1000, 1)]
+                                + [round(summary[LatencyHistogram.percentile_label(fraction)] * 1000, 1)
+                                   for fraction in LatencyHistogram.PERCENTILES]
+                                + [round(summary['max'] * 1000, 1)])
+            
+            # Fases de rede
+            writer.writerow(['', ''])
+            writer.writerow(['Fase de Rede', 'Média (s)', 'Máximo (s)', 'Amostras'])
+            for phase, phase_stats in self.http_stats['phase_times'].items():
+                if phase_stats['count']:
+                    writer.writerow([phase, round(phase_stats['total'] / phase_stats['count'], 4),
+                                     round(phase_stats['max'], 4), phase_stats['count']])
+            writer.writerow(['Conexões Novas', self.http_stats['connections_new']])
+            writer.writerow(['Conexões Reaproveitadas', self.http_stats['connections_reused']])
+            writer.writerow(['Pool de Conexões', 'compartilhado entre análises' if self.connection_pool else 'exclusivo da análise'])
+            if self.http_stats['connection_pool']:
+                writer.writerow(['', ''])
+                writer.writerow(['Host', 'Conexões Novas', 'Conexões Reaproveitadas'])
+                for host, pool_stats in self.http_stats['connection_pool'].items():
+                    writer.writerow([host, pool_stats['new'], pool_stats['reused']])
+            
+            # Concorrência adaptativa por host
+            if self.http_stats['host_concurrency']:
+                writer.writerow(['', ''])
+                writer.writerow(['Host', 'Limite Final', 'Limite Máximo', 'TTFB Mínimo (s)',
+                                 'Respostas 429/503', 'Reenvios (Retry-After)', 'Erros de Conexão'])
+                for host, host_stats in self.http_stats['host_concurrency'].items():
+                    ttfb_min = host_stats['ttfb_min']
+                    writer.writerow([host, host_stats['limit'], host_stats['peak'],
+                                     round(ttfb_min, 4) if ttfb_min is not None else '',
+                                     host_stats['throttled'], host_stats['retries'], host_stats['errors']])
+                writer.writerow(['', ''])
+                writer.writerow(['Host', 'Instante (s)', 'Limite', 'Motivo'])
+                for host, host_stats in self.http_stats['host_concurrency'].items():
+                    for offset, limit, reason in host_stats['timeline']:
+                        writer.writerow([host, offset, limit, reason])
+            
+            # Resolução DNS por host
+            if self.http_stats['dns']:
+                writer.writerow(['', ''])
+                writer.writerow(['DNS nos Tempos das Requisições', 'excluído' if self.exclude_dns else 'incluído'])
+                writer.writerow(['Host', 'Tempo de DNS (ms)', 'Endereços', 'TTL (s)', 'Origem do TTL',
+                                 'Resolução', 'Consultas', 'Acertos do Cache', 'Erro'])
+                for host, dns_stats in self.http_stats['dns'].items():
+                    dns_time = dns_stats['dns_time']
+                    writer.writerow([host, round(dns_time * 1000, 2) if dns_time is not None else '',
+                                     ';'.join(dns_stats['addresses']), dns_stats['ttl'], dns_stats['ttl_source'],
+                                     dns_stats['source'], dns_stats['lookups'], dns_stats['hits'],
+                                     dns_stats['error'] or ''])
+            
+            # Requisições ignoradas por falta de tempo
+            if self.skipped:
+                writer.writerow(['', ''])
+                writer.writerow(['Requisição Ignorada', 'Fase', 'Motivo'])
+                for skipped in self.skipped:
+                    writer.writerow([skipped['url'], skipped['phase'], skipped['reason']])
+            
+            # Status codes
+            writer.writerow(['', ''])
+            writer.writerow(['Códigos de Status HTTP', 'Contagem'])
+            for status_code, count in sorted(self.http_stats['status_codes'].items()):
+                writer.writerow([status_code, count])
+            
+            # Content types
+            writer.writerow(['', ''])
+            writer.writerow(['Tipos de Conteúdo', 'Contagem'])
+            for content_type, count in sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True):
+                writer.writerow([content_type, count])
         
-        if self.progress_callback:
-            self.progress_callback(50, "Analisando tempos de carregamento dos recursos...", {})
+        # Gerar gráficos
+        self._generate_graphs(timestamp, domain)
         
-        all_resources = []
-        for resource_type, resources in self.resources.items():
-            all_resources.extend(resources)
+        # Gerar relatório HTML
+        html_report_path = self._generate_html_report(html_filename)
         
-        # Adicionar também as APIs detectadas para análise
-        api_resources = []
-        for api_type, apis in self.apis.items():
-            for api in apis:
-                if not api.get("analyzed", False):
-                    api["resource_type"] = api_type
-                    api_resources.append(api)
+        print(f"{Fore.GREEN}Relatório principal gerado com sucesso: {main_filename}")
+        print(f"{Fore.GREEN}Relatório de APIs gerado com sucesso: {api_filename}")
+        print(f"{Fore.GREEN}Relatório de estatísticas HTTP gerado com sucesso: {http_stats_filename}")
+        print(f"{Fore.GREEN}Relatório de sondagem de endpoints gerado com sucesso: {probe_filename}")
+        print(f"{Fore.GREEN}Relatório HTML gerado com sucesso: {html_filename}")
         
-        print(f"{Fore.GREEN}Analisando {len(all_resources)} recursos e {len(api_resources)} possíveis APIs...")
+        # Armazenar o timestamp do relatório para uso no método main
+        self.report_timestamp = timestamp
         
-        # Analisar todos os recursos normais
-        for resource in tqdm(all_resources, desc="Analisando recursos"):
-            self._analyze_single_resource(resource)
-            
-        # Analisar APIs detectadas
-        if api_resources:
-            for api in tqdm(api_resources, desc="Analisando APIs"):
-                self._analyze_single_resource(api, is_api=True)
-                api["analyzed"] = True
+        return main_filename, html_report_path
     
-    def _analyze_single_resource(self, resource, is_api=False):
+    def _probe_summary(self):
         """
-        Analisa um único recurso para obter informações detalhadas
+        Contagem das sondagens de endpoints por resultado e origens catch-all
+        """
+        summary = {'total': len(self.probes)}
+        for result in ('api', 'not_api', 'catch_all', 'error', 'skipped'):
+            summary[result] = sum(1 for probe in self.probes if probe['result'] == result)
+        summary['catch_all_origins'] = sorted(origin for origin, state in self._probe_origins.items()
+                                              if state['catch_all'])
+        return summary
+    
+    def _generate_html_report(self, html_filename):
+        """
+        Gera um relatório HTML com Material Design
         """
+        # Atualizar progresso - Gerando relatório HTML
+        if self.progress_callback:
+            self.progress_callback(90, "Gerando relatório HTML interativo...", {})
+            
+        # Adicionar filtro tojson ao Jinja2
+        import json as _json
+        def tojson_filter(value):
+            return _json.dumps(value, ensure_ascii=False)
+        # Carregar o template
+        template_path = os.path.join(self.templates_dir, 'report_template.html')
+        if not os.path.exists(template_path):
+            print(f"{Fore.RED}Erro: Template HTML não encontrado em {template_path}")
+            
+            # Tentar encontrar o template em outros diretórios
+            possible_paths = [
+                os.path.join(os.getcwd(), "templates", "report_template.html"),
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report_template.html")
+            ]
+            
+            template_found = False
+            for path in possible_paths:
+                if os.path.exists(path):
+                    print(f"{Fore.GREEN}Template encontrado em caminho alternativo: {path}")
+                    template_path = path
+                    template_found = True
+                    break
+            
+            if not template_found:
+                print(f"{Fore.RED}Erro: Não foi possível encontrar o template HTML em nenhum diretório conhecido")
+                return
+                
         try:
-            start_time = time.time()
-            # Usar a sessão para aproveitar a conexão persistente
-            headers = {}
+            with open(template_path, 'r', encoding='utf-8') as file:
+                template_content = file.read()
+            env = Environment()
+            env.filters['tojson'] = tojson_filter
+            template = env.from_string(template_content)
+            print(f"{Fore.GREEN}Template HTML carregado com sucesso de {template_path}")
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao carregar template HTML: {e}")
+            return
+
+        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        try:
+            # Calcular estatísticas para o template (uma única passada pelos recursos)
+            summary = self.resource_summary()
+            # Uma URL listada em mais de um grupo (alias_of) é contada uma única vez
+            total_resources = summary.unique
+            total_size = self.page_size + summary.unique_size
+            total_size_mb = round(total_size / 1024 / 1024, 2)
+            
+            # Estatísticas de cache
+            cached_resources = summary.cached
+            cached_percent = round(summary.percent(cached_resources), 1)
+            
+            # Estatísticas de compressão
+            compressed_resources = summary.compressed
+            compressed_percent = round(summary.percent(compressed_resources), 1)
+            
+            # Estatísticas por tipo de recurso
+            resource_stats = {}
+            for resource_type, type_stats in summary.by_type.items():
+                stats = {
+                    'count': type_stats.count,
+                    'total_size_kb': round(type_stats.size / 1024, 2),
+                    'avg_time': round(type_stats.avg_time, 2)
+                }
+                
+                # Estatísticas específicas para cada tipo
+                if resource_type == 'images':
+                    stats['formats'] = type_stats.formats
+                    stats['no_alt_text'] = type_stats.no_alt_text
+                elif resource_type == 'js':
+                    stats['async_scripts'] = type_stats.async_scripts
+                    stats['defer_scripts'] = type_stats.defer_scripts
+                
+                resource_stats[resource_type] = stats
+            
+            # API data
+            api_data = {}
+            total_apis = 0
+            for api_type, apis in self.apis.items():
+                analyzed_apis = [api for api in apis if api.get('analyzed', False)]
+                if analyzed_apis:
+                    simplified_apis = []
+                    for api in analyzed_apis:
+                        simplified_api = {
+                            'url': api['url'],
+                            'status_code': api.get('status_code', 0),
+                            'load_time': round(api.get('load_time', 0), 2),
+                            'size_kb': round(api.get('size', 0) / 1024, 2),
+                            'content_type': api.get('content_type', 'unknown')
+                        }
+                        simplified_apis.append(simplified_api)
+                    
+                    api_data[api_type] = simplified_apis
+                    total_apis += len(analyzed_apis)
             
-            # Para APIs, adicionar cabeçalhos específicos
-            if is_api:
-                headers = {
-                    'Accept': 'application/json, application/xml, */*',
-                    'X-Requested-With': 'XMLHttpRequest'
+            # Recursos mais lentos. Com medições repetidas, o tempo é a mediana das medições
+            # quentes, e não a medição única (que um único pacote retransmitido distorce)
+            def ranking_entry(record):
+                return {
+                    'tipo': record.resource_type,
+                    'url': record.url,
+                    'load_time': round(record.robust_time, 3),
+                    'load_time_cold': round(record.load_time_cold, 3),
+                    'load_time_iqr': round(record.load_time_iqr, 3) if record.load_time_iqr is not None else None,
+                    'load_time_cv': round(record.load_time_cv * 100, 1) if record.load_time_cv is not None else None,
+                    'size_kb': round(record.size / 1024, 2),
+                    'status_code': record.status_code or 0
                 }
             
-            # Primeira tentativa com HEAD para minimizar transferência de dados
-            response = self.session.head(resource['url'], timeout=10, headers=headers)
+            sampling = self.http_stats.get('sampling')
             
-            # Para APIs e recursos que não funcionam bem com HEAD, usar GET
-            if is_api or response.status_code != 200:
-                response = self.session.get(resource['url'], timeout=10, stream=True, headers=headers)
+            # Top 10 recursos mais lentos
+            slowest_resources = [ranking_entry(record) for record in summary.slowest(10)]
             
-            load_time = time.time() - start_time
+            # Top 10 recursos maiores (empates pelo tempo mediano)
+            largest_resources = [ranking_entry(record) for record in summary.largest(10)]
             
-            # Registrar nas estatísticas HTTP
-            self._record_http_stats(response, load_time)
+            # Estatísticas de tempo de resposta (histograma de latências)
+            latency = self.http_stats['latency'].percentiles()
+            response_time_stats = {
+                'avg': round(latency['mean'], 3),
+                'min': round(latency['min'], 3),
+                'max': round(latency['max'], 3),
+                'percentiles': [(LatencyHistogram.percentile_label(fraction).upper(),
+                                 round(latency[LatencyHistogram.percentile_label(fraction)], 3))
+                                for fraction in LatencyHistogram.PERCENTILES]
+            }
+            latency_rows = [{
+                'group': group,
+                'name': name,
+                'count': summary['count'],
+                'mean_ms': round(summary['mean'] * 1000, 1),
+                'percentiles_ms': [round(summary[LatencyHistogram.percentile_label(fraction)] * 1000, 1)
+                                   for fraction in LatencyHistogram.PERCENTILES],
+                'max_ms': round(summary['max'] * 1000, 1)
+            } for group, name, summary in self._latency_summary()]
             
-            # Coletar informações dos cabeçalhos
-            headers = response.headers
-            content_type = headers.get('content-type', 'unknown')
-            resource['content_type'] = content_type
-            resource['server'] = headers.get('server', 'unknown')
+            # Fases de rede agregadas (em ms)
+            network_phases = []
+            for phase, phase_stats in self.http_stats['phase_times'].items():
+                if phase_stats['count']:
+                    network_phases.append({
+                        'phase': phase,
+                        'avg_ms': round(phase_stats['total'] / phase_stats['count'] * 1000, 2),
+                        'max_ms': round(phase_stats['max'] * 1000, 2),
+                        'count': phase_stats['count']
+                    })
             
-            # Informações de cache
-            resource['cache_control'] = headers.get('cache-control', 'not-specified')
-            resource['etag'] = headers.get('etag', 'not-specified')
-            resource['expires'] = headers.get('expires', 'not-specified')
-            resource['last_modified'] = headers.get('last-modified', 'not-specified')
+            # Top tipos de conteúdo
+            sorted_content_types = sorted(
+                self.http_stats['content_types'].items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
             
-            # Informações de compressão
-            resource['content_encoding'] = headers.get('content-encoding', 'none')
+            # Preparar dados de todos os recursos para incluir no HTML
+            all_resources = []
             
-            # Informações de segurança e CORS
-            resource['x_content_type_options'] = headers.get('x-content-type-options', 'not-specified')
-            resource['strict_transport_security'] = headers.get('strict-transport-security', 'not-specified')
-            resource['access_control_allow_origin'] = headers.get('access-control-allow-origin', 'not-specified')
+            # Adicionar página HTML principal
+            html_load_time_ms = round(self.total_load_time * 1000, 2)
+            all_resources.append({
+                'tipo': 'html',
+                'url': self.url,
+                'tamanho_kb': round(self.page_size / 1024, 2),
+                'tempo_ms': html_load_time_ms,
+                'mime_type': 'text/html',
+                'status': '200',
+                'cache': self.main_page_response.headers.get('Cache-Control', 'N/A') if hasattr(self, 'main_page_response') else 'N/A'
+            })
             
-            # Informações de conexão
-            resource['connection'] = headers.get('connection', 'not-specified')
+            # Adicionar todos os outros recursos
+            resource_type_mapping = {
+                'images': 'img',
+                'css': 'css',
+                'js': 'js',
+                'fonts': 'font',
+                'videos': 'media',
+                'others': 'other'
+            }
             
-            # Sempre usar o tamanho real do conteúdo baixado
-            if not hasattr(response, 'content'):
-                response = self.session.get(resource['url'], timeout=10)
-            size = len(response.content)
-            resource['size'] = size
-            resource['load_time'] = load_time
-            resource['status_code'] = response.status_code
-            resource['time_to_first_byte'] = response.elapsed.total_seconds()
-            resource['redirects'] = len(response.history) if hasattr(response, 'history') else 0
+            for record in summary.records:
+                resource_entry = {
+                    'tipo': resource_type_mapping.get(record.resource_type, 'other'),
+                    'url': record.url,
+                    'tamanho_kb': round(record.size / 1024, 2),
+                    'tempo_ms': round(record.load_time * 1000, 2),
+                    'mime_type': record.content_type or 'N/A',
+                    'status': str(record.status_code if record.status_code is not None else 'N/A'),
+                    'cache': record.cache_control or 'N/A',
+                    'connection_reused': record.connection_reused
+                }
+                for phase, duration in zip(NETWORK_PHASES, record.phase_times):
+                    resource_entry[f'{phase}_ms'] = round(duration * 1000, 1) if duration is not None else '-'
+                all_resources.append(resource_entry)
             
-            # Para APIs, tentar analisar o conteúdo como JSON
-            if is_api or 'application/json' in content_type.lower():
-                try:
-                    if not hasattr(response, 'content'):
-                        response = self.session.get(resource['url'], timeout=10)
-                    
-                    json_data = json.loads(response.text)
-                    resource['is_json'] = True
-                    
-                    # Extrair informações básicas sobre a estrutura do JSON
-                    if isinstance(json_data, dict):
-                        resource['json_keys'] = list(json_data.keys())[:10]  # Primeiras 10 chaves
-                        resource['json_structure'] = 'object'
-                        
-                        # Detecção de APIs de produtos com base nas chaves do JSON
-                        product_keys = ['product', 'products', 'sku', 'items', 'catalog', 
-                                       'price', 'stock', 'inventory', 'categoria', 'category']
-                        api_keys = ['api', 'data', 'results', 'pagination', 'meta', 'response']
-                        
-                        # Verificar se é uma API de produtos
-                        if any(key.lower() in product_keys for key in json_data.keys()):
-                            # Este é um recurso de produtos, vamos adicioná-lo à lista de APIs
-                            if not is_api:  # Se ainda não foi identificado como API
-                                url = resource['url']
-                                if url not in [api["url"] for api in self.apis["products"]]:
-                                    self.apis["products"].append({
-                                        "url": url,
-                                        "pattern_detected": "json_content_analysis",
-                                        "content_type": content_type,
-                                        "analyzed": True,
-                                        "status_code": resource.get('status_code', 0),
-                                        "load_time": resource.get('load_time', 0),
-                                        "size": resource.get('size', 0)
-                                    })
-                    elif isinstance(json_data, list):
-                        resource['json_structure'] = 'array'
-                        resource['json_length'] = len(json_data)
-                        
-                        # Se a lista contém dicionários com chaves relacionadas a produtos
-                        if len(json_data) > 0 and isinstance(json_data[0], dict):
-                            sample_keys = set()
-                            for item in json_data[:5]:  # Analisar os primeiros 5 itens
-                                if isinstance(item, dict):
-                                    sample_keys.update(item.keys())
-                            
-                            # Verificar se tem chaves típicas de produtos
-                            product_item_keys = ['id', 'name', 'price', 'sku', 'image', 'description', 
-                                               'nome', 'preco', 'imagem', 'categoria']
-                            if any(key.lower() in product_item_keys for key in sample_keys):
-                                # Este parece ser uma API de produtos
-                                url = resource['url']
-                                if url not in [api["url"] for api in self.apis["products"]]:
-                                    self.apis["products"].append({
-                                        "url": url,
-                                        "pattern_detected": "json_array_analysis",
-                                        "content_type": content_type,
-                                        "analyzed": True,
-                                        "status_code": resource.get('status_code', 0),
-                                        "load_time": resource.get('load_time', 0),
-                                        "size": resource.get('size', 0)
-                                    })
-                    
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    resource['is_json'] = False
+            # Adicionar APIs
+            for api_type, apis in self.apis.items():
+                for api in apis:
+                    if api.get('analyzed', False):
+                        load_time_ms = round(api.get('load_time', 0) * 1000, 2)
+                        all_resources.append({
+                            'tipo': 'api',
+                            'url': api.get('url', 'N/A'),
+                            'tamanho_kb': round(api.get('size', 0) / 1024, 2),
+                            'tempo_ms': load_time_ms,
+                            'mime_type': api.get('content_type', 'application/json'),
+                            'status': str(api.get('status_code', 'N/A')),
+                            'cache': api.get('cache_control', 'N/A')
+                        })
+            
+            # Ordenar a lista completa de recursos por tamanho_kb (decrescente)
+            all_resources = sorted(all_resources, key=lambda x: x.get('tamanho_kb', 0), reverse=True)
+
+            # Preparar dados para gráficos dinâmicos (Chart.js)
+            # 1. Tempo de carregamento por tipo de recurso
+            chart_load_times_labels = []
+            chart_load_times_data = []
+            for resource_type, stats in resource_stats.items():
+                chart_load_times_labels.append(resource_type.upper())
+                chart_load_times_data.append(stats['avg_time'])
+
+            # 2. Distribuição de tamanho por tipo de recurso
+            chart_size_labels = []
+            chart_size_data = []
+            for resource_type, stats in resource_stats.items():
+                chart_size_labels.append(resource_type.upper())
+                chart_size_data.append(stats['total_size_kb'])
+
+            # 3. Distribuição de códigos de status HTTP
+            chart_status_labels = list(self.http_stats['status_codes'].keys())
+            chart_status_data = list(self.http_stats['status_codes'].values())
+
+            # 4. Distribuição de tipos de conteúdo (top 10)
+            top_content_types = sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True)[:10]
+            chart_content_types_labels = [ct[0] for ct in top_content_types]
+            chart_content_types_data = [ct[1] for ct in top_content_types]
+
+            # 5. Dados para gráfico de APIs se houver
+            chart_api_labels = []
+            chart_api_data = []
+            for api_type, apis in api_data.items():
+                if apis:
+                    avg_time = sum(api['load_time'] for api in apis) / len(apis)
+                    chart_api_labels.append(api_type.upper())
+                    chart_api_data.append(round(avg_time, 2))
+
+            # Obter o tema das configurações
+            theme = self.config.get('theme', 'default')
+
+            # Renderizar o template
+            rendered_html = template.render(
+                title=f"PyFormanceTester - {self.domain}",
+                url=self.url,
+                domain=self.domain,
+                datetime_now=datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                total_resources=total_resources,
+                total_size_mb=total_size_mb,
+                total_load_time=round(self.total_load_time, 2),
+                html_load_time=round(self.total_load_time - summary.load_time, 2),
+                cached_resources=cached_resources,
+                cached_percent=cached_percent,
+                compressed_resources=compressed_resources,
+                compressed_percent=compressed_percent,
+                resource_stats=resource_stats,
+                http_stats=self.http_stats,
+                response_time_avg=response_time_stats['avg'],
+                response_time_min=response_time_stats['min'],
+                response_time_max=response_time_stats['max'],
+                response_time_percentiles=response_time_stats['percentiles'],
+                latency_rows=latency_rows,
+                network_phases=network_phases,
+                skipped_requests=self.skipped,
+                deadline_description=self._deadline_description(),
+                probes=self.probes,
+                probe_summary=self._probe_summary(),
+                deadline_seconds=self.deadline_seconds,
+                content_types=dict(sorted_content_types),
+                total_apis=total_apis,
+                api_data=api_data,
+                slowest_resources=slowest_resources,
+                largest_resources=largest_resources,
+                # Colunas de mediana/IQR/CV apenas se alguma medição quente deu certo
+                sampling=sampling if sampling and sampling['warm_resources'] else None,
+                graph_images=self.graph_images,
+                all_resources=all_resources,  # Adicionando a lista completa de recursos
+                theme=theme,  # Passando o tema das configurações para o template
+                chart_load_times_labels=chart_load_times_labels,
+                chart_load_times_data=chart_load_times_data,
+                chart_size_labels=chart_size_labels,
+                chart_size_data=chart_size_data,
+                chart_status_labels=chart_status_labels,
+                chart_status_data=chart_status_data,
+                chart_content_types_labels=chart_content_types_labels,
+                chart_content_types_data=chart_content_types_data,
+                chart_api_labels=chart_api_labels,
+                chart_api_data=chart_api_data
+            )
+            
+            # Salvar o HTML
+            with open(html_filename, 'w', encoding='utf-8') as f:
+                f.write(rendered_html)
+            
+            print(f"{Fore.GREEN}Relatório HTML gerado com Material Design")
+            
+            # Retornar o caminho do relatório para uso posterior
+            return html_filename
+            
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao gerar relatório HTML: {e}")
+            import traceback
+            traceback.print_exc()
+            
+            # Log detalhado para ajudar a diagnosticar o problema
+            print(f"{Fore.RED}=== Detalhes do erro ===")
+            print(f"{Fore.RED}Diretório de templates: {self.templates_dir}")
+            print(f"{Fore.RED}Caminho do template: {template_path}")
+            print(f"{Fore.RED}Template existe: {os.path.exists(template_path)}")
+            print(f"{Fore.RED}Diretório atual: {os.getcwd()}")
+            print(f"{Fore.RED}=== Fim dos detalhes ===")
+            
+            return None  # Retorna None explicitamente em caso de erro
+    
+    def generate_assets_table(self):
+        """
+        Gera uma tabela completa com todos os assets carregados do site
+        Inclui caminhos, tamanhos em KB e tempos de carregamento em ms
+        
+        Returns:
+            str: Texto formatado da tabela de assets
+        """
+        print(f"{Fore.YELLOW}Gerando tabela completa de assets...")
+        
+        # Cabeçalho da tabela
+        output = f"\n{Fore.CYAN}{'=' * 100}\n"
+        output += f"{Fore.CYAN}TABELA COMPLETA DE ASSETS: {self.url}\n"
+        output += f"{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n\n"
+        
+        # Definir formato da tabela
+        headers = ['#', 'Tipo', 'URL', 'Tamanho (KB)', 'Tempo (ms)', 'MIME Type', 'Status', 'Cache']
+        
+        # Preparar dados
+        all_assets = []
+        
+        # Adicionar HTML principal
+        all_assets.append({
+            'tipo': 'HTML',
+            'url': self.url,
+            'tamanho_kb': round(self.page_size / 1024, 2),
+            'tempo_ms': round(self.total_load_time * 1000, 2),
+            'mime_type': 'text/html',
+            'status': 200,
+            'cache': 'N/A'
+        })
+        
+        # Adicionar todos os outros recursos
+        summary = self.resource_summary()
+        for record in summary.records:
+            all_assets.append({
+                'tipo': record.resource_type,
+                'url': record.url,
+                'tamanho_kb': round(record.size / 1024, 2),
+                'tempo_ms': round(record.load_time * 1000, 2),
+                'mime_type': record.content_type or 'unknown',
+                'status': record.status_code if record.status_code is not None else 'N/A',
+                'cache': 'Sim' if record.cached else 'Não'
+            })
+        
+        # Ordenar por tamanho (decrescente)
+        all_assets.sort(key=lambda x: x['tamanho_kb'], reverse=True)
+        
+        # Preparar a tabela formatada
+        col_widths = {
+            'num': 4,
+            'tipo': 8,
+            'url': 50,
+            'tamanho': 12,
+            'tempo': 12,
+            'mime': 20,
+            'status': 6,
+            'cache': 6
+        }
+        
+        # Formato de linha da tabela
+        row_format = (f"{{:{col_widths['num']}}} {{:{col_widths['tipo']}}} " +
+                     f"{{:{col_widths['url']}}} {{:{col_widths['tamanho']}}} " +
+                     f"{{:{col_widths['tempo']}}} {{:{col_widths['mime']}}} " +
+                     f"{{:{col_widths['status']}}} {{:{col_widths['cache']}}}")
+        
+        # Cabeçalho
+        output += f"{Fore.GREEN}{row_format.format('#', 'TIPO', 'URL', 'TAMANHO (KB)', 'TEMPO (MS)', 'MIME TYPE', 'STATUS', 'CACHE')}{Style.RESET_ALL}\n"
+        output += "-" * 120 + "\n"
+        
+        # Dados
+        for i, asset in enumerate(all_assets, 1):
+            # Truncar URL se muito longa
+            url = asset['url']
+            if len(url) > col_widths['url']:
+                url = "..." + url[-(col_widths['url']-3):]
             
-            # Para imagens, obter dimensões e formato
-            if resource.get('element_type') == 'img' and 'image' in content_type.lower():
-                try:
-                    # Somente baixar a imagem se ainda não baixou
-                    if not hasattr(response, 'content'):
-                        response = self.session.get(resource['url'], timeout=10)
-                        
-                    img = Image.open(io.BytesIO(response.content))
-                    resource['img_width'] = img.width
-                    resource['img_height'] = img.height
-                    resource['img_format'] = img.format
-                    resource['img_mode'] = img.mode
-                    resource['img_colors'] = len(img.getcolors(maxcolors=65536)) if img.getcolors(maxcolors=65536) else 'more than 65536'
-                    resource['img_aspect_ratio'] = round(img.width / img.height, 2) if img.height > 0 else 0
-                except Exception as img_e:
-                    resource['img_error'] = str(img_e)
+            # Truncar MIME type se muito longo
+            mime = str(asset['mime_type'])
+            if len(mime) > col_widths['mime']:
+                mime = mime[:col_widths['mime']-3] + "..."
             
-        except Exception as e:
-            resource['size'] = 0
-            resource['load_time'] = 0
-            resource['status_code'] = 0
-            resource['error'] = str(e)
-            self.http_stats["failed_requests"] += 1
-
-    def generate_report(self, fixed_name=False):
+            # Formatar valores numéricos
+            tamanho_str = f"{asset['tamanho_kb']:.2f}"
+            tempo_str = f"{asset['tempo_ms']:.2f}"
+            
+            # Colorir com base no tamanho e tempo
+            if asset['tamanho_kb'] > 500:
+                tamanho_str = f"{Fore.RED}{tamanho_str}{Style.RESET_ALL}"
+            elif asset['tamanho_kb'] > 200:
+                tamanho_str = f"{Fore.YELLOW}{tamanho_str}{Style.RESET_ALL}"
+                
+            if asset['tempo_ms'] > 1000:
+                tempo_str = f"{Fore.RED}{tempo_str}{Style.RESET_ALL}"
+            elif asset['tempo_ms'] > 300:
+                tempo_str = f"{Fore.YELLOW}{tempo_str}{Style.RESET_ALL}"
+                
+            # Status colorido
+            status_str = str(asset['status'])
+            if str(asset['status']).startswith('2'):
+                status_str = f"{Fore.GREEN}{status_str}{Style.RESET_ALL}"
+            elif str(asset['status']).startswith('3'):
+                status_str = f"{Fore.BLUE}{status_str}{Style.RESET_ALL}"
+            elif str(asset['status']).startswith('4') or str(asset['status']).startswith('5'):
+                status_str = f"{Fore.RED}{status_str}{Style.RESET_ALL}"
+                
+            # Cache
+            cache_str = asset['cache']
+            if cache_str == 'Não':
+                cache_str = f"{Fore.RED}{cache_str}{Style.RESET_ALL}"
+            else:
+                cache_str = f"{Fore.GREEN}{cache_str}{Style.RESET_ALL}"
+                
+            # Adicionar linha
+            output += row_format.format(
+                str(i), 
+                asset['tipo'], 
+                url, 
+                tamanho_str, 
+                tempo_str,
+                mime, 
+                status_str, 
+                cache_str
+            ) + "\n"
+            
+        # Estatísticas (a página HTML conta como um asset; URLs repetidas em outro grupo, uma vez só)
+        total_assets = summary.unique + 1
+        total_size_mb = (self.page_size + summary.unique_size) / 1024 / 1024
+        avg_load_time = (self.total_load_time + summary.load_time) * 1000 / total_assets
+        
+        output += f"\n{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n"
+        output += f"Total de assets: {total_assets}"
+        if len(all_assets) > total_assets:
+            output += f" (+{len(all_assets) - total_assets} URLs repetidas em outro grupo)"
+        output += "\n"
+        output += f"Tamanho total: {total_size_mb:.2f} MB\n"
+        output += f"Tempo médio de carregamento: {avg_load_time:.2f} ms\n"
+        output += f"{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n"
+        
+        return output
+        
+    def generate_resource_list(self, output_format='text'):
         """
-        Gera relatório CSV com os resultados da análise e gráficos
+        Gera uma lista rápida com todas as imagens, CSS, JS e mídias carregadas
+        Inclui caminho, tamanho e tempo de carregamento
         
         Args:
-            fixed_name (bool): Se True, usa um nome fixo para o relatório HTML
+            output_format (str): Formato de saída ('text' ou 'csv')
+        
+        Returns:
+            str: Caminho do arquivo gerado ou texto da lista
         """
-        # Atualizar progresso - Iniciando geração de relatório
-        if self.progress_callback:
-            self.progress_callback(75, "Gerando relatórios de performance...", {})
+        print(f"{Fore.YELLOW}Gerando lista de recursos...")
         
-        # Se fixed_name for True, usar um nome consistente para o relatório HTML
-        timestamp = "latest" if fixed_name else self.report_timestamp
-        domain = self.domain.replace(".", "_")
+        # Cabeçalhos para a lista
+        headers = ['Tipo', 'URL', 'Tamanho (KB)', 'Tempo (s)', 'Tempo (ms)', 'Status']
         
-        # Gerar relatório CSV principal
-        main_filename = f"{self.output_dir}/performance_report_{domain}_{timestamp}.csv"
-        api_filename = f"{self.output_dir}/api_report_{domain}_{timestamp}.csv"
-        http_stats_filename = f"{self.output_dir}/http_stats_{domain}_{timestamp}.csv"
-        html_filename = f"{self.output_dir}/performance_report_{domain}_{timestamp}.html"
+        # Preparar dados de todos os recursos
+        resource_data = []
         
-        print(f"{Fore.CYAN}Gerando relatórios...")
+        # Adicionar página HTML principal
+        html_load_time_s = round(self.total_load_time, 2)
+        html_load_time_ms = round(self.total_load_time * 1000, 2)
+        resource_data.append([
+            'HTML', self.url, round(self.page_size / 1024, 2), 
+            html_load_time_s, html_load_time_ms, '200'
+        ])
         
-        # Definir todos os campos possíveis para o CSV principal
-        fieldnames = [
-            'tipo', 'url', 'tamanho_kb', 'tempo_carregamento_s', 'time_to_first_byte_s',
-            'status_code', 'content_type', 'server', 'cache_control', 'etag', 'expires',
-            'last_modified', 'content_encoding', 'element_type', 'media', 'integrity',
-            'async', 'defer', 'type', 'alt_text', 'loading', 'redirects',
-            'img_width', 'img_height', 'img_format', 'img_mode', 'img_colors',
-            'img_aspect_ratio', 'error', 'connection', 'x_content_type_options',
-            'strict_transport_security', 'access_control_allow_origin'
-        ]
+        # Adicionar todos os outros recursos
+        for record in self.resource_summary().records:
+            resource_data.append([
+                record.resource_type,
+                record.url,
+                round(record.size / 1024, 2),
+                round(record.load_time, 2),
+                round(record.load_time * 1000, 2),
+                str(record.status_code if record.status_code is not None else 'N/A')
+            ])
         
-        # Gerar o relatório CSV principal
-        with open(main_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        # Ordenar por tipo e depois por tempo de carregamento (decrescente)
+        resource_data.sort(key=lambda x: (x[0], -x[3]))
+        
+        if output_format == 'csv':
+            # Criar nome de arquivo
+            domain = self.domain.replace(".", "_")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"{self.output_dir}/resource_list_{domain}_{timestamp}.csv"
             
-            # Adicionar dados da página HTML principal
-            writer.writerow({
-                'tipo': 'html',
-                'url': self.url,
-                'tamanho_kb': round(self.page_size / 1024, 2),
-                'tempo_carregamento_s': round(self.total_load_time, 2),
-                'status_code': 200,
-                'content_type': 'text/html'
-            })
+            # Garantir que o diretório existe
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            # Adicionar dados de todos os recursos
-            for resource_type, resources in self.resources.items():
-                for resource in resources:
-                    # Criar um dicionário com todos os dados do recurso
-                    resource_data = {
-                        'tipo': resource_type,
-                        'url': resource['url'],
-                        'tamanho_kb': round(resource.get('size', 0) / 1024, 2),
-                        'tempo_carregamento_s': round(resource.get('load_time', 0), 2),
-                        'time_to_first_byte_s': round(resource.get('time_to_first_byte', 0), 3),
-                        'status_code': resource.get('status_code', 0),
-                        'redirects': resource.get('redirects', 0)
-                    }
-                    
-                    # Adicionar todos os campos extras disponíveis
-                    for field in fieldnames:
-                        if field in resource and field not in resource_data:
-                            resource_data[field] = resource[field]
-                    
-                    writer.writerow(resource_data)
-        
-        # Gerar relatório específico para APIs
-        api_fieldnames = [
-            'tipo', 'url', 'pattern_detected', 'source_script', 'status_code', 
-            'tamanho_kb', 'tempo_carregamento_s', 'time_to_first_byte_s', 
-            'content_type', 'is_json', 'json_structure', 'json_keys', 'json_length',
-            'cache_control', 'server', 'access_control_allow_origin', 'error'
-        ]
-        
-        with open(api_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=api_fieldnames)
-            writer.writeheader()
+            # Escrever no arquivo CSV
+            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(headers)
+                writer.writerows(resource_data)
             
-            # Adicionar dados de todas as APIs
-            for api_type, apis in self.apis.items():
-                for api in apis:
-                    if api.get('analyzed', False):
-                        api_data = {
-                            'tipo': api_type,
-                            'url': api['url'],
-                            'pattern_detected': api.get('pattern_detected', ''),
-                            'source_script': api.get('source_script', ''),
-                            'status_code': api.get('status_code', 0),
-                            'tamanho_kb': round(api.get('size', 0) / 1024, 2),
-                            'tempo_carregamento_s': round(api.get('load_time', 0), 2),
-                            'time_to_first_byte_s': round(api.get('time_to_first_byte', 0), 3),
-                            'content_type': api.get('content_type', 'unknown'),
-                            'is_json': api.get('is_json', False),
-                            'json_structure': api.get('json_structure', ''),
-                            'json_keys': ', '.join(api.get('json_keys', [])) if api.get('json_keys') else '',
-                            'json_length': api.get('json_length', 0),
-                            'cache_control': api.get('cache_control', 'not-specified'),
-                            'server': api.get('server', 'unknown'),
-                            'access_control_allow_origin': api.get('access_control_allow_origin', 'not-specified'),
-                            'error': api.get('error', '')
-                        }
-                        writer.writerow(api_data)
-        
-        # Gerar relatório de estatísticas HTTP
-        with open(http_stats_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
+            print(f"{Fore.GREEN}Lista de recursos gerada em: {output_file}")
+            return output_file
+        else:
+            # Gerar saída de texto formatada
+            output_text = f"\n{'=' * 80}\n"
+            output_text += f"LISTA DE RECURSOS CARREGADOS: {self.url}\n"
+            output_text += f"{'=' * 80}\n\n"
             
-            # Cabeçalho
-            writer.writerow(['Métrica', 'Valor'])
+            # Calcular larguras de coluna
+            type_width = max(len('Tipo'), max(len(row[0]) for row in resource_data))
+            url_width = min(70, max(len('URL'), max(len(row[1]) for row in resource_data)))
+            size_width = max(len('Tamanho (KB)'), max(len(str(row[2])) for row in resource_data))
+            time_s_width = max(len('Tempo (s)'), max(len(str(row[3])) for row in resource_data))
+            time_ms_width = max(len('Tempo (ms)'), max(len(str(row[4])) for row in resource_data))
+            status_width = max(len('Status'), max(len(str(row[5])) for row in resource_data))
             
-            # Estatísticas gerais
-            writer.writerow(['Total de Requisições', self.http_stats['total_requests']])
-            writer.writerow(['Requisições com Falha', self.http_stats['failed_requests']])
+            # Criar cabeçalho da tabela
+            header_format = f"{{:<{type_width}}}  {{:<{url_width}}}  {{:>{size_width}}}  {{:>{time_s_width}}}  {{:>{time_ms_width}}}  {{:>{status_width}}}\n"
+            output_text += header_format.format(*headers)
+            output_text += "-" * (type_width + url_width + size_width + time_s_width + time_ms_width + status_width + 25) + "\n"
             
-            # Tempos de resposta
-            if self.http_stats['response_times']:
-                writer.writerow(['Tempo Médio de Resposta (s)', round(statistics.mean(self.http_stats['response_times']), 3)])
-                writer.writerow(['Tempo Mínimo de Resposta (s)', round(min(self.http_stats['response_times']), 3)])
-                writer.writerow(['Tempo Máximo de Resposta (s)', round(max(self.http_stats['response_times']), 3)])
-                if len(self.http_stats['response_times']) > 1:
-                    writer.writerow(['Desvio Padrão (s)', round(statistics.stdev(self.http_stats['response_times']), 3)])
+            # Adicionar linhas de dados
+            row_format = f"{{:<{type_width}}}  {{:<{url_width}}}  {{:>{size_width}.2f}}  {{:>{time_s_width}.2f}}  {{:>{time_ms_width}.2f}}  {{:>{status_width}}}\n"
             
-            # Status codes
-            writer.writerow(['', ''])
-            writer.writerow(['Códigos de Status HTTP', 'Contagem'])
-            for status_code, count in sorted(self.http_stats['status_codes'].items()):
-                writer.writerow([status_code, count])
+            # Agrupar por tipo de recurso
+            current_type = ""
+            for row in resource_data:
+                if row[0] != current_type:
+                    current_type = row[0]
+                    output_text += f"\n{current_type.upper()}:\n"
+                
+                # Truncar URL se necessário
+                url = row[1]
+                if len(url) > url_width:
+                    url = "..." + url[-(url_width-3):]
+                
+                output_text += row_format.format(
+                    "", url, row[2], row[3], row[4], row[5]
+                )
             
-            # Content types
-            writer.writerow(['', ''])
-            writer.writerow(['Tipos de Conteúdo', 'Contagem'])
-            for content_type, count in sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True):
-                writer.writerow([content_type, count])
-        
-        # Gerar gráficos
-        self._generate_graphs(timestamp, domain)
-        
-        # Gerar relatório HTML
-        html_report_path = self._generate_html_report(html_filename)
-        
-        print(f"{Fore.GREEN}Relatório principal gerado com sucesso: {main_filename}")
-        print(f"{Fore.GREEN}Relatório de APIs gerado com sucesso: {api_filename}")
-        print(f"{Fore.GREEN}Relatório de estatísticas HTTP gerado com sucesso: {http_stats_filename}")
-        print(f"{Fore.GREEN}Relatório HTML gerado com sucesso: {html_filename}")
-        
-        # Armazenar o timestamp do relatório para uso no método main
-        self.report_timestamp = timestamp
-        
-        return main_filename, html_report_path
-    
-    def _generate_html_report(self, html_filename):
+            return output_text
+
+    def _generate_graphs(self, timestamp, domain):
         """
-        Gera um relatório HTML com Material Design
+        Gera gráficos de análise
         """
-        # Atualizar progresso - Gerando relatório HTML
+        print(f"{Fore.YELLOW}Gerando gráficos de análise...")
+        
+        # Atualizar progresso - Gerando gráficos
         if self.progress_callback:
-            self.progress_callback(90, "Gerando relatório HTML interativo...", {})
-            
-        # Adicionar filtro tojson ao Jinja2
-        import json as _json
-        def tojson_filter(value):
-            return _json.dumps(value, ensure_ascii=False)
-        # Carregar o template
-        template_path = os.path.join(self.templates_dir, 'report_template.html')
-        if not os.path.exists(template_path):
-            print(f"{Fore.RED}Erro: Template HTML não encontrado em {template_path}")
+            self.progress_callback(85, "Gerando gráficos de performance...", {"timestamp": timestamp})
+        
+        try:
+            # Gráfico de tempo de carregamento por tipo de recurso
+            self._generate_load_time_graph(timestamp, domain)
             
-            # Tentar encontrar o template em outros diretórios
-            possible_paths = [
-                os.path.join(os.getcwd(), "templates", "report_template.html"),
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report_template.html")
-            ]
+            # Gráfico de distribuição de status HTTP
+            self._generate_status_codes_graph(timestamp, domain)
             
-            template_found = False
-            for path in possible_paths:
-                if os.path.exists(path):
-                    print(f"{Fore.GREEN}Template encontrado em caminho alternativo: {path}")
-                    template_path = path
-                    template_found = True
-                    break
+            # Gráfico de distribuição de tamanho por tipo
+            self._generate_size_distribution_graph(timestamp, domain)
             
-            if not template_found:
-                print(f"{Fore.RED}Erro: Não foi possível encontrar o template HTML em nenhum diretório conhecido")
-                return
-                
-        try:
-            with open(template_path, 'r', encoding='utf-8') as file:
-                template_content = file.read()
-            env = Environment()
-            env.filters['tojson'] = tojson_filter
-            template = env.from_string(template_content)
-            print(f"{Fore.GREEN}Template HTML carregado com sucesso de {template_path}")
+            print(f"{Fore.GREEN}Gráficos gerados com sucesso no diretório: {self.graphs_dir}")
+        
         except Exception as e:
-            print(f"{Fore.RED}Erro ao carregar template HTML: {e}")
-            return
-
-        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
+            print(f"{Fore.RED}Erro ao gerar gráficos: {e}")
+            # Fechar todas as figuras pendentes do matplotlib em caso de erro
+            plt.close('all')
+    
+    def _generate_load_time_graph(self, timestamp, domain):
+        """
+        Gera gráfico de tempo de carregamento por tipo de recurso
+        """
+        # Coletar dados para o gráfico
+        resource_types = []
+        avg_times = []
+        max_times = []
+        
         try:
-            # Calcular estatísticas para o template
-            total_resources = sum(len(resources) for resources in self.resources.values())
-            total_size = self.page_size + sum(
-                resource.get('size', 0) for resource_type in self.resources.values() 
-                for resource in resource_type
-            )
-            total_size_mb = round(total_size / 1024 / 1024, 2)
-            
-            # Estatísticas de cache
-            cached_resources = sum(1 for resource_type in self.resources.values() 
-                                 for resource in resource_type 
-                                 if 'max-age' in resource.get('cache_control', ''))
-            
-            cached_percent = round(cached_resources / total_resources * 100, 1) if total_resources > 0 else 0
-            
-            # Estatísticas de compressão
-            compressed_resources = sum(1 for resource_type in self.resources.values() 
-                                      for resource in resource_type 
-                                      if resource.get('content_encoding') not in ['none', None, ''])
+            plt.figure(figsize=(12, 6))
             
-            compressed_percent = round(compressed_resources / total_resources * 100, 1) if total_resources > 0 else 0
+            # Apenas recursos com tempo válido (load_time > 0)
+            for resource_type, type_stats in self.resource_summary().by_type.items():
+                if type_stats.timed:
+                    resource_types.append(resource_type)
+                    avg_times.append(type_stats.avg_timed)
+                    max_times.append(type_stats.timed_max)
             
-            # Estatísticas por tipo de recurso
-            resource_stats = {}
-            for resource_type, resources in self.resources.items():
-                if resources:
-                    type_size = sum(resource.get('size', 0) for resource in resources)
-                    type_time = sum(resource.get('load_time', 0) for resource in resources)
-                    
-                    stats = {
-                        'count': len(resources),
-                        'total_size_kb': round(type_size / 1024, 2),
-                        'avg_time': round(type_time / len(resources), 2)
-                    }
-                    
-                    # Estatísticas específicas para cada tipo
-                    if resource_type == 'images':
-                        # Formatos de imagem
-                        formats = {}
-                        for img in resources:
-                            fmt = img.get('img_format', 'Unknown')
-                            formats[fmt] = formats.get(fmt, 0) + 1
-                        stats['formats'] = formats
-                        
-                        # Imagens sem texto alternativo
-                        no_alt = sum(1 for img in resources if not img.get('alt_text'))
-                        stats['no_alt_text'] = no_alt
-                        
-                    elif resource_type == 'js':
-                        # Scripts async/defer
-                        stats['async_scripts'] = sum(1 for js in resources if js.get('async') == 'async')
-                        stats['defer_scripts'] = sum(1 for js in resources if js.get('defer') == 'defer')
-                    
-                    resource_stats[resource_type] = stats
+            # API tempos
+            api_types = []
+            api_avg_times = []
+            api_max_times = []
             
-            # API data
-            api_data = {}
-            total_apis = 0
             for api_type, apis in self.apis.items():
-                analyzed_apis = [api for api in apis if api.get('analyzed', False)]
-                if analyzed_apis:
-                    simplified_apis = []
-                    for api in analyzed_apis:
-                        simplified_api = {
-                            'url': api['url'],
-                            'status_code': api.get('status_code', 0),
-                            'load_time': round(api.get('load_time', 0), 2),
-                            'size_kb': round(api.get('size', 0) / 1024, 2),
-                            'content_type': api.get('content_type', 'unknown')
-                        }
-                        simplified_apis.append(simplified_api)
-                    
-                    api_data[api_type] = simplified_apis
-                    total_apis += len(analyzed_apis)
-            
-            # Recursos mais lentos
-            all_resources = []
-            for resource_type, resources in self.resources.items():
-                for resource in resources:
-                    all_resources.append({
-                        'tipo': resource_type,
-                        'url': resource['url'],
-                        'load_time': round(resource.get('load_time', 0), 2),
-                        'size_kb': round(resource.get('size', 0) / 1024, 2),
-                        'status_code': resource.get('status_code', 0)
-                    })
-            
-            # Top 10 recursos mais lentos
-            slowest_resources = sorted(all_resources, key=lambda x: x['load_time'], reverse=True)[:10]
-            
-            # Top 10 recursos maiores
-            largest_resources = sorted(all_resources, key=lambda x: x['size_kb'], reverse=True)[:10]
+                if apis:
+                    analyzed_apis = [api for api in apis if api.get('analyzed', False)]
+                    if analyzed_apis:
+                        # Filtrar tempos para evitar valores nulos/inválidos
+                        valid_times = [api.get('load_time', 0) for api in analyzed_apis if api.get('load_time', 0) > 0]
+                        if valid_times:  # Verificar se há tempos válidos
+                            api_types.append(api_type)
+                            api_avg_times.append(sum(valid_times) / len(valid_times) if valid_times else 0)
+                            api_max_times.append(max(valid_times) if valid_times else 0)
             
-            # Estatísticas de tempo de resposta
-            response_times = self.http_stats['response_times']
-            response_time_stats = {
-                'avg': round(statistics.mean(response_times), 3) if response_times else 0,
-                'min': round(min(response_times), 3) if response_times else 0,
-                'max': round(max(response_times), 3) if response_times else 0,
-                'stddev': round(statistics.stdev(response_times), 3) if len(response_times) > 1 else 0
+            # Cores Material Design
+            colors = {
+                'primary': '#1976D2',   # Azul
+                'secondary': '#FF5722', # Laranja
+                'success': '#4CAF50',   # Verde
+                'warning': '#FFC107',   # Amarelo
+                'error': '#F44336'      # Vermelho
             }
             
-            # Top tipos de conteúdo
-            sorted_content_types = sorted(
-                self.http_stats['content_types'].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
+            # Verificar se há dados para plotar
+            if resource_types:
+                # Gráfico para recursos
+                x = range(len(resource_types))
+                plt.bar(x, avg_times, width=0.4, label='Tempo Médio', color=colors['primary'], alpha=0.7)
+                plt.bar([i + 0.4 for i in x], max_times, width=0.4, label='Tempo Máximo', color=colors['error'], alpha=0.7)
+                
+                plt.xlabel('Tipo de Recurso')
+                plt.ylabel('Tempo (segundos)')
+                plt.title('Tempo de Carregamento por Tipo de Recurso')
+                plt.xticks([i + 0.2 for i in x], resource_types)
+                plt.legend()
+                plt.grid(axis='y', linestyle='--', alpha=0.7)
+                plt.tight_layout()
+                
+                # Salvar o gráfico como arquivo e em base64
+                file_path = f"{self.graphs_dir}/load_times_{domain}_{timestamp}.png"
+                plt.savefig(file_path, dpi=100)
+                self.graph_images['load_times'] = self._fig_to_base64(plt.gcf())
+                plt.close()
+            else:
+                print(f"{Fore.YELLOW}Aviso: Não há dados de recursos suficientes para gerar gráfico de tempo de carregamento")
+            
+            # Gráfico para APIs se houver dados
+            if api_types:
+                plt.figure(figsize=(12, 6))
+                x = range(len(api_types))
+                plt.bar(x, api_avg_times, width=0.4, label='Tempo Médio', color=colors['success'], alpha=0.7)
+                plt.bar([i + 0.4 for i in x], api_max_times, width=0.4, label='Tempo Máximo', color=colors['warning'], alpha=0.7)
+                
+                plt.xlabel('Tipo de API')
+                plt.ylabel('Tempo (segundos)')
+                plt.title('Tempo de Carregamento por Tipo de API')
+                plt.xticks([i + 0.2 for i in x], api_types)
+                plt.legend()
+                plt.grid(axis='y', linestyle='--', alpha=0.7)
+                plt.tight_layout()
+                
+                # Salvar o gráfico como arquivo e em base64
+                file_path = f"{self.graphs_dir}/api_load_times_{domain}_{timestamp}.png"
+                plt.savefig(file_path, dpi=100)
+                self.graph_images['api_load_times'] = self._fig_to_base64(plt.gcf())
+                plt.close()
+                
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao gerar gráfico de tempos de carregamento: {str(e)}")
+            # Fechar qualquer figura pendente em caso de erro
+            plt.close('all')
+    
+    def _fig_to_base64(self, fig):
+        """
+        Converte um matplotlib figure para uma string base64
+        """
+        import io
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode('utf-8')
+        return img_str
+    
+    def _generate_status_codes_graph(self, timestamp, domain):
+        """
+        Gera gráfico de distribuição de códigos de status HTTP
+        """
+        try:
+            if not self.http_stats['status_codes']:
+                print(f"{Fore.YELLOW}Aviso: Não há dados de status HTTP para gerar gráfico")
+                return
             
-            # Preparar dados de todos os recursos para incluir no HTML
-            all_resources = []
+            plt.figure(figsize=(10, 6))
             
-            # Adicionar página HTML principal
-            html_load_time_ms = round(self.total_load_time * 1000, 2)
-            all_resources.append({
-                'tipo': 'html',
-                'url': self.url,
-                'tamanho_kb': round(self.page_size / 1024, 2),
-                'tempo_ms': html_load_time_ms,
-                'mime_type': 'text/html',
-                'status': '200',
-                'cache': self.main_page_response.headers.get('Cache-Control', 'N/A') if hasattr(self, 'main_page_response') else 'N/A'
-            })
+            status_codes = list(self.http_stats['status_codes'].keys())
+            counts = list(self.http_stats['status_codes'].values())
             
-            # Adicionar todos os outros recursos
-            resource_type_mapping = {
-                'images': 'img',
-                'css': 'css',
-                'js': 'js',
-                'fonts': 'font',
-                'videos': 'media',
-                'others': 'other'
-            }
+            if not status_codes or not counts:
+                print(f"{Fore.YELLOW}Aviso: Não há códigos de status HTTP para gerar gráfico")
+                plt.close()
+                return
             
-            for resource_type, resources in self.resources.items():
-                for resource in resources:
-                    tipo_simplificado = resource_type_mapping.get(resource_type, 'other')
-                    load_time_ms = round(resource.get('load_time', 0) * 1000, 2)
-                    
-                    all_resources.append({
-                        'tipo': tipo_simplificado,
-                        'url': resource.get('url', 'N/A'),
-                        'tamanho_kb': round(resource.get('size', 0) / 1024, 2),
-                        'tempo_ms': load_time_ms,
-                        'mime_type': resource.get('content_type', 'N/A'),
-                        'status': str(resource.get('status_code', 'N/A')),
-                        'cache': resource.get('cache_control', 'N/A')
-                    })
+            # Definir cores Material Design com base nas faixas de status
+            colors = ['#4CAF50' if code == 200 else      # Verde para 200
+                     '#2196F3' if 200 <= code < 300 else # Azul para 2xx
+                     '#FF9800' if 300 <= code < 400 else # Laranja para 3xx
+                     '#F44336' if 400 <= code < 500 else # Vermelho para 4xx
+                     '#9C27B0' if 500 <= code < 600 else # Roxo para 5xx
+                     '#9E9E9E' for code in status_codes] # Cinza para outros
             
-            # Adicionar APIs
-            for api_type, apis in self.apis.items():
-                for api in apis:
-                    if api.get('analyzed', False):
-                        load_time_ms = round(api.get('load_time', 0) * 1000, 2)
-                        all_resources.append({
-                            'tipo': 'api',
-                            'url': api.get('url', 'N/A'),
-                            'tamanho_kb': round(api.get('size', 0) / 1024, 2),
-                            'tempo_ms': load_time_ms,
-                            'mime_type': api.get('content_type', 'application/json'),
-                            'status': str(api.get('status_code', 'N/A')),
-                            'cache': api.get('cache_control', 'N/A')
-                        })
+            plt.bar(status_codes, counts, color=colors)
             
-            # Ordenar a lista completa de recursos por tamanho_kb (decrescente)
-            all_resources = sorted(all_resources, key=lambda x: x.get('tamanho_kb', 0), reverse=True)
-
-            # Preparar dados para gráficos dinâmicos (Chart.js)
-            # 1. Tempo de carregamento por tipo de recurso
-            chart_load_times_labels = []
-            chart_load_times_data = []
-            for resource_type, stats in resource_stats.items():
-                chart_load_times_labels.append(resource_type.upper())
-                chart_load_times_data.append(stats['avg_time'])
-
-            # 2. Distribuição de tamanho por tipo de recurso
-            chart_size_labels = []
-            chart_size_data = []
-            for resource_type, stats in resource_stats.items():
-                chart_size_labels.append(resource_type.upper())
-                chart_size_data.append(stats['total_size_kb'])
-
-            # 3. Distribuição de códigos de status HTTP
-            chart_status_labels = list(self.http_stats['status_codes'].keys())
-            chart_status_data = list(self.http_stats['status_codes'].values())
-
-            # 4. Distribuição de tipos de conteúdo (top 10)
-            top_content_types = sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True)[:10]
-            chart_content_types_labels = [ct[0] for ct in top_content_types]
-            chart_content_types_data = [ct[1] for ct in top_content_types]
-
-            # 5. Dados para gráfico de APIs se houver
-            chart_api_labels = []
-            chart_api_data = []
-            for api_type, apis in api_data.items():
-                if apis:
-                    avg_time = sum(api['load_time'] for api in apis) / len(apis)
-                    chart_api_labels.append(api_type.upper())
-                    chart_api_data.append(round(avg_time, 2))
-
-            # Obter o tema das configurações
-            theme = self.config.get('theme', 'default')
-
-            # Renderizar o template
-            rendered_html = template.render(
-                title=f"PyFormanceTester - {self.domain}",
-                url=self.url,
-                domain=self.domain,
-                datetime_now=datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                total_resources=total_resources,
-                total_size_mb=total_size_mb,
-                total_load_time=round(self.total_load_time, 2),
-                html_load_time=round(self.total_load_time - sum(resource.get('load_time', 0) for resource_type in self.resources.values() for resource in resource_type), 2),
-                cached_resources=cached_resources,
-                cached_percent=cached_percent,
-                compressed_resources=compressed_resources,
-                compressed_percent=compressed_percent,
-                resource_stats=resource_stats,
-                http_stats=self.http_stats,
-                response_time_avg=response_time_stats['avg'],
-                response_time_min=response_time_stats['min'],
-                response_time_max=response_time_stats['max'],
-                response_time_stddev=response_time_stats['stddev'],
-                content_types=dict(sorted_content_types),
-                total_apis=total_apis,
-                api_data=api_data,
-                slowest_resources=slowest_resources,
-                largest_resources=largest_resources,
-                graph_images=self.graph_images,
-                all_resources=all_resources,  # Adicionando a lista completa de recursos
-                theme=theme,  # Passando o tema das configurações para o template
-                chart_load_times_labels=chart_load_times_labels,
-                chart_load_times_data=chart_load_times_data,
-                chart_size_labels=chart_size_labels,
-                chart_size_data=chart_size_data,
-                chart_status_labels=chart_status_labels,
-                chart_status_data=chart_status_data,
-                chart_content_types_labels=chart_content_types_labels,
-                chart_content_types_data=chart_content_types_data,
-                chart_api_labels=chart_api_labels,
-                chart_api_data=chart_api_data
-            )
+            plt.xlabel('Código de Status HTTP')
+            plt.ylabel('Número de Requisições')
+            plt.title('Distribuição de Códigos de Status HTTP')
+            plt.xticks(status_codes)
+            plt.grid(axis='y', linestyle='--', alpha=0.3)
             
-            # Salvar o HTML
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(rendered_html)
+            # Adicionar rótulos de contagem acima das barras
+            for i, count in enumerate(counts):
+                plt.text(status_codes[i], count + 0.1, str(count), ha='center')
             
-            print(f"{Fore.GREEN}Relatório HTML gerado com Material Design")
+            plt.tight_layout()
             
-            # Retornar o caminho do relatório para uso posterior
-            return html_filename
+            # Salvar o gráfico como arquivo e em base64
+            file_path = f"{self.graphs_dir}/status_codes_{domain}_{timestamp}.png"
+            plt.savefig(file_path, dpi=100)
+            self.graph_images['status_codes'] = self._fig_to_base64(plt.gcf())
+            plt.close()
             
         except Exception as e:
-            print(f"{Fore.RED}Erro ao gerar relatório HTML: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            # Log detalhado para ajudar a diagnosticar o problema
-            print(f"{Fore.RED}=== Detalhes do erro ===")
-            print(f"{Fore.RED}Diretório de templates: {self.templates_dir}")
-            print(f"{Fore.RED}Caminho do template: {template_path}")
-            print(f"{Fore.RED}Template existe: {os.path.exists(template_path)}")
-            print(f"{Fore.RED}Diretório atual: {os.getcwd()}")
-            print(f"{Fore.RED}=== Fim dos detalhes ===")
-            
-            return None  # Retorna None explicitamente em caso de erro
+            print(f"{Fore.RED}Erro ao gerar gráfico de códigos de status: {str(e)}")
+            # Fechar qualquer figura pendente em caso de erro
+            plt.close('all')
     
-    def generate_assets_table(self):
+    def _generate_size_distribution_graph(self, timestamp, domain):
         """
-        Gera uma tabela completa com todos os assets carregados do site
-        Inclui caminhos, tamanhos em KB e tempos de carregamento em ms
-        
-        Returns:
-            str: Texto formatado da tabela de assets
+        Gera gráfico de distribuição de tamanho por tipo de recurso
         """
-        print(f"{Fore.YELLOW}Gerando tabela completa de assets...")
-        
-        # Cabeçalho da tabela
-        output = f"\n{Fore.CYAN}{'=' * 100}\n"
-        output += f"{Fore.CYAN}TABELA COMPLETA DE ASSETS: {self.url}\n"
-        output += f"{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n\n"
-        
-        # Definir formato da tabela
-        headers = ['#', 'Tipo', 'URL', 'Tamanho (KB)', 'Tempo (ms)', 'MIME Type', 'Status', 'Cache']
-        
-        # Preparar dados
-        all_assets = []
-        
-        # Adicionar HTML principal
-        all_assets.append({
-            'tipo': 'HTML',
-            'url': self.url,
-            'tamanho_kb': round(self.page_size / 1024, 2),
-            'tempo_ms': round(self.total_load_time * 1000, 2),
-            'mime_type': 'text/html',
-            'status': 200,
-            'cache': 'N/A'
-        })
-        
-        # Adicionar todos os outros recursos
-        for resource_type, resources in self.resources.items():
-            for resource in resources:
-                all_assets.append({
-                    'tipo': resource_type,
-                    'url': resource.get('url', 'N/A'),
-                    'tamanho_kb': round(resource.get('size', 0) / 1024, 2),
-                    'tempo_ms': round(resource.get('load_time', 0) * 1000, 2),
-                    'mime_type': resource.get('content_type', 'unknown'),
-                    'status': resource.get('status_code', 'N/A'),
-                    'cache': 'Sim' if 'max-age' in resource.get('cache_control', '') else 'Não'
-                })
-        
-        # Ordenar por tamanho (decrescente)
-        all_assets.sort(key=lambda x: x['tamanho_kb'], reverse=True)
-        
-        # Preparar a tabela formatada
-        col_widths = {
-            'num': 4,
-            'tipo': 8,
-            'url': 50,
-            'tamanho': 12,
-            'tempo': 12,
-            'mime': 20,
-            'status': 6,
-            'cache': 6
-        }
-        
-        # Formato de linha da tabela
-        row_format = (f"{{:{col_widths['num']}}} {{:{col_widths['tipo']}}} " +
-                     f"{{:{col_widths['url']}}} {{:{col_widths['tamanho']}}} " +
-                     f"{{:{col_widths['tempo']}}} {{:{col_widths['mime']}}} " +
-                     f"{{:{col_widths['status']}}} {{:{col_widths['cache']}}}")
-        
-        # Cabeçalho
-        output += f"{Fore.GREEN}{row_format.format('#', 'TIPO', 'URL', 'TAMANHO (KB)', 'TEMPO (MS)', 'MIME TYPE', 'STATUS', 'CACHE')}{Style.RESET_ALL}\n"
-        output += "-" * 120 + "\n"
-        
-        # Dados
-        for i, asset in enumerate(all_assets, 1):
-            # Truncar URL se muito longa
-            url = asset['url']
-            if len(url) > col_widths['url']:
-                url = "..." + url[-(col_widths['url']-3):]
+        try:
+            # Coletar dados para o gráfico
+            resource_types = []
+            total_sizes_kb = []
+            
+            summary = self.resource_summary()
+            for resource_type, type_stats in summary.by_type.items():
+                resource_types.append(resource_type)
+                total_sizes_kb.append(type_stats.size / 1024)  # em KB
+            
+            # Verificar se há dados suficientes para criar o gráfico
+            if not resource_types or not total_sizes_kb or sum(total_sizes_kb) == 0:
+                print(f"{Fore.YELLOW}Aviso: Não há dados de tamanho suficientes para gerar gráfico de distribuição")
+                return
+                
+            plt.figure(figsize=(10, 6))
+            
+            # Cores Material Design para o gráfico de pizza
+            colors = ['#2196F3', '#4CAF50', '#FFC107', '#F44336', '#9C27B0', '#FF5722']
+            
+            # Gráfico de pizza
+            plt.pie(total_sizes_kb, labels=resource_types, autopct='%1.1f%%',
+                   shadow=True, startangle=140, explode=[0.05] * len(resource_types),
+                   colors=colors[:len(resource_types)])
+            
+            plt.axis('equal')
+            plt.title('Distribuição de Tamanho por Tipo de Recurso (KB)')
+            plt.tight_layout()
             
-            # Truncar MIME type se muito longo
-            mime = str(asset['mime_type'])
-            if len(mime) > col_widths['mime']:
-                mime = mime[:col_widths['mime']-3] + "..."
+            # Salvar o gráfico como arquivo e em base64
+            file_path = f"{self.graphs_dir}/size_distribution_{domain}_{timestamp}.png"
+            plt.savefig(file_path, dpi=100)
+            self.graph_images['size_distribution'] = self._fig_to_base64(plt.gcf())
+            plt.close()
             
-            # Formatar valores numéricos
-            tamanho_str = f"{asset['tamanho_kb']:.2f}"
-            tempo_str = f"{asset['tempo_ms']:.2f}"
+            # Verificar dados para o gráfico TTFB
+            resource_types_with_times = []
+            avg_response_times = []
             
-            # Colorir com base no tamanho e tempo
-            if asset['tamanho_kb'] > 500:
-                tamanho_str = f"{Fore.RED}{tamanho_str}{Style.RESET_ALL}"
-            elif asset['tamanho_kb'] > 200:
-                tamanho_str = f"{Fore.YELLOW}{tamanho_str}{Style.RESET_ALL}"
-                
-            if asset['tempo_ms'] > 1000:
-                tempo_str = f"{Fore.RED}{tempo_str}{Style.RESET_ALL}"
-            elif asset['tempo_ms'] > 300:
-                tempo_str = f"{Fore.YELLOW}{tempo_str}{Style.RESET_ALL}"
-                
-            # Status colorido
-            status_str = str(asset['status'])
-            if str(asset['status']).startswith('2'):
-                status_str = f"{Fore.GREEN}{status_str}{Style.RESET_ALL}"
-            elif str(asset['status']).startswith('3'):
-                status_str = f"{Fore.BLUE}{status_str}{Style.RESET_ALL}"
-            elif str(asset['status']).startswith('4') or str(asset['status']).startswith('5'):
-                status_str = f"{Fore.RED}{status_str}{Style.RESET_ALL}"
+            for resource_type, type_stats in summary.by_type.items():
+                if type_stats.ttfb_count:
+                    resource_types_with_times.append(resource_type)
+                    avg_response_times.append(type_stats.avg_ttfb)
+            
+            # Verificar se há dados suficientes para criar o gráfico TTFB
+            if resource_types_with_times and avg_response_times:
+                plt.figure(figsize=(10, 6))
+                plt.bar(resource_types_with_times, avg_response_times, color='#673AB7')
+                plt.xlabel('Tipo de Recurso')
+                plt.ylabel('Tempo até o Primeiro Byte (s)')
+                plt.title('Tempo Médio de Resposta (TTFB) por Tipo de Recurso')
+                plt.grid(axis='y', linestyle='--', alpha=0.3)
+                plt.tight_layout()
                 
-            # Cache
-            cache_str = asset['cache']
-            if cache_str == 'Não':
-                cache_str = f"{Fore.RED}{cache_str}{Style.RESET_ALL}"
+                # Salvar o gráfico como arquivo e em base64
+                file_path = f"{self.graphs_dir}/ttfb_distribution_{domain}_{timestamp}.png"
+                plt.savefig(file_path, dpi=100)
+                self.graph_images['ttfb_distribution'] = self._fig_to_base64(plt.gcf())
+                plt.close()
             else:
-                cache_str = f"{Fore.GREEN}{cache_str}{Style.RESET_ALL}"
+                print(f"{Fore.YELLOW}Aviso: Não há dados TTFB suficientes para gerar gráfico")
                 
-            # Adicionar linha
-            output += row_format.format(
-                str(i), 
-                asset['tipo'], 
-                url, 
-                tamanho_str, 
-                tempo_str,
-                mime, 
-                status_str, 
-                cache_str
-            ) + "\n"
-            
-        # Estatísticas
-        total_size_mb = sum(asset['tamanho_kb'] for asset in all_assets) / 1024
-        avg_load_time = statistics.mean(asset['tempo_ms'] for asset in all_assets)
-        
-        output += f"\n{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n"
-        output += f"Total de assets: {len(all_assets)}\n"
-        output += f"Tamanho total: {total_size_mb:.2f} MB\n"
-        output += f"Tempo médio de carregamento: {avg_load_time:.2f} ms\n"
-        output += f"{Fore.CYAN}{'=' * 100}{Style.RESET_ALL}\n"
-        
-        return output
-        
-    def generate_resource_list(self, output_format='text'):
+        except Exception as e:
+            print(f"{Fore.RED}Erro ao gerar gráficos de distribuição: {str(e)}")
+            # Fechar qualquer figura pendente em caso de erro
+            plt.close('all')
+
+    def print_summary(self):
         """
-        Gera uma lista rápida com todas as imagens, CSS, JS e mídias carregadas
-        Inclui caminho, tamanho e tempo de carregamento
-        
-        Args:
-            output_format (str): Formato de saída ('text' ou 'csv')
-        
-        Returns:
-            str: Caminho do arquivo gerado ou texto da lista
+        Imprime um resumo da análise
         """
-        print(f"{Fore.YELLOW}Gerando lista de recursos...")
+        totals = self.resource_summary()
+        # Uma URL listada em mais de um grupo (alias_of) é contada uma única vez
+        total_resources = totals.unique
+        total_size = self.page_size + totals.unique_size
         
-        # Cabeçalhos para a lista
-        headers = ['Tipo', 'URL', 'Tamanho (KB)', 'Tempo (s)', 'Tempo (ms)', 'Status']
+        # Contagem total de APIs analisadas
+        total_apis = sum(len([api for api in apis if api.get('analyzed', False)]) for apis in self.apis.values())
         
-        # Preparar dados de todos os recursos
-        resource_data = []
+        print(f"\n{Fore.CYAN}{'=' * 70}")
+        print(f"{Fore.CYAN}RESUMO DA ANÁLISE")
+        print(f"{Fore.CYAN}{'=' * 70}")
+        print(f"URL analisada: {self.url}")
+        print(f"Total de recursos: {total_resources}")
+        print(f"Total de possíveis APIs/endpoints: {total_apis}")
+        print(f"Tamanho total da página: {total_size/1024/1024:.2f} MB")
+        print(f"Tempo total de carregamento: {self.total_load_time:.2f} segundos")
         
-        # Adicionar página HTML principal
-        html_load_time_s = round(self.total_load_time, 2)
-        html_load_time_ms = round(self.total_load_time * 1000, 2)
-        resource_data.append([
-            'HTML', self.url, round(self.page_size / 1024, 2), 
-            html_load_time_s, html_load_time_ms, '200'
-        ])
+        # Resumo HTTP
+        print(f"\n{Fore.MAGENTA}ESTATÍSTICAS HTTP:")
+        print(f"  Total de requisições: {self.http_stats['total_requests']}")
+        print(f"  Requisições com falha: {self.http_stats['failed_requests']}")
+        if self.skipped:
+            print(f"  {Fore.YELLOW}Requisições ignoradas ({self._deadline_description()}): {len(self.skipped)}")
+        for host, host_stats in self.http_stats['host_concurrency'].items():
+            color = Fore.YELLOW if host_stats['throttled'] or host_stats['errors'] else ''
+            print(f"  {color}Concorrência em {host}: limite final {host_stats['limit']}, máximo {host_stats['peak']}, "
+                  f"{host_stats['throttled']} respostas 429/503, {host_stats['retries']} reenvios, "
+                  f"{host_stats['errors']} erros de conexão")
+        if self.connection_pool is not None:
+            reused = sum(pool_stats['reused'] for pool_stats in self.http_stats['connection_pool'].values())
+            new = sum(pool_stats['new'] for pool_stats in self.http_stats['connection_pool'].values())
+            print(f"  Pool de conexões compartilhado: {reused} conexões reaproveitadas, {new} novas")
+        for host, dns_stats in self.http_stats['dns'].items():
+            if dns_stats['error']:
+                print(f"  {Fore.YELLOW}DNS de {host}: falha ({dns_stats['error']})")
+            elif dns_stats['dns_time'] is not None:
+                print(f"  DNS de {host}: {dns_stats['dns_time'] * 1000:.1f} ms ({dns_stats['source']}, "
+                      f"TTL {dns_stats['ttl']:g} s, {dns_stats['hits']} acertos do cache)")
+        if self.probes:
+            probe_summary = self._probe_summary()
+            print(f"  Sondagens de endpoints: {probe_summary['total']} ({probe_summary['api']} APIs, "
+                  f"{probe_summary['error']} erros, {probe_summary['skipped']} canceladas)")
+            for origin in probe_summary['catch_all_origins']:
+                print(f"  {Fore.YELLOW}Origem catch-all (mesma resposta para qualquer caminho): {origin}")
+        sampling = self.http_stats.get('sampling')
+        if sampling:
+            print(f"  Medições repetidas: {sampling['resources']} recursos x {sampling['samples']} medições "
+                  f"({sampling['requests']} requisições extras em {sampling['time']:.2f}s)")
+            if sampling['skipped']:
+                print(f"  {Fore.YELLOW}Medições repetidas não feitas por falta de tempo "
+                      f"({self._deadline_description()}): {sampling['skipped']}")
+            if sampling['warm_resources']:
+                print(f"  Tempos por recurso abaixo são medianas das medições quentes "
+                      f"({sampling['warm_resources']} de {sampling['resources']} recursos)")
         
-        # Adicionar todos os outros recursos
-        for resource_type, resources in self.resources.items():
-            for resource in resources:
-                load_time_s = round(resource.get('load_time', 0), 2)
-                load_time_ms = round(resource.get('load_time', 0) * 1000, 2)
-                resource_data.append([
-                    resource_type,
-                    resource.get('url', 'N/A'),
-                    round(resource.get('size', 0) / 1024, 2),
-                    load_time_s,
-                    load_time_ms,
-                    str(resource.get('status_code', 'N/A'))
-                ])
+        # Tempos de resposta
+        latency = self.http_stats['latency']
+        if latency.count:
+            print(f"  Tempo médio de resposta: {latency.mean:.3f}s")
+            print(f"  Tempo mínimo de resposta: {latency.min:.3f}s")
+            print(f"  Tempo máximo de resposta: {latency.max:.3f}s")
+            print(f"\n{Fore.MAGENTA}PERCENTIS DE LATÊNCIA (ms):")
+            labels = [LatencyHistogram.percentile_label(fraction) for fraction in LatencyHistogram.PERCENTILES]
+            print(f"  {'Grupo':<32}{'Req.':>6}" + ''.join(f"{label.upper():>9}" for label in labels))
+            for group, name, summary in self._latency_summary():
+                label = name if group == 'total' else f"{group}: {name}"
+                print(f"  {label[:32]:<32}{summary['count']:>6}"
+                      + ''.join(f"{summary[key] * 1000:>9.1f}" for key in labels))
         
-        # Ordenar por tipo e depois por tempo de carregamento (decrescente)
-        resource_data.sort(key=lambda x: (x[0], -x[3]))
+        # Distribuição de códigos de status
+        print(f"\n{Fore.MAGENTA}CÓDIGOS DE STATUS HTTP:")
+        for status, count in sorted(self.http_stats['status_codes'].items()):
+            status_color = Fore.GREEN if status == 200 else (
+                           Fore.BLUE if 200 <= status < 300 else (
+                           Fore.YELLOW if 300 <= status < 400 else (
+                           Fore.RED if 400 <= status < 500 else Fore.RED)))
+            print(f"  {status_color}Status {status}: {count} requisições")
         
-        if output_format == 'csv':
-            # Criar nome de arquivo
-            domain = self.domain.replace(".", "_")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"{self.output_dir}/resource_list_{domain}_{timestamp}.csv"
-            
-            # Garantir que o diretório existe
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            
-            # Escrever no arquivo CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(headers)
-                writer.writerows(resource_data)
-            
-            print(f"{Fore.GREEN}Lista de recursos gerada em: {output_file}")
-            return output_file
-        else:
-            # Gerar saída de texto formatada
-            output_text = f"\n{'=' * 80}\n"
-            output_text += f"LISTA DE RECURSOS CARREGADOS: {self.url}\n"
-            output_text += f"{'=' * 80}\n\n"
-            
-            # Calcular larguras de coluna
-            type_width = max(len('Tipo'), max(len(row[0]) for row in resource_data))
-            url_width = min(70, max(len('URL'), max(len(row[1]) for row in resource_data)))
-            size_width = max(len('Tamanho (KB)'), max(len(str(row[2])) for row in resource_data))
-            time_s_width = max(len('Tempo (s)'), max(len(str(row[3])) for row in resource_data))
-            time_ms_width = max(len('Tempo (ms)'), max(len(str(row[4])) for row in resource_data))
-            status_width = max(len('Status'), max(len(str(row[5])) for row in resource_data))
-            
-            # Criar cabeçalho da tabela
-            header_format = f"{{:<{type_width}}}  {{:<{url_width}}}  {{:>{size_width}}}  {{:>{time_s_width}}}  {{:>{time_ms_width}}}  {{:>{status_width}}}\n"
-            output_text += header_format.format(*headers)
-            output_text += "-" * (type_width + url_width + size_width + time_s_width + time_ms_width + status_width + 25) + "\n"
-            
-            # Adicionar linhas de dados
-            row_format = f"{{:<{type_width}}}  {{:<{url_width}}}  {{:>{size_width}.2f}}  {{:>{time_s_width}.2f}}  {{:>{time_ms_width}.2f}}  {{:>{status_width}}}\n"
+        # Top 5 tipos de conteúdo
+        content_types = sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True)[:5]
+        if content_types:
+            print(f"\n{Fore.MAGENTA}TOP 5 TIPOS DE CONTEÚDO:")
+            for content_type, count in content_types:
+                print(f"  {content_type}: {count} recursos")
+        
+        # Estatísticas por tipo de recurso
+        print(f"\n{Fore.CYAN}DETALHES POR TIPO DE RECURSO:")
+        for resource_type, type_stats in totals.by_type.items():
+            print(f"\n{Fore.YELLOW}{resource_type.upper()}:")
+            print(f"  Quantidade: {type_stats.count}")
+            print(f"  Tamanho total: {type_stats.size/1024:.2f} KB")
+            print(f"  Tempo médio de carregamento: {type_stats.avg_time:.2f} segundos")
             
-            # Agrupar por tipo de recurso
-            current_type = ""
-            for row in resource_data:
-                if row[0] != current_type:
-                    current_type = row[0]
-                    output_text += f"\n{current_type.upper()}:\n"
+            # Estatísticas específicas para cada tipo de recurso
+            if resource_type == 'images':
+                # Calcular tamanho médio de imagens
+                avg_img_size = type_stats.size / type_stats.count / 1024  # em KB
+                print(f"  Tamanho médio das imagens: {avg_img_size:.2f} KB")
                 
-                # Truncar URL se necessário
-                url = row[1]
-                if len(url) > url_width:
-                    url = "..." + url[-(url_width-3):]
+                # Imagens por formato
+                print(f"  Formatos de imagens:")
+                for fmt, count in type_stats.formats.items():
+                    if fmt != 'Unknown':
+                        print(f"    - {fmt}: {count}")
                 
-                output_text += row_format.format(
-                    "", url, row[2], row[3], row[4], row[5]
-                )
+                # Imagens sem texto alternativo
+                no_alt = type_stats.no_alt_text
+                if no_alt > 0:
+                    print(f"  {Fore.RED}Imagens sem texto alternativo: {no_alt} ({no_alt/type_stats.count*100:.1f}%)")
             
-            return output_text
+            elif resource_type == 'js':
+                # Scripts async/defer
+                async_scripts = type_stats.async_scripts
+                defer_scripts = type_stats.defer_scripts
+                
+                if async_scripts > 0:
+                    print(f"  Scripts assíncronos: {async_scripts} ({async_scripts/type_stats.count*100:.1f}%)")
+                if defer_scripts > 0:
+                    print(f"  Scripts com defer: {defer_scripts} ({defer_scripts/type_stats.count*100:.1f}%)")
+        
+        # Resumo de APIs detectadas
+        if total_apis > 0:
+            print(f"\n{Fore.CYAN}APIS E ENDPOINTS DETECTADOS:")
+            for api_type, apis in self.apis.items():
+                analyzed_apis = [api for api in apis if api.get('analyzed', False)]
+                if analyzed_apis:
+                    avg_time = sum(api.get('load_time', 0) for api in analyzed_apis) / len(analyzed_apis)
+                    print(f"\n{Fore.YELLOW}{api_type.upper()}:")
+                    print(f"  Quantidade: {len(analyzed_apis)}")
+                    print(f"  Tempo médio de resposta: {avg_time:.3f} segundos")
+                    
+                    # Listar URLs das APIs (limitado a 5 para não sobrecarregar o console)
+                    if len(analyzed_apis) <= 5:
+                        for api in analyzed_apis:
+                            status = api.get('status_code', 0)
+                            status_color = Fore.GREEN if status == 200 else (
+                                           Fore.YELLOW if 300 <= status < 400 else Fore.RED)
+                            print(f"  - {status_color}{api['url']} ({status})")
+                    else:
+                        print(f"  {len(analyzed_apis)} endpoints encontrados. Veja o relatório para detalhes.")
+        
+        # Estatísticas de cache e compressão
+        cached_resources = totals.cached
+        compressed_resources = totals.compressed
+        
+        print(f"\n{Fore.CYAN}OTIMIZAÇÃO DO SITE:")
+        if cached_resources > 0:
+            print(f"{Fore.GREEN}Recursos com cache configurado: {cached_resources} ({totals.percent(cached_resources):.1f}%)")
+        
+        if compressed_resources > 0:
+            print(f"{Fore.GREEN}Recursos comprimidos: {compressed_resources} ({totals.percent(compressed_resources):.1f}%)")
+        
+        # Tempos médios de carregamento
+        if self.http_stats['latency'].count and totals.slow > 0:
+            print(f"{Fore.YELLOW}Recursos lentos (>{ResourceSummary.SLOW_THRESHOLD}s): {totals.slow} "
+                  f"({totals.percent(totals.slow):.1f}%)")
+        
+        print(f"\n{Fore.CYAN}{'=' * 70}\n")
+
+
+class SitemapReader:
+    """
+    Leitura em streaming de um sitemap.xml (ou índice de sitemaps) como fonte de páginas
+
+    Os documentos são lidos aos poucos da conexão com ElementTree.XMLPullParser e cada
+    <url> ou <sitemap> é descartado logo depois de lido, então nem um sitemap de 50 mil
+    URLs nem um índice com centenas de sitemaps ficam inteiros na memória. Sitemaps
+    comprimidos (.xml.gz) são reconhecidos pelos primeiros bytes, não pela extensão.
+    A iteração é preguiçosa: a primeira URL sai antes do primeiro sitemap terminar de
+    ser lido, e o próximo sitemap do índice só é baixado quando as URLs do anterior
+    acabam.
+
+    Filtros aplicados durante a leitura:
+        since: mantém apenas URLs com lastmod a partir dessa data (AAAA-MM-DD); sitemaps
+               do índice com lastmod anterior nem são baixados. URLs sem lastmod são mantidas
+        sample: fração (0 a 1) das URLs mantidas, escolhidas pelo hash da URL com a
+                semente, de modo que a mesma amostra se repete entre execuções
+    """
+    # Índices de sitemap não deveriam aninhar outros índices; o limite evita ciclos
+    MAX_NESTING = 3
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, sitemap_url, session=None, timeout=30, since=None, sample=None, sample_seed=0):
+        self.sitemap_url = sitemap_url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.since = since
+        self.sample = sample
+        self.sample_seed = str(sample_seed)
+        self.stats = {'sitemaps': 0, 'sitemaps_skipped': 0, 'sitemap_errors': 0, 'urls': 0,
+                      'lastmod_filtered': 0, 'not_sampled': 0, 'yielded': 0}
+        self.errors = []
+
+    def __iter__(self):
+        return self._read(self.sitemap_url, 0, set())
+
+    def _sampled(self, url):
+        if self.sample is None or self.sample >= 1:
+            return True
+        digest = hashlib.blake2b(f"{self.sample_seed}:{url}".encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') / 2 ** 64 < self.sample
+
+    def _entries(self, sitemap_url):
+        """
+        Gera (tipo, loc, lastmod) de cada <url> ou <sitemap> do documento, em streaming
+        """
+        with self.session.get(sitemap_url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            parser = ElementTree.XMLPullParser(events=('start', 'end'))
+            root = None
+            loc = lastmod = None
+            # Profundidade do elemento: 1 = <urlset>/<sitemapindex>, 2 = <url>/<sitemap>,
+            # 3 = seus filhos. Só <loc> e <lastmod> filhos diretos contam, para que
+            # <image:loc> e <video:loc> das extensões não substituam o endereço da página
+            depth = 0
+            for piece in self._decompressed(response.iter_content(chunk_size=self.CHUNK_SIZE)):
+                parser.feed(piece)
+                for event, element in parser.read_events():
+                    if root is None:
+                        root = element
+                    if event == 'start':
+                        depth += 1
+                        continue
+                    depth -= 1
+                    tag = element.tag.rsplit('}', 1)[-1]
+                    if depth == 2 and tag == 'loc':
+                        loc = (element.text or '').strip()
+                    elif depth == 2 and tag == 'lastmod':
+                        lastmod = (element.text or '').strip()
+                    elif depth == 1 and tag in ('url', 'sitemap'):
+                        if loc:
+                            yield tag, loc, lastmod
+                        loc = lastmod = None
+                        # Descarta os elementos já lidos
+                        root.clear()
+            parser.close()
+
+    @classmethod
+    def _decompressed(cls, chunks):
+        """
+        Repassa os blocos lidos, descomprimindo-os se o documento for gzip
+
+        A saída de cada bloco comprimido é limitada a CHUNK_SIZE, já que 64 KB de um
+        sitemap .gz podem virar vários MB de XML.
+        """
+        decompressor = None
+        for index, chunk in enumerate(chunks):
+            if index == 0 and chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(wbits=31)
+            if decompressor is None:
+                yield chunk
+                continue
+            while chunk:
+                yield decompressor.decompress(chunk, cls.CHUNK_SIZE)
+                chunk = decompressor.unconsumed_tail
+
+    def _read(self, sitemap_url, nesting, visited):
+        if sitemap_url in visited or nesting > self.MAX_NESTING:
+            return
+        visited.add(sitemap_url)
+        self.stats['sitemaps'] += 1
+        children = []
+        try:
+            for tag, loc, lastmod in self._entries(sitemap_url):
+                if tag == 'sitemap':
+                    if self.since and lastmod and lastmod[:10] < self.since:
+                        self.stats['sitemaps_skipped'] += 1
+                    else:
+                        children.append(loc)
+                    continue
+                self.stats['urls'] += 1
+                if self.since and lastmod and lastmod[:10] < self.since:
+                    self.stats['lastmod_filtered'] += 1
+                elif not self._sampled(loc):
+                    self.stats['not_sampled'] += 1
+                else:
+                    self.stats['yielded'] += 1
+                    yield loc
+        except (requests.RequestException, ElementTree.ParseError, zlib.error) as e:
+            self.stats['sitemap_errors'] += 1
+            self.errors.append((sitemap_url, str(e)))
+            print(f"{Fore.RED}Erro ao ler o sitemap {sitemap_url}: {e}")
+        # Sitemaps filhos são lidos depois que o índice termina, um de cada vez
+        for child in children:
+            yield from self._read(child, nesting + 1, visited)
+
+
+class CrawlFrontier:
+    """
+    Fila de páginas de uma varredura do site, em largura, com limites
+
+    Só entram URLs da mesma origem da página inicial, até max_depth links de distância,
+    que passam pelos filtros include/exclude (expressões regulares sobre caminho e
+    query) e enquanto o total de páginas admitidas não chega a max_pages, de modo que a
+    fila nunca passa desse limite. As URLs já vistas ficam como hash de 8 bytes da
+    forma normalizada, o que mantém o estado pequeno mesmo com dezenas de milhares de
+    links. Com same_origin=False (páginas vindas de um sitemap, que pode estar em outro
+    host) a origem não é verificada.
+    """
+    # Extensões que não são páginas HTML
+    SKIP_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg', '.ico', '.css', '.js',
+                       '.json', '.xml', '.pdf', '.zip', '.gz', '.mp4', '.webm', '.mp3', '.woff', '.woff2',
+                       '.ttf', '.txt')
+
+    def __init__(self, start_url, max_pages=20, max_depth=2, include=None, exclude=None, same_origin=True):
+        parsed = urlparse(normalize_url(start_url))
+        self.origin = (parsed.scheme, parsed.netloc) if same_origin else None
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.include = [re.compile(pattern) for pattern in include or []]
+        self.exclude = [re.compile(pattern) for pattern in exclude or []]
+        self._queue = deque()
+        self._seen = set()
+        self.admitted = 0
+        # Links descartados por motivo
+        self.rejected = {'origem': 0, 'profundidade': 0, 'filtro': 0, 'limite': 0}
+
+    @staticmethod
+    def _fingerprint(url):
+        return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def add(self, url, depth):
+        """
+        Admite a URL na fila se ela passar pelos limites
 
-    def _generate_graphs(self, timestamp, domain):
+        Returns:
+            bool: True se a URL foi admitida
         """
-        Gera gráficos de análise
+        try:
+            url = normalize_url(url)
+        except ValueError:
+            return False
+        parsed = urlparse(url)
+        if self.origin is not None and (parsed.scheme, parsed.netloc) != self.origin:
+            self.rejected['origem'] += 1
+            return False
+        fingerprint = self._fingerprint(url)
+        if fingerprint in self._seen:
+            return False
+        if depth > self.max_depth:
+            self.rejected['profundidade'] += 1
+            return False
+        target = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+        if parsed.path.lower().endswith(self.SKIP_EXTENSIONS) \
+                or (self.include and not any(pattern.search(target) for pattern in self.include)) \
+                or any(pattern.search(target) for pattern in self.exclude):
+            self.rejected['filtro'] += 1
+            return False
+        if self.admitted >= self.max_pages:
+            self.rejected['limite'] += 1
+            return False
+        self._seen.add(fingerprint)
+        self._queue.append((url, depth))
+        self.admitted += 1
+        return True
+
+    def pop(self):
         """
-        print(f"{Fore.YELLOW}Gerando gráficos de análise...")
-        
-        # Atualizar progresso - Gerando gráficos
+        Próxima (url, profundidade) da fila, ou None se ela estiver vazia
+        """
+        return self._queue.popleft() if self._queue else None
+
+    def __len__(self):
+        return len(self._queue)
+
+
+class SiteCrawler:
+    """
+    Varredura de várias páginas de um site a partir de uma página inicial
+
+    Cada página é analisada por um WebsitePerformanceTester, várias ao mesmo tempo, e
+    seus links da mesma origem alimentam a CrawlFrontier. As páginas compartilham as
+    medições de recursos (SharedAssetResults), o cache de respostas e, no backend
+    requests, as conexões, então um bundle presente em todas as páginas é medido uma
+    única vez. De cada página fica apenas um resumo, não o testador inteiro.
+
+    Com url_source (por exemplo um SitemapReader) as páginas vêm dessa fonte, lida aos
+    poucos conforme há vaga para analisar mais uma página, e os links não são seguidos.
+    """
+    def __init__(self, start_url, output_dir="reports", max_pages=20, max_depth=2, include=None,
+                 exclude=None, page_workers=2, user_agent=None, progress_callback=None, url_source=None,
+                 **tester_options):
+        """
+        Args:
+            start_url (str): Página inicial da varredura (ou o sitemap, com url_source)
+            output_dir (str): Diretório onde o relatório do site será salvo
+            max_pages (int): Máximo de páginas analisadas, incluindo a inicial
+            max_depth (int): Máximo de links de distância da página inicial
+            include (list): Expressões regulares; se informadas, só páginas cujo caminho
+                            (com a query) case com alguma delas são analisadas
+            exclude (list): Expressões regulares de caminhos a ignorar (ex.: '/logout')
+            page_workers (int): Páginas analisadas simultaneamente
+            user_agent (str): User-Agent personalizado para as requisições
+            progress_callback (callable): Recebe (percent, message, page_info)
+            url_source (iterable): Fonte das páginas a analisar no lugar dos links
+            **tester_options: Opções repassadas a cada WebsitePerformanceTester
+        """
+        self.start_url = start_url
+        self.domain = urlparse(start_url).netloc
+        self.output_dir = output_dir
+        self.page_workers = max(1, int(page_workers))
+        self.user_agent = user_agent
+        self.progress_callback = progress_callback
+        self.url_source = url_source
+        self._pending_source = iter(url_source) if url_source is not None else None
+        self.frontier = CrawlFrontier(start_url, max_pages, max_depth, include, exclude,
+                                      same_origin=url_source is None)
+        self.asset_results = SharedAssetResults()
+        self.response_cache = ResponseCache(max_bytes=tester_options.pop('response_cache_bytes', 64 * 1024 * 1024))
+        self.connection_pool = SharedConnectionPool(pool_maxsize=max(8, self.page_workers * 4)) \
+            if tester_options.get('backend', 'requests') == 'requests' else None
+        self.tester_options = tester_options
+        self.pages = []
+        self.total_time = 0
+        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def crawl(self):
+        """
+        Analisa as páginas da fila, em largura, até ela se esgotar
+        """
+        if self.url_source is not None:
+            print(f"{Fore.CYAN}Análise das páginas de {self.start_url} "
+                  f"(até {self.frontier.max_pages} páginas, {self.page_workers} páginas simultâneas)")
+        else:
+            print(f"{Fore.CYAN}Varredura do site a partir de {self.start_url} "
+                  f"(até {self.frontier.max_pages} páginas, profundidade {self.frontier.max_depth}, "
+                  f"{self.page_workers} páginas simultâneas)")
+            self.frontier.add(self.start_url, 0)
+        start_time = time.time()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            while True:
+                while len(running) < self.page_workers:
+                    item = self._next_page()
+                    if item is None:
+                        break
+                    running[executor.submit(self._analyze_page, *item)] = item
+                if not running:
+                    break
+                done, _ = wait_futures(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = running.pop(future)
+                    summary, links = future.result()
+                    self.pages.append(summary)
+                    if self.url_source is None:
+                        for link in links:
+                            if self.frontier.add(link, depth + 1):
+                                summary['new_links'] += 1
+                    self._page_done(summary)
+        self._close_source()
+        if self.connection_pool is not None:
+            self.connection_pool.close()
+        self.total_time = time.time() - start_time
+        print(f"{Fore.CYAN}Varredura concluída: {len(self.pages)} páginas em {self.total_time:.2f} segundos")
+
+    def _next_page(self):
+        """
+        Próxima página a analisar; com url_source, lê a fonte só até admitir uma página
+        """
+        item = self.frontier.pop()
+        while item is None and self._pending_source is not None:
+            if self.frontier.admitted >= self.frontier.max_pages:
+                self._close_source()
+                break
+            url = next(self._pending_source, None)
+            if url is None:
+                self._pending_source = None
+                break
+            self.frontier.add(url, 0)
+            item = self.frontier.pop()
+        return item
+
+    def _close_source(self):
+        # Interrompe a leitura do sitemap (e fecha a conexão) quando o limite é atingido
+        if self._pending_source is not None and hasattr(self._pending_source, 'close'):
+            self._pending_source.close()
+        self._pending_source = None
+
+    def _page_done(self, summary):
+        color = Fore.GREEN if summary['error'] is None else Fore.RED
+        print(f"{color}[{len(self.pages)}/{self.frontier.admitted}] {summary['url']} "
+              f"({summary['total_load_time']:.2f} s, {summary['resources']} recursos, "
+              f"{summary['shared_assets']} já medidos)")
         if self.progress_callback:
-            self.progress_callback(85, "Gerando gráficos de performance...", {"timestamp": timestamp})
-        
+            percent = 5 + int(len(self.pages) / max(1, self.frontier.admitted) * 90)
+            self.progress_callback(percent, f"Páginas analisadas: {len(self.pages)}/{self.frontier.admitted}",
+                                   {"url": summary['url']})
+
+    def _analyze_page(self, url, depth):
+        """
+        Analisa uma página; retorna seu resumo e os links encontrados nela
+        """
+        tester = None
+        error = None
         try:
-            # Gráfico de tempo de carregamento por tipo de recurso
-            self._generate_load_time_graph(timestamp, domain)
-            
-            # Gráfico de distribuição de status HTTP
-            self._generate_status_codes_graph(timestamp, domain)
-            
-            # Gráfico de distribuição de tamanho por tipo
-            self._generate_size_distribution_graph(timestamp, domain)
-            
-            print(f"{Fore.GREEN}Gráficos gerados com sucesso no diretório: {self.graphs_dir}")
-        
+            tester = WebsitePerformanceTester(url, self.output_dir, asset_results=self.asset_results,
+                                              response_cache=self.response_cache,
+                                              connection_pool=self.connection_pool, **self.tester_options)
+            if self.user_agent:
+                tester.session.headers.update({'User-Agent': self.user_agent})
+            tester.analyze_website()
         except Exception as e:
-            print(f"{Fore.RED}Erro ao gerar gráficos: {e}")
-            # Fechar todas as figuras pendentes do matplotlib em caso de erro
-            plt.close('all')
-    
-    def _generate_load_time_graph(self, timestamp, domain):
+            error = str(e)
+        finally:
+            if tester is not None:
+                tester.close()
+        if tester is None:
+            # O testador nem chegou a ser criado: a página entra no relatório como falha
+            return self._failed_page_summary(url, depth, error), []
+        return self._page_summary(tester, depth, error), tester.page_links
+
+    @staticmethod
+    def _page_summary(tester, depth, error):
+        resources = tester.resource_summary()
+        latency = tester.http_stats['latency']
+        return {
+            'url': tester.url,
+            'depth': depth,
+            'error': error,
+            'html_load_time': tester.html_load_time,
+            'total_load_time': tester.total_load_time,
+            'page_size': tester.page_size,
+            'resources': resources.unique,
+            'shared_assets': resources.shared_assets,
+            'resources_size': resources.unique_size,
+            'apis': sum(len(apis) for apis in tester.apis.values()),
+            'requests': tester.http_stats['total_requests'],
+            'failed_requests': tester.http_stats['failed_requests'],
+            'avg_response_time': latency.mean,
+            'latency': latency,
+            'links': len(tester.page_links),
+            'new_links': 0
+        }
+
+    @staticmethod
+    def _failed_page_summary(url, depth, error):
+        return {
+            'url': url,
+            'depth': depth,
+            'error': error,
+            'html_load_time': 0,
+            'total_load_time': 0,
+            'page_size': 0,
+            'resources': 0,
+            'shared_assets': 0,
+            'resources_size': 0,
+            'apis': 0,
+            'requests': 0,
+            'failed_requests': 0,
+            'avg_response_time': 0,
+            'latency': LatencyHistogram(),
+            'links': 0,
+            'new_links': 0
+        }
+
+    @staticmethod
+    def _percentile(values, fraction):
+        ordered = sorted(values)
+        if not ordered:
+            return 0
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def site_summary(self):
         """
-        Gera gráfico de tempo de carregamento por tipo de recurso
+        Estatísticas agregadas da varredura
         """
-        # Coletar dados para o gráfico
-        resource_types = []
-        avg_times = []
-        max_times = []
-        
+        analyzed = [page for page in self.pages if page['error'] is None]
+        load_times = [page['total_load_time'] for page in analyzed]
+        html_times = [page['html_load_time'] for page in analyzed]
+        assets = self.asset_results.assets()
+        return {
+            'pages': len(self.pages),
+            'failed_pages': len(self.pages) - len(analyzed),
+            'total_time': self.total_time,
+            'load_time_mean': statistics.mean(load_times) if load_times else 0,
+            'load_time_median': statistics.median(load_times) if load_times else 0,
+            'load_time_p90': self._percentile(load_times, 0.9),
+            'load_time_max': max(load_times) if load_times else 0,
+            'html_load_time_mean': statistics.mean(html_times) if html_times else 0,
+            'requests': sum(page['requests'] for page in self.pages),
+            'failed_requests': sum(page['failed_requests'] for page in self.pages),
+            'unique_assets': len(assets),
+            'unique_assets_size': sum(fields.get('size') or 0 for _, fields, _ in assets),
+            'shared_asset_hits': self.asset_results.hits,
+            'request_latency': LatencyHistogram.merged(page['latency'] for page in self.pages).percentiles(),
+            'links_rejected': dict(self.frontier.rejected),
+            'sitemap': dict(self.url_source.stats) if isinstance(self.url_source, SitemapReader) else None
+        }
+
+    def shared_assets(self, limit=20):
+        """
+        Recursos presentes em mais de uma página, dos mais usados para os menos usados
+        """
+        assets = [(url, fields, pages) for url, fields, pages in self.asset_results.assets() if pages > 1]
+        assets.sort(key=lambda asset: (asset[2], asset[1].get('size') or 0), reverse=True)
+        return assets[:limit]
+
+    def generate_report(self):
+        """
+        Gera o relatório do site: CSV com uma linha por página e os agregados, e HTML
+
+        Returns:
+            tuple: (caminho do CSV, caminho do HTML ou None)
+        """
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        domain = self.domain.replace(':', '_')
+        base_name = f"site_report_{domain}_{self.report_timestamp}"
+        csv_filename = os.path.join(self.output_dir, f"{base_name}.csv")
+        summary = self.site_summary()
+        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['URL', 'Profundidade', 'Tempo Total (s)', 'Tempo do HTML (s)', 'Tamanho do HTML (KB)',
+                             'Recursos', 'Recursos Já Medidos', 'Tamanho dos Recursos (KB)', 'APIs',
+                             'Requisições', 'Requisições com Falha', 'Tempo Médio de Resposta (s)',
+                             'Links', 'Links Novos na Fila', 'Erro'])
+            for page in self.pages:
+                writer.writerow([page['url'], page['depth'], round(page['total_load_time'], 3),
+                                 round(page['html_load_time'], 3), round(page['page_size'] / 1024, 2),
+                                 page['resources'], page['shared_assets'], round(page['resources_size'] / 1024, 2),
+                                 page['apis'], page['requests'], page['failed_requests'],
+                                 round(page['avg_response_time'], 3), page['links'], page['new_links'],
+                                 page['error'] or ''])
+            writer.writerow(['', ''])
+            writer.writerow(['Métrica', 'Valor'])
+            writer.writerow(['Páginas Analisadas', summary['pages']])
+            writer.writerow(['Páginas com Erro', summary['failed_pages']])
+            writer.writerow(['Tempo da Varredura (s)', round(summary['total_time'], 3)])
+            writer.writerow(['Tempo Médio por Página (s)', round(summary['load_time_mean'], 3)])
+            writer.writerow(['Tempo Mediano por Página (s)', round(summary['load_time_median'], 3)])
+            writer.writerow(['Tempo P90 por Página (s)', round(summary['load_time_p90'], 3)])
+            writer.writerow(['Tempo Máximo por Página (s)', round(summary['load_time_max'], 3)])
+            writer.writerow(['Tempo Médio do HTML (s)', round(summary['html_load_time_mean'], 3)])
+            writer.writerow(['Requisições', summary['requests']])
+            writer.writerow(['Requisições com Falha', summary['failed_requests']])
+            for fraction in LatencyHistogram.PERCENTILES:
+                label = LatencyHistogram.percentile_label(fraction)
+                writer.writerow([f'Latência das Requisições {label.upper()} (s)',
+                                 round(summary['request_latency'][label], 3)])
+            writer.writerow(['Recursos Únicos Medidos', summary['unique_assets']])
+            writer.writerow(['Tamanho dos Recursos Únicos (KB)', round(summary['unique_assets_size'] / 1024, 2)])
+            writer.writerow(['Medições Reaproveitadas entre Páginas', summary['shared_asset_hits']])
+            for reason, count in summary['links_rejected'].items():
+                writer.writerow([f'Links Descartados ({reason})', count])
+            if summary['sitemap']:
+                writer.writerow(['Sitemaps Lidos', summary['sitemap']['sitemaps']])
+                writer.writerow(['Sitemaps Ignorados (lastmod)', summary['sitemap']['sitemaps_skipped']])
+                writer.writerow(['Sitemaps com Erro', summary['sitemap']['sitemap_errors']])
+                writer.writerow(['URLs Lidas do Sitemap', summary['sitemap']['urls']])
+                writer.writerow(['URLs Ignoradas (lastmod)', summary['sitemap']['lastmod_filtered']])
+                writer.writerow(['URLs Fora da Amostra', summary['sitemap']['not_sampled']])
+            shared_assets = self.shared_assets()
+            if shared_assets:
+                writer.writerow(['', ''])
+                writer.writerow(['Recurso Compartilhado', 'Páginas', 'Tamanho (KB)', 'Tempo de Carregamento (s)'])
+                for url, fields, pages in shared_assets:
+                    writer.writerow([url, pages, round((fields.get('size') or 0) / 1024, 2),
+                                     round(fields.get('load_time') or 0, 3)])
+
+        html_filename = os.path.join(self.output_dir, f"{base_name}.html")
+        template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "site_report_template.html")
         try:
-            plt.figure(figsize=(12, 6))
-            
-            for resource_type, resources in self.resources.items():
-                if resources:
-                    # Filtrar tempos para evitar valores nulos/inválidos
-                    valid_times = [resource.get('load_time', 0) for resource in resources if resource.get('load_time', 0) > 0]
-                    if valid_times:  # Verificar se há tempos válidos
-                        resource_types.append(resource_type)
-                        avg_times.append(sum(valid_times) / len(valid_times) if valid_times else 0)
-                        max_times.append(max(valid_times) if valid_times else 0)
-            
-            # API tempos
-            api_types = []
-            api_avg_times = []
-            api_max_times = []
-            
-            for api_type, apis in self.apis.items():
-                if apis:
-                    analyzed_apis = [api for api in apis if api.get('analyzed', False)]
-                    if analyzed_apis:
-                        # Filtrar tempos para evitar valores nulos/inválidos
-                        valid_times = [api.get('load_time', 0) for api in analyzed_apis if api.get('load_time', 0) > 0]
-                        if valid_times:  # Verificar se há tempos válidos
-                            api_types.append(api_type)
-                            api_avg_times.append(sum(valid_times) / len(valid_times) if valid_times else 0)
-                            api_max_times.append(max(valid_times) if valid_times else 0)
-            
-            # Cores Material Design
-            colors = {
-                'primary': '#1976D2',   # Azul
-                'secondary': '#FF5722', # Laranja
-                'success': '#4CAF50',   # Verde
-                'warning': '#FFC107',   # Amarelo
-                'error': '#F44336'      # Vermelho
-            }
-            
-            # Verificar se há dados para plotar
-            if resource_types:
-                # Gráfico para recursos
-                x = range(len(resource_types))
-                plt.bar(x, avg_times, width=0.4, label='Tempo Médio', color=colors['primary'], alpha=0.7)
-                plt.bar([i + 0.4 for i in x], max_times, width=0.4, label='Tempo Máximo', color=colors['error'], alpha=0.7)
-                
-                plt.xlabel('Tipo de Recurso')
-                plt.ylabel('Tempo (segundos)')
-                plt.title('Tempo de Carregamento por Tipo de Recurso')
-                plt.xticks([i + 0.2 for i in x], resource_types)
-                plt.legend()
-                plt.grid(axis='y', linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                # Salvar o gráfico como arquivo e em base64
-                file_path = f"{self.graphs_dir}/load_times_{domain}_{timestamp}.png"
-                plt.savefig(file_path, dpi=100)
-                self.graph_images['load_times'] = self._fig_to_base64(plt.gcf())
-                plt.close()
-            else:
-                print(f"{Fore.YELLOW}Aviso: Não há dados de recursos suficientes para gerar gráfico de tempo de carregamento")
-            
-            # Gráfico para APIs se houver dados
-            if api_types:
-                plt.figure(figsize=(12, 6))
-                x = range(len(api_types))
-                plt.bar(x, api_avg_times, width=0.4, label='Tempo Médio', color=colors['success'], alpha=0.7)
-                plt.bar([i + 0.4 for i in x], api_max_times, width=0.4, label='Tempo Máximo', color=colors['warning'], alpha=0.7)
-                
-                plt.xlabel('Tipo de API')
-                plt.ylabel('Tempo (segundos)')
-                plt.title('Tempo de Carregamento por Tipo de API')
-                plt.xticks([i + 0.2 for i in x], api_types)
-                plt.legend()
-                plt.grid(axis='y', linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                # Salvar o gráfico como arquivo e em base64
-                file_path = f"{self.graphs_dir}/api_load_times_{domain}_{timestamp}.png"
-                plt.savefig(file_path, dpi=100)
-                self.graph_images['api_load_times'] = self._fig_to_base64(plt.gcf())
-                plt.close()
-                
+            with open(template_path, 'r', encoding='utf-8') as template_file:
+                template = Environment().from_string(template_file.read())
+            with open(html_filename, 'w', encoding='utf-8') as html_file:
+                html_file.write(template.render(
+                    title=f"Relatório do Site - {self.domain}",
+                    start_url=self.start_url,
+                    timestamp=datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                    pages=self.pages,
+                    summary=summary,
+                    shared_assets=self.shared_assets()
+                ))
         except Exception as e:
-            print(f"{Fore.RED}Erro ao gerar gráfico de tempos de carregamento: {str(e)}")
-            # Fechar qualquer figura pendente em caso de erro
-            plt.close('all')
-    
-    def _fig_to_base64(self, fig):
+            print(f"{Fore.RED}Erro ao gerar relatório HTML do site: {e}")
+            html_filename = None
+        return csv_filename, html_filename
+
+    def print_summary(self):
+        summary = self.site_summary()
+        print(f"\n{Fore.CYAN}{'=' * 70}")
+        print(f"{Fore.CYAN}RESUMO DA VARREDURA DO SITE")
+        print(f"{Fore.CYAN}{'=' * 70}")
+        if summary['sitemap']:
+            sitemap = summary['sitemap']
+            print(f"Sitemap: {self.start_url} ({sitemap['sitemaps']} sitemaps lidos, "
+                  f"{sitemap['sitemaps_skipped']} ignorados, {sitemap['sitemap_errors']} com erro)")
+            print(f"URLs lidas: {sitemap['urls']} ({sitemap['lastmod_filtered']} anteriores ao lastmod pedido, "
+                  f"{sitemap['not_sampled']} fora da amostra)")
+        else:
+            print(f"Página inicial: {self.start_url}")
+        print(f"Páginas analisadas: {summary['pages']} ({summary['failed_pages']} com erro) "
+              f"em {summary['total_time']:.2f} segundos")
+        print(f"Tempo por página: média {summary['load_time_mean']:.2f}s, mediana {summary['load_time_median']:.2f}s, "
+              f"P90 {summary['load_time_p90']:.2f}s, máximo {summary['load_time_max']:.2f}s")
+        print("Latência das requisições: " + ", ".join(
+            f"{LatencyHistogram.percentile_label(fraction)} "
+            f"{summary['request_latency'][LatencyHistogram.percentile_label(fraction)] * 1000:.0f} ms"
+            for fraction in LatencyHistogram.PERCENTILES))
+        print(f"Recursos únicos medidos: {summary['unique_assets']} "
+              f"({summary['unique_assets_size'] / 1024 / 1024:.2f} MB); "
+              f"medições reaproveitadas entre páginas: {summary['shared_asset_hits']}")
+        slowest = sorted((page for page in self.pages if page['error'] is None),
+                         key=lambda page: page['total_load_time'], reverse=True)[:5]
+        if slowest:
+            print(f"\n{Fore.MAGENTA}PÁGINAS MAIS LENTAS:")
+            for page in slowest:
+                print(f"  {page['total_load_time']:.2f}s  {page['url']}")
+        for page in self.pages:
+            if page['error'] is not None:
+                print(f"  {Fore.RED}Erro em {page['url']}: {page['error']}")
+
+
+def _batch_worker(conn, output_dir, user_agent, tester_options):
+    """
+    Processo do lote: analisa as URLs recebidas pela conexão até receber None
+
+    A saída de cada análise é descartada (o supervisor imprime o andamento) e de cada
+    página volta apenas o resumo. As análises do mesmo processo compartilham o cache
+    de respostas e, no backend requests, as conexões.
+    """
+    sys.stdout = sys.stderr = open(os.devnull, 'w')
+    # Sem o lock entre processos padrão do tqdm, que vazaria um semáforo se o processo for encerrado
+    tqdm.set_lock(threading.RLock())
+    tester_options = dict(tester_options)
+    # Processos daemon não podem ter filhos (ScriptScanPool); o lote já paraleliza por processo
+    tester_options['scan_processes'] = 0
+    response_cache = ResponseCache(max_bytes=tester_options.pop('response_cache_bytes', 64 * 1024 * 1024))
+    connection_pool = SharedConnectionPool() if tester_options.get('backend', 'requests') == 'requests' else None
+    try:
+        while True:
+            url = conn.recv()
+            if url is None:
+                break
+            # O tempo limite conta a partir daqui, não da inicialização do processo
+            conn.send(('started', None))
+            try:
+                tester = WebsitePerformanceTester(url, output_dir, response_cache=response_cache,
+                                                  connection_pool=connection_pool, **tester_options)
+            except Exception as e:
+                conn.send(('error', str(e)))
+                continue
+            if user_agent:
+                tester.session.headers.update({'User-Agent': user_agent})
+            error = None
+            try:
+                tester.analyze_website()
+            except Exception as e:
+                error = str(e)
+            finally:
+                tester.close()
+            conn.send(('done', SiteCrawler._page_summary(tester, 0, error)))
+    finally:
+        if connection_pool is not None:
+            connection_pool.close()
+        conn.close()
+
+
+class BatchRunner:
+    """
+    Análise de uma lista de URLs em um pool de processos, com relatório único
+
+    Cada processo analisa uma URL por vez e atende várias URLs seguidas, então a
+    importação do módulo (matplotlib, PIL, bs4) é paga uma vez por processo e não por
+    URL. O supervisor entrega as URLs uma a uma, lidas da fonte aos poucos, e grava
+    cada resultado assim que chega em um CSV e um JSONL combinados. Uma URL que passa
+    de url_timeout tem o processo encerrado; um processo que morre (falta de memória,
+    falha de segmentação) tem a URL registrada como falha. Nos dois casos um novo
+    processo assume o lugar e o lote continua.
+    """
+    STATUS_LABELS = {'ok': 'OK', 'error': 'Erro', 'timeout': 'Tempo Esgotado', 'crash': 'Processo Encerrado'}
+    # Tempo para um processo novo importar o módulo antes de começar a primeira URL
+    STARTUP_TIMEOUT = 60
+
+    def __init__(self, url_source, output_dir="reports", processes=None, url_timeout=300, user_agent=None,
+                 urls_per_worker=100, **tester_options):
         """
-        Converte um matplotlib figure para uma string base64
+        Args:
+            url_source (iterable): URLs a analisar (ex.: BatchRunner.read_url_file(caminho))
+            output_dir (str): Diretório onde os resultados e o resumo serão salvos
+            processes (int): Processos simultâneos (padrão: número de CPUs, até 4)
+            url_timeout (float): Tempo máximo em segundos da análise de uma URL
+            user_agent (str): User-Agent personalizado para as requisições
+            urls_per_worker (int): URLs analisadas por processo antes de ele ser substituído,
+                                   o que limita o crescimento de memória em lotes longos
+            **tester_options: Opções repassadas a cada WebsitePerformanceTester
+        """
+        self.url_source = url_source
+        self.output_dir = output_dir
+        self.processes = max(1, int(processes or min(4, os.cpu_count() or 1)))
+        self.url_timeout = url_timeout
+        self.user_agent = user_agent
+        self.urls_per_worker = max(1, int(urls_per_worker))
+        self.tester_options = tester_options
+        self.results = []
+        self.workers_started = 0
+        self.total_time = 0
+        self.report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = os.path.join(output_dir, f"batch_{self.report_timestamp}")
+        self.csv_filename = f"{base_name}_results.csv"
+        self.jsonl_filename = f"{base_name}_results.jsonl"
+        self._context = multiprocessing.get_context('spawn')
+
+    @staticmethod
+    def read_url_file(path):
+        """
+        URLs de um arquivo, uma por linha, lidas aos poucos (linhas vazias e iniciadas por # são ignoradas)
+        """
+        with open(path, 'r', encoding='utf-8') as url_file:
+            for line in url_file:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_batch_worker, daemon=True,
+                                        args=(child_conn, self.output_dir, self.user_agent, self.tester_options))
+        process.start()
+        child_conn.close()
+        self.workers_started += 1
+        return {'process': process, 'conn': parent_conn, 'url': None, 'started': None, 'deadline': None, 'done': 0}
+
+    @staticmethod
+    def _stop_worker(worker, graceful=True):
+        if graceful and worker['process'].is_alive():
+            try:
+                worker['conn'].send(None)
+            except (OSError, ValueError):
+                pass
+            worker['process'].join(5)
+        if worker['process'].is_alive():
+            worker['process'].terminate()
+            worker['process'].join()
+        worker['conn'].close()
+
+    def run(self):
+        """
+        Analisa todas as URLs da fonte e grava os resultados à medida que chegam
+        """
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        print(f"{Fore.CYAN}Lote com {self.processes} processos (até {self.url_timeout} s por URL)")
+        start_time = time.time()
+        source = iter(self.url_source)
+        workers = []
+        with open(self.csv_filename, 'w', newline='', encoding='utf-8') as csvfile, \
+                open(self.jsonl_filename, 'w', encoding='utf-8') as jsonl_file:
+            writer = csv.writer(csvfile)
+            writer.writerow(['URL', 'Status', 'Tempo da Análise (s)', 'Tempo Total (s)', 'Tempo do HTML (s)',
+                             'Tamanho do HTML (KB)', 'Recursos', 'Tamanho dos Recursos (KB)', 'APIs',
+                             'Requisições', 'Requisições com Falha', 'Tempo Médio de Resposta (s)', 'Erro'])
+            try:
+                while True:
+                    # Entrega uma URL a cada processo livre
+                    while source is not None and sum(1 for worker in workers if worker['url']) < self.processes:
+                        url = next(source, None)
+                        if url is None:
+                            source = None
+                            break
+                        worker = next((worker for worker in workers if worker['url'] is None), None)
+                        if worker is not None and not worker['process'].is_alive():
+                            self._stop_worker(worker, graceful=False)
+                            workers.remove(worker)
+                            worker = None
+                        if worker is None:
+                            worker = self._start_worker()
+                            workers.append(worker)
+                        worker['conn'].send(url)
+                        worker['url'] = url
+                        worker['started'] = time.time()
+                        # Até o processo confirmar o início, vale também o tempo de inicialização
+                        worker['deadline'] = worker['started'] + self.url_timeout + self.STARTUP_TIMEOUT
+                    busy = [worker for worker in workers if worker['url']]
+                    if not busy:
+                        break
+                    now = time.time()
+                    timeout = max(0, min(worker['deadline'] for worker in busy) - now)
+                    ready = wait_connections([worker['conn'] for worker in busy]
+                                             + [worker['process'].sentinel for worker in busy], timeout)
+                    for worker in busy:
+                        now = time.time()
+                        elapsed = now - worker['started']
+                        if worker['conn'] in ready:
+                            try:
+                                message, summary = worker['conn'].recv()
+                            except (EOFError, OSError):
+                                message = summary = None
+                            if message == 'started':
+                                worker['started'] = now
+                                worker['deadline'] = now + self.url_timeout
+                                continue
+                            if message in ('done', 'error'):
+                                if message == 'error':
+                                    # Falha ao criar o analisador; o processo segue disponível
+                                    self._record(writer, jsonl_file, worker['url'], 'error', elapsed, error=summary)
+                                else:
+                                    status = 'ok' if summary['error'] is None else 'error'
+                                    self._record(writer, jsonl_file, worker['url'], status, elapsed, summary)
+                                worker['url'] = None
+                                worker['done'] += 1
+                                if worker['done'] >= self.urls_per_worker:
+                                    self._stop_worker(worker)
+                                    workers.remove(worker)
+                                continue
+                        if worker['conn'] in ready or worker['process'].sentinel in ready:
+                            worker['process'].join()
+                            self._record(writer, jsonl_file, worker['url'], 'crash', elapsed,
+                                         error=f"processo encerrado (código {worker['process'].exitcode})")
+                        elif now >= worker['deadline']:
+                            self._record(writer, jsonl_file, worker['url'], 'timeout', elapsed,
+                                         error=f"análise excedeu {self.url_timeout} s")
+                        else:
+                            continue
+                        self._stop_worker(worker, graceful=False)
+                        workers.remove(worker)
+                    csvfile.flush()
+                    jsonl_file.flush()
+            finally:
+                for worker in workers:
+                    self._stop_worker(worker, graceful=worker['url'] is None)
+        self.total_time = time.time() - start_time
+        print(f"{Fore.CYAN}Lote concluído: {len(self.results)} URLs em {self.total_time:.2f} segundos")
+
+    def _record(self, writer, jsonl_file, url, status, elapsed, summary=None, error=None):
+        """
+        Grava o resultado de uma URL no CSV e no JSONL combinados
+        """
+        result = dict(summary or {'url': url, 'error': error, 'html_load_time': 0, 'total_load_time': 0,
+                                  'page_size': 0, 'resources': 0, 'shared_assets': 0, 'resources_size': 0,
+                                  'apis': 0, 'requests': 0, 'failed_requests': 0, 'avg_response_time': 0,
+                                  'latency': LatencyHistogram(), 'links': 0, 'new_links': 0})
+        result['url'] = url
+        result['status'] = status
+        result['elapsed'] = elapsed
+        self.results.append(result)
+        writer.writerow([url, self.STATUS_LABELS[status], round(elapsed, 3), round(result['total_load_time'], 3),
+                         round(result['html_load_time'], 3), round(result['page_size'] / 1024, 2),
+                         result['resources'], round(result['resources_size'] / 1024, 2), result['apis'],
+                         result['requests'], result['failed_requests'], round(result['avg_response_time'], 3),
+                         result['error'] or ''])
+        record = {key: value for key, value in result.items()
+                  if key not in ('depth', 'links', 'new_links', 'shared_assets')}
+        record['latency'] = result['latency'].percentiles()
+        jsonl_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        color = Fore.GREEN if status == 'ok' else Fore.RED
+        detail = f"{result['total_load_time']:.2f} s" if status == 'ok' else result['error']
+        print(f"{color}[{len(self.results)}] {self.STATUS_LABELS[status]}: {url} ({detail})")
+
+    def batch_summary(self):
+        """
+        Estatísticas agregadas do lote
+        """
+        analyzed = [result for result in self.results if result['status'] == 'ok']
+        load_times = [result['total_load_time'] for result in analyzed]
+        statuses = {status: sum(1 for result in self.results if result['status'] == status)
+                    for status in self.STATUS_LABELS}
+        return {
+            'urls': len(self.results),
+            'statuses': statuses,
+            'total_time': self.total_time,
+            'throughput': len(self.results) / self.total_time if self.total_time else 0,
+            'processes': self.processes,
+            'workers_started': self.workers_started,
+            'load_time_mean': statistics.mean(load_times) if load_times else 0,
+            'load_time_median': statistics.median(load_times) if load_times else 0,
+            'load_time_p90': SiteCrawler._percentile(load_times, 0.9),
+            'load_time_max': max(load_times) if load_times else 0,
+            'requests': sum(result['requests'] for result in self.results),
+            'failed_requests': sum(result['failed_requests'] for result in self.results),
+            'request_latency': LatencyHistogram.merged(result['latency'] for result in self.results).percentiles()
+        }
+
+    def generate_report(self):
+        """
+        Gera o resumo do lote (CSV com os agregados, as URLs mais lentas e as falhas)
+
+        Returns:
+            str: Caminho do resumo
+        """
+        summary = self.batch_summary()
+        summary_filename = os.path.join(self.output_dir, f"batch_{self.report_timestamp}_summary.csv")
+        with open(summary_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Métrica', 'Valor'])
+            writer.writerow(['URLs Processadas', summary['urls']])
+            for status, count in summary['statuses'].items():
+                writer.writerow([f'URLs ({self.STATUS_LABELS[status]})', count])
+            writer.writerow(['Tempo do Lote (s)', round(summary['total_time'], 3)])
+            writer.writerow(['URLs por Minuto', round(summary['throughput'] * 60, 2)])
+            writer.writerow(['Processos', summary['processes']])
+            writer.writerow(['Processos Iniciados', summary['workers_started']])
+            writer.writerow(['Tempo Médio por Página (s)', round(summary['load_time_mean'], 3)])
+            writer.writerow(['Tempo Mediano por Página (s)', round(summary['load_time_median'], 3)])
+            writer.writerow(['Tempo P90 por Página (s)', round(summary['load_time_p90'], 3)])
+            writer.writerow(['Tempo Máximo por Página (s)', round(summary['load_time_max'], 3)])
+            writer.writerow(['Requisições', summary['requests']])
+            writer.writerow(['Requisições com Falha', summary['failed_requests']])
+            for fraction in LatencyHistogram.PERCENTILES:
+                label = LatencyHistogram.percentile_label(fraction)
+                writer.writerow([f'Latência das Requisições {label.upper()} (s)',
+                                 round(summary['request_latency'][label], 3)])
+            writer.writerow(['', ''])
+            writer.writerow(['URL Mais Lenta', 'Tempo Total (s)'])
+            for result in self._slowest():
+                writer.writerow([result['url'], round(result['total_load_time'], 3)])
+            failures = [result for result in self.results if result['status'] != 'ok']
+            if failures:
+                writer.writerow(['', ''])
+                writer.writerow(['URL com Falha', 'Status', 'Erro'])
+                for result in failures:
+                    writer.writerow([result['url'], self.STATUS_LABELS[result['status']], result['error']])
+        return summary_filename
+
+    def _slowest(self, limit=10):
+        return sorted((result for result in self.results if result['status'] == 'ok'),
+                      key=lambda result: result['total_load_time'], reverse=True)[:limit]
+
+    def print_summary(self):
+        summary = self.batch_summary()
+        print(f"\n{Fore.CYAN}{'=' * 70}")
+        print(f"{Fore.CYAN}RESUMO DO LOTE")
+        print(f"{Fore.CYAN}{'=' * 70}")
+        print(f"URLs processadas: {summary['urls']} em {summary['total_time']:.2f} segundos "
+              f"({summary['throughput'] * 60:.1f} por minuto, {summary['processes']} processos)")
+        print(", ".join(f"{self.STATUS_LABELS[status]}: {count}" for status, count in summary['statuses'].items()))
+        print(f"Tempo por página: média {summary['load_time_mean']:.2f}s, mediana {summary['load_time_median']:.2f}s, "
+              f"P90 {summary['load_time_p90']:.2f}s, máximo {summary['load_time_max']:.2f}s")
+        print("Latência das requisições: " + ", ".join(
+            f"{LatencyHistogram.percentile_label(fraction)} "
+            f"{summary['request_latency'][LatencyHistogram.percentile_label(fraction)] * 1000:.0f} ms"
+            for fraction in LatencyHistogram.PERCENTILES))
+        slowest = self._slowest(5)
+        if slowest:
+            print(f"\n{Fore.MAGENTA}PÁGINAS MAIS LENTAS:")
+            for result in slowest:
+                print(f"  {result['total_load_time']:.2f}s  {result['url']}")
+        for result in self.results:
+            if result['status'] != 'ok':
+                print(f"  {Fore.RED}{self.STATUS_LABELS[result['status']]} em {result['url']}: {result['error']}")
+
+
+class LoadTestRecorder:
+    """
+    Amostras de um teste de carga, agregadas por tipo de recurso e por intervalo de tempo
+
+    Cada amostra entra no total do seu tipo, no total geral e no intervalo (de
+    interval segundos desde o início do teste) em que a requisição terminou, junto
+    com o número de usuários virtuais ativos naquele momento. É o que permite ver a
+    latência subir conforme a carga aumenta na rampa. As latências ficam em
+    LatencyHistogram, então a memória não cresce com a duração do teste.
+    """
+    TOTAL = 'total'
+
+    def __init__(self, interval=5):
+        self.interval = interval
+        self.start_time = None
+        self.end_time = None
+        self.active_users = 0
+        self._lock = threading.Lock()
+        self.by_type = {}
+        self.timeline = {}
+
+    @staticmethod
+    def _new_bucket():
+        return {'latencies': LatencyHistogram(), 'errors': 0, 'bytes': 0}
+
+    def begin(self):
+        self.start_time = time.perf_counter()
+
+    def finish(self):
+        self.end_time = time.perf_counter()
+
+    def user_started(self):
+        with self._lock:
+            self.active_users += 1
+
+    def user_stopped(self):
+        with self._lock:
+            self.active_users -= 1
+
+    def record(self, resource_type, latency, ok, size=0, finished_at=None):
+        """
+        Registra uma requisição (latência em segundos) terminada em finished_at (perf_counter)
+        """
+        finished_at = time.perf_counter() if finished_at is None else finished_at
+        index = max(0, int((finished_at - self.start_time) // self.interval))
+        with self._lock:
+            interval = self.timeline.setdefault(index, {'active_users': 0, 'types': {}})
+            interval['active_users'] = max(interval['active_users'], self.active_users)
+            buckets = (self.by_type.setdefault(resource_type, self._new_bucket()),
+                       self.by_type.setdefault(self.TOTAL, self._new_bucket()),
+                       interval['types'].setdefault(resource_type, self._new_bucket()),
+                       interval['types'].setdefault(self.TOTAL, self._new_bucket()))
+            for bucket in buckets:
+                bucket['latencies'].record(latency)
+                bucket['errors'] += 0 if ok else 1
+                bucket['bytes'] += size or 0
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    @staticmethod
+    def _stats(bucket, seconds):
+        latencies = bucket['latencies'].percentiles()
+        requests_count = latencies['count']
+        return dict(latencies, **{
+            'requests': requests_count,
+            'errors': bucket['errors'],
+            'error_rate': bucket['errors'] / requests_count if requests_count else 0,
+            'throughput': requests_count / seconds if seconds else 0,
+            'bytes': bucket['bytes']
+        })
+
+    def summary(self):
+        """
+        Estatísticas do teste inteiro por tipo de recurso (e 'total')
+        """
+        with self._lock:
+            return {resource_type: self._stats(bucket, self.elapsed)
+                    for resource_type, bucket in self.by_type.items()}
+
+    def timeline_rows(self):
+        """
+        (início do intervalo em s, usuários ativos, tipo, estatísticas) de cada intervalo
+        """
+        rows = []
+        with self._lock:
+            for index in sorted(self.timeline):
+                interval = self.timeline[index]
+                seconds = min(self.interval, self.elapsed - index * self.interval)
+                for resource_type, bucket in interval['types'].items():
+                    rows.append((index * self.interval, interval['active_users'], resource_type,
+                                 self._stats(bucket, max(seconds, 1e-9))))
+        return rows
+
+    # Colunas das estatísticas nos relatórios CSV dos testes de carga
+    CSV_HEADER = ['Requisições', 'Erros', 'Taxa de Erro (%)', 'Vazão (req/s)', 'Média (ms)',
+                  'P50 (ms)', 'P90 (ms)', 'P95 (ms)', 'P99 (ms)', 'Máximo (ms)']
+
+    @staticmethod
+    def csv_row(stats):
+        return [stats['requests'], stats['errors'], round(stats['error_rate'] * 100, 2),
+                round(stats['throughput'], 2)] + [round(stats[key] * 1000, 1)
+                                                  for key in ('mean', 'p50', 'p90', 'p95', 'p99', 'max')]
+
+    def write_csv(self, writer, active_label='Usuários Ativos'):
+        """
+        Escreve as estatísticas por tipo de recurso e a linha do tempo no CSV
+        """
+        writer.writerow(['Tipo de Recurso'] + self.CSV_HEADER)
+        for resource_type, stats in self.summary().items():
+            writer.writerow([resource_type] + self.csv_row(stats))
+        writer.writerow(['', ''])
+        writer.writerow(['Início do Intervalo (s)', active_label, 'Tipo de Recurso'] + self.CSV_HEADER)
+        for start, active, resource_type, stats in self.timeline_rows():
+            writer.writerow([start, active, resource_type] + self.csv_row(stats))
+
+    def print_table(self):
+        print(f"{'Tipo':<10}{'Req.':>8}{'Req/s':>9}{'Erros':>8}{'P50 ms':>9}{'P90 ms':>9}{'P95 ms':>9}"
+              f"{'P99 ms':>9}{'Máx. ms':>9}")
+        for resource_type, stats in sorted(self.summary().items(), key=lambda item: item[0] == self.TOTAL):
+            color = Fore.RED if stats['error_rate'] > 0.01 else ''
+            print(f"{color}{resource_type:<10}{stats['requests']:>8}{stats['throughput']:>9.1f}"
+                  f"{stats['error_rate'] * 100:>7.1f}%{stats['p50'] * 1000:>9.0f}{stats['p90'] * 1000:>9.0f}"
+                  f"{stats['p95'] * 1000:>9.0f}{stats['p99'] * 1000:>9.0f}{stats['max'] * 1000:>9.0f}")
+
+    def interval_stats(self, index, resource_type=TOTAL):
+        with self._lock:
+            interval = self.timeline.get(index)
+            bucket = interval['types'].get(resource_type) if interval else None
+            if bucket is None:
+                return None
+            return interval['active_users'], self._stats(bucket, self.interval)
+
+
+class LoadTest:
+    """
+    Teste de carga em malha fechada com usuários virtuais sobre a página analisada
+
+    Cada usuário virtual repete o conjunto de requisições descoberto pela análise
+    (o HTML e, em seguida, seus recursos, um de cada vez), espera o tempo de reflexão
+    e recomeça, até o fim do teste. Os usuários entram aos poucos durante a rampa.
+    Como cada um só faz a próxima requisição quando a anterior termina, a vazão cai
+    quando o servidor fica lento: é o comportamento de usuários reais, não uma taxa
+    fixa de requisições. Cada usuário tem sua própria sessão e suas conexões.
+    """
+    def __init__(self, tester, users=10, duration=60, ramp_up=0, think_time=1.0, interval=5, timeout=30):
+        """
+        Args:
+            tester (WebsitePerformanceTester): Análise já executada; seus recursos formam as requisições
+            users (int): Usuários virtuais simultâneos
+            duration (float): Duração do teste em segundos, incluindo a rampa
+            ramp_up (float): Tempo em segundos até todos os usuários estarem ativos
+            think_time (float): Pausa média em segundos entre as repetições de cada usuário
+                                (varia entre 50% e 150% para os usuários não ficarem sincronizados)
+            interval (float): Duração em segundos de cada intervalo da linha do tempo
+            timeout (float): Timeout em segundos de cada requisição
+        """
+        self.url = tester.url
+        self.domain = tester.domain
+        self.output_dir = tester.output_dir
+        self.headers = dict(tester.session.headers)
+        self.plan = self.request_plan(tester)
+        self.users = max(1, int(users))
+        self.duration = duration
+        self.ramp_up = min(ramp_up, duration)
+        self.think_time = think_time
+        self.timeout = timeout
+        self.recorder = LoadTestRecorder(interval)
+        self.iterations = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # Alvos de request_plan: a página inteira, só os recursos ou só as APIs
+    PLAN_TARGETS = ('page', 'resources', 'apis')
+
+    @staticmethod
+    def request_plan(tester, targets='page'):
+        """
+        Requisições de uma repetição: o HTML e os recursos que carregaram na análise
+
+        Reaproveita os recursos já extraídos pela análise, sem baixar nem ler o HTML de novo.
+        Com targets='resources' o HTML fica de fora; com targets='apis' o plano tem as
+        APIs detectadas que responderam com sucesso.
         """
-        import io
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        img_str = base64.b64encode(buf.read()).decode('utf-8')
-        return img_str
-    
-    def _generate_status_codes_graph(self, timestamp, domain):
+        plan = [('html', tester.url)] if targets == 'page' else []
+        groups = tester.apis if targets == 'apis' else tester.resources
+        for resource_type, resources in groups.items():
+            for resource in resources:
+                if 'alias_of' in resource or resource.get('error') or resource.get('skipped'):
+                    continue
+                if not 200 <= (resource.get('status_code') or 0) < 400:
+                    continue
+                plan.append((resource_type, resource['url']))
+        return plan
+
+    def run(self):
         """
-        Gera gráfico de distribuição de códigos de status HTTP
+        Executa o teste, exibindo a linha do tempo a cada intervalo
         """
+        print(f"{Fore.CYAN}Teste de carga: {self.users} usuários virtuais por {self.duration:.0f} s "
+              f"(rampa de {self.ramp_up:.0f} s, reflexão de {self.think_time:.1f} s, "
+              f"{len(self.plan)} requisições por repetição)")
+        self.recorder.begin()
+        threads = [threading.Thread(target=self._virtual_user, args=(index,), daemon=True)
+                   for index in range(self.users)]
+        for thread in threads:
+            thread.start()
+        interval = self.recorder.interval
+        next_index = 0
         try:
-            if not self.http_stats['status_codes']:
-                print(f"{Fore.YELLOW}Aviso: Não há dados de status HTTP para gerar gráfico")
-                return
-            
-            plt.figure(figsize=(10, 6))
-            
-            status_codes = list(self.http_stats['status_codes'].keys())
-            counts = list(self.http_stats['status_codes'].values())
-            
-            if not status_codes or not counts:
-                print(f"{Fore.YELLOW}Aviso: Não há códigos de status HTTP para gerar gráfico")
-                plt.close()
-                return
-            
-            # Definir cores Material Design com base nas faixas de status
-            colors = ['#4CAF50' if code == 200 else      # Verde para 200
-                     '#2196F3' if 200 <= code < 300 else # Azul para 2xx
-                     '#FF9800' if 300 <= code < 400 else # Laranja para 3xx
-                     '#F44336' if 400 <= code < 500 else # Vermelho para 4xx
-                     '#9C27B0' if 500 <= code < 600 else # Roxo para 5xx
-                     '#9E9E9E' for code in status_codes] # Cinza para outros
-            
-            plt.bar(status_codes, counts, color=colors)
-            
-            plt.xlabel('Código de Status HTTP')
-            plt.ylabel('Número de Requisições')
-            plt.title('Distribuição de Códigos de Status HTTP')
-            plt.xticks(status_codes)
-            plt.grid(axis='y', linestyle='--', alpha=0.3)
-            
-            # Adicionar rótulos de contagem acima das barras
-            for i, count in enumerate(counts):
-                plt.text(status_codes[i], count + 0.1, str(count), ha='center')
-            
-            plt.tight_layout()
-            
-            # Salvar o gráfico como arquivo e em base64
-            file_path = f"{self.graphs_dir}/status_codes_{domain}_{timestamp}.png"
-            plt.savefig(file_path, dpi=100)
-            self.graph_images['status_codes'] = self._fig_to_base64(plt.gcf())
-            plt.close()
-            
-        except Exception as e:
-            print(f"{Fore.RED}Erro ao gerar gráfico de códigos de status: {str(e)}")
-            # Fechar qualquer figura pendente em caso de erro
-            plt.close('all')
-    
-    def _generate_size_distribution_graph(self, timestamp, domain):
+            while any(thread.is_alive() for thread in threads):
+                self._stop.wait(min(interval, max(0.05, (next_index + 1) * interval - self.recorder.elapsed)))
+                while (next_index + 1) * interval <= self.recorder.elapsed:
+                    self._print_interval(next_index)
+                    next_index += 1
+        except KeyboardInterrupt:
+            print(f"{Fore.YELLOW}Teste de carga interrompido")
+            self._stop.set()
+            for thread in threads:
+                thread.join(self.timeout)
+        self.recorder.finish()
+
+    def _print_interval(self, index):
+        stats = self.recorder.interval_stats(index)
+        if stats is None:
+            return
+        active_users, total = stats
+        print(f"  [{index * self.recorder.interval:>5.0f}s] {active_users:>4} usuários, "
+              f"{total['throughput']:.1f} req/s, erros {total['error_rate'] * 100:.1f}%, "
+              f"p50 {total['p50'] * 1000:.0f} ms, p90 {total['p90'] * 1000:.0f} ms, p99 {total['p99'] * 1000:.0f} ms")
+
+    def _virtual_user(self, index):
+        # Entrada escalonada na rampa
+        if self._stop.wait(self.ramp_up * index / self.users):
+            return
+        ends_at = self.recorder.start_time + self.duration
+        session = requests.Session()
+        session.headers.update(self.headers)
+        self.recorder.user_started()
+        try:
+            while time.perf_counter() < ends_at and not self._stop.is_set():
+                for resource_type, url in self.plan:
+                    if time.perf_counter() >= ends_at or self._stop.is_set():
+                        break
+                    self._fetch(session, resource_type, url)
+                else:
+                    with self._lock:
+                        self.iterations += 1
+                pause = self.think_time * (0.5 + random.random())
+                self._stop.wait(max(0, min(pause, ends_at - time.perf_counter())))
+        finally:
+            self.recorder.user_stopped()
+            session.close()
+
+    def _fetch(self, session, resource_type, url):
+        started = time.perf_counter()
+        size = 0
+        try:
+            response = session.get(url, timeout=self.timeout)
+            size = len(response.content)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        finished = time.perf_counter()
+        self.recorder.record(resource_type, finished - started, ok, size, finished)
+
+    def generate_report(self):
         """
-        Gera gráfico de distribuição de tamanho por tipo de recurso
+        Gera o CSV do teste de carga: estatísticas por tipo de recurso e linha do tempo
+
+        Returns:
+            str: Caminho do relatório
         """
-        try:
-            # Coletar dados para o gráfico
-            resource_types = []
-            total_sizes_kb = []
-            
-            for resource_type, resources in self.resources.items():
-                if resources:
-                    resource_types.append(resource_type)
-                    total_size = sum(resource.get('size', 0) for resource in resources) / 1024  # em KB
-                    total_sizes_kb.append(total_size)
-            
-            # Verificar se há dados suficientes para criar o gráfico
-            if not resource_types or not total_sizes_kb or sum(total_sizes_kb) == 0:
-                print(f"{Fore.YELLOW}Aviso: Não há dados de tamanho suficientes para gerar gráfico de distribuição")
-                return
-                
-            plt.figure(figsize=(10, 6))
-            
-            # Cores Material Design para o gráfico de pizza
-            colors = ['#2196F3', '#4CAF50', '#FFC107', '#F44336', '#9C27B0', '#FF5722']
-            
-            # Gráfico de pizza
-            plt.pie(total_sizes_kb, labels=resource_types, autopct='%1.1f%%',
-                   shadow=True, startangle=140, explode=[0.05] * len(resource_types),
-                   colors=colors[:len(resource_types)])
-            
-            plt.axis('equal')
-            plt.title('Distribuição de Tamanho por Tipo de Recurso (KB)')
-            plt.tight_layout()
-            
-            # Salvar o gráfico como arquivo e em base64
-            file_path = f"{self.graphs_dir}/size_distribution_{domain}_{timestamp}.png"
-            plt.savefig(file_path, dpi=100)
-            self.graph_images['size_distribution'] = self._fig_to_base64(plt.gcf())
-            plt.close()
-            
-            # Verificar dados para o gráfico TTFB
-            resource_types_with_times = []
-            avg_response_times = []
-            
-            for resource_type, resources in self.resources.items():
-                if resources:
-                    times = [resource.get('time_to_first_byte', 0) for resource in resources if resource.get('time_to_first_byte')]
-                    if times:
-                        resource_types_with_times.append(resource_type)
-                        avg_response_times.append(sum(times) / len(times))
-            
-            # Verificar se há dados suficientes para criar o gráfico TTFB
-            if resource_types_with_times and avg_response_times:
-                plt.figure(figsize=(10, 6))
-                plt.bar(resource_types_with_times, avg_response_times, color='#673AB7')
-                plt.xlabel('Tipo de Recurso')
-                plt.ylabel('Tempo até o Primeiro Byte (s)')
-                plt.title('Tempo Médio de Resposta (TTFB) por Tipo de Recurso')
-                plt.grid(axis='y', linestyle='--', alpha=0.3)
-                plt.tight_layout()
-                
-                # Salvar o gráfico como arquivo e em base64
-                file_path = f"{self.graphs_dir}/ttfb_distribution_{domain}_{timestamp}.png"
-                plt.savefig(file_path, dpi=100)
-                self.graph_images['ttfb_distribution'] = self._fig_to_base64(plt.gcf())
-                plt.close()
-            else:
-                print(f"{Fore.YELLOW}Aviso: Não há dados TTFB suficientes para gerar gráfico")
-                
-        except Exception as e:
-            print(f"{Fore.RED}Erro ao gerar gráficos de distribuição: {str(e)}")
-            # Fechar qualquer figura pendente em caso de erro
-            plt.close('all')
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.output_dir, f"load_test_{self.domain.replace(':', '_')}_{timestamp}.csv")
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Métrica', 'Valor'])
+            writer.writerow(['URL', self.url])
+            writer.writerow(['Usuários Virtuais', self.users])
+            writer.writerow(['Duração (s)', round(self.recorder.elapsed, 2)])
+            writer.writerow(['Rampa (s)', self.ramp_up])
+            writer.writerow(['Tempo de Reflexão (s)', self.think_time])
+            writer.writerow(['Requisições por Repetição', len(self.plan)])
+            writer.writerow(['Repetições Completas', self.iterations])
+            writer.writerow(['', ''])
+            self.recorder.write_csv(writer)
+        return filename
 
     def print_summary(self):
+        print(f"\n{Fore.CYAN}{'=' * 70}")
+        print(f"{Fore.CYAN}RESUMO DO TESTE DE CARGA")
+        print(f"{Fore.CYAN}{'=' * 70}")
+        print(f"{self.users} usuários virtuais em {self.recorder.elapsed:.1f} segundos, "
+              f"{self.iterations} repetições completas")
+        self.recorder.print_table()
+
+
+class OpenLoopLoadTest:
+    """
+    Gerador de carga em malha aberta, com taxa de chegada constante
+
+    As requisições são agendadas em uma linha do tempo fixa (a i-ésima sai em
+    início + i / rate), sem esperar as anteriores terminarem, e percorrem as URLs do
+    plano em rodízio. Se o servidor fica lento, as requisições se acumulam em vez de
+    a taxa cair. A latência é medida a partir do instante em que a requisição deveria
+    ter saído, não de quando saiu de fato: se todos os workers estavam ocupados e ela
+    esperou na fila, essa espera entra na latência (correção de coordinated omission).
+    O tempo de serviço (do envio real à resposta) também é registrado, para comparar.
+    Requisições enviadas mais de LATE_THRESHOLD segundos depois do agendado contam
+    como atrasadas.
+    """
+    LATE_THRESHOLD = 0.01
+
+    def __init__(self, urls, rate, duration=60, max_inflight=256, interval=5, timeout=30, headers=None,
+                 output_dir="reports", name=None):
         """
-        Imprime um resumo da análise
+        Args:
+            urls (list): (tipo, url) das requisições, usadas em rodízio
+                         (ex.: LoadTest.request_plan(tester, 'apis'))
+            rate (float): Requisições por segundo
+            duration (float): Duração em segundos
+            max_inflight (int): Requisições simultâneas no máximo; além disso elas esperam
+                                na fila e o atraso aparece na latência
+            interval (float): Duração em segundos de cada intervalo da linha do tempo
+            timeout (float): Timeout em segundos de cada requisição
+            headers (dict): Cabeçalhos das requisições (ex.: os da sessão da análise)
+            output_dir (str): Diretório do relatório
+            name (str): Identificação no nome do relatório (padrão: host da primeira URL)
         """
-        total_resources = sum(len(resources) for resources in self.resources.values())
-        total_size = self.page_size + sum(
-            resource.get('size', 0) for resource_type in self.resources.values() 
-            for resource in resource_type
-        )
-        
-        # Contagem total de APIs analisadas
-        total_apis = sum(len([api for api in apis if api.get('analyzed', False)]) for apis in self.apis.values())
-        
+        if not urls:
+            raise ValueError("nenhuma URL para o teste de taxa constante")
+        self.urls = urls
+        self.rate = rate
+        self.duration = duration
+        self.max_inflight = max(1, int(max_inflight))
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.output_dir = output_dir
+        self.name = name or urlparse(urls[0][1]).netloc
+        self.recorder = LoadTestRecorder(interval)
+        self.service_recorder = LoadTestRecorder(interval)
+        self.scheduled = 0
+        self.late = 0
+        self.send_lags = LatencyHistogram()
+        self._lock = threading.Lock()
+        self._sessions = threading.local()
+        self._stop = threading.Event()
+
+    def _session(self):
+        session = getattr(self._sessions, 'session', None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def run(self):
+        """
+        Agenda as requisições na taxa pedida durante a duração do teste
+        """
+        total = int(self.rate * self.duration)
+        print(f"{Fore.CYAN}Taxa constante: {self.rate:g} req/s por {self.duration:.0f} s "
+              f"({total} requisições em {len(self.urls)} URLs, até {self.max_inflight} simultâneas)")
+        executor = ThreadPoolExecutor(max_workers=self.max_inflight)
+        self.recorder.begin()
+        self.service_recorder.start_time = self.recorder.start_time
+        start = self.recorder.start_time
+        next_print = 1
+        try:
+            for index in range(total):
+                intended = start + index / self.rate
+                delay = intended - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                resource_type, url = self.urls[index % len(self.urls)]
+                executor.submit(self._fetch, resource_type, url, intended)
+                self.scheduled += 1
+                while next_print * self.recorder.interval <= time.perf_counter() - start:
+                    self._print_interval(next_print - 1)
+                    next_print += 1
+        except KeyboardInterrupt:
+            print(f"{Fore.YELLOW}Teste de taxa constante interrompido")
+            self._stop.set()
+        executor.shutdown(wait=True, cancel_futures=self._stop.is_set())
+        self.recorder.finish()
+        self.service_recorder.end_time = self.recorder.end_time
+        while (next_print - 1) * self.recorder.interval < self.recorder.elapsed:
+            self._print_interval(next_print - 1)
+            next_print += 1
+
+    def _print_interval(self, index):
+        stats = self.recorder.interval_stats(index)
+        if stats is None:
+            return
+        inflight, total = stats
+        print(f"  [{index * self.recorder.interval:>5.0f}s] {total['throughput']:.1f} req/s concluídas, "
+              f"{inflight} em andamento, erros {total['error_rate'] * 100:.1f}%, "
+              f"p50 {total['p50'] * 1000:.0f} ms, p99 {total['p99'] * 1000:.0f} ms")
+
+    def _fetch(self, resource_type, url, intended):
+        sent = time.perf_counter()
+        lag = sent - intended
+        with self._lock:
+            self.send_lags.record(lag)
+            if lag > self.LATE_THRESHOLD:
+                self.late += 1
+        self.recorder.user_started()
+        size = 0
+        try:
+            response = self._session().get(url, timeout=self.timeout)
+            size = len(response.content)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        finally:
+            self.recorder.user_stopped()
+        finished = time.perf_counter()
+        self.recorder.record(resource_type, finished - intended, ok, size, finished)
+        self.service_recorder.record(resource_type, finished - sent, ok, size, finished)
+
+    def schedule_summary(self):
+        """
+        Aderência ao agendamento: requisições atrasadas e atraso de envio
+        """
+        with self._lock:
+            lags = self.send_lags.percentiles()
+        elapsed = self.recorder.elapsed
+        return {
+            'scheduled': self.scheduled,
+            'sent': lags['count'],
+            'late': self.late,
+            'late_rate': self.late / lags['count'] if lags['count'] else 0,
+            'lag_p50': lags['p50'],
+            'lag_p99': lags['p99'],
+            'lag_max': lags['max'],
+            'achieved_rate': lags['count'] / elapsed if elapsed else 0
+        }
+
+    def generate_report(self):
+        """
+        Gera o CSV do teste: agendamento, latência corrigida (do envio agendado) e tempo de serviço
+
+        Returns:
+            str: Caminho do relatório
+        """
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.output_dir, f"rate_test_{self.name.replace(':', '_')}_{timestamp}.csv")
+        schedule = self.schedule_summary()
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['Métrica', 'Valor'])
+            writer.writerow(['Taxa Pedida (req/s)', self.rate])
+            writer.writerow(['Taxa de Envio Obtida (req/s)', round(schedule['achieved_rate'], 2)])
+            writer.writerow(['Duração (s)', round(self.recorder.elapsed, 2)])
+            writer.writerow(['URLs', len(self.urls)])
+            writer.writerow(['Requisições Agendadas', schedule['scheduled']])
+            writer.writerow(['Requisições Enviadas', schedule['sent']])
+            writer.writerow([f'Requisições Atrasadas (> {self.LATE_THRESHOLD * 1000:.0f} ms)', schedule['late']])
+            writer.writerow(['Requisições Atrasadas (%)', round(schedule['late_rate'] * 100, 2)])
+            writer.writerow(['Atraso de Envio P50 (ms)', round(schedule['lag_p50'] * 1000, 1)])
+            writer.writerow(['Atraso de Envio P99 (ms)', round(schedule['lag_p99'] * 1000, 1)])
+            writer.writerow(['Atraso de Envio Máximo (ms)', round(schedule['lag_max'] * 1000, 1)])
+            writer.writerow(['', ''])
+            writer.writerow(['Latência a partir do envio agendado (corrigida)'])
+            self.recorder.write_csv(writer, active_label='Requisições em Andamento')
+            writer.writerow(['', ''])
+            writer.writerow(['Tempo de serviço (a partir do envio real)'])
+            writer.writerow(['Tipo de Recurso'] + LoadTestRecorder.CSV_HEADER)
+            for resource_type, stats in self.service_recorder.summary().items():
+                writer.writerow([resource_type] + LoadTestRecorder.csv_row(stats))
+        return filename
+
+    def print_summary(self):
+        schedule = self.schedule_summary()
         print(f"\n{Fore.CYAN}{'=' * 70}")
-        print(f"{Fore.CYAN}RESUMO DA ANÁLISE")
+        print(f"{Fore.CYAN}RESUMO DO TESTE DE TAXA CONSTANTE")
         print(f"{Fore.CYAN}{'=' * 70}")
-        print(f"URL analisada: {self.url}")
-        print(f"Total de recursos: {total_resources}")
-        print(f"Total de possíveis APIs/endpoints: {total_apis}")
-        print(f"Tamanho total da página: {total_size/1024/1024:.2f} MB")
-        print(f"Tempo total de carregamento: {self.total_load_time:.2f} segundos")
-        
-        # Resumo HTTP
-        print(f"\n{Fore.MAGENTA}ESTATÍSTICAS HTTP:")
-        print(f"  Total de requisições: {self.http_stats['total_requests']}")
-        print(f"  Requisições com falha: {self.http_stats['failed_requests']}")
-        
-        # Tempos de resposta
-        if self.http_stats['response_times']:
-            print(f"  Tempo médio de resposta: {statistics.mean(self.http_stats['response_times']):.3f}s")
-            print(f"  Tempo mínimo de resposta: {min(self.http_stats['response_times']):.3f}s")
-            print(f"  Tempo máximo de resposta: {max(self.http_stats['response_times']):.3f}s")
-            if len(self.http_stats['response_times']) > 1:
-                print(f"  Desvio padrão: {statistics.stdev(self.http_stats['response_times']):.3f}s")
-        
-        # Distribuição de códigos de status
-        print(f"\n{Fore.MAGENTA}CÓDIGOS DE STATUS HTTP:")
-        for status, count in sorted(self.http_stats['status_codes'].items()):
-            status_color = Fore.GREEN if status == 200 else (
-                           Fore.BLUE if 200 <= status < 300 else (
-                           Fore.YELLOW if 300 <= status < 400 else (
-                           Fore.RED if 400 <= status < 500 else Fore.RED)))
-            print(f"  {status_color}Status {status}: {count} requisições")
-        
-        # Top 5 tipos de conteúdo
-        content_types = sorted(self.http_stats['content_types'].items(), key=lambda x: x[1], reverse=True)[:5]
-        if content_types:
-            print(f"\n{Fore.MAGENTA}TOP 5 TIPOS DE CONTEÚDO:")
-            for content_type, count in content_types:
-                print(f"  {content_type}: {count} recursos")
-        
-        # Estatísticas por tipo de recurso
-        print(f"\n{Fore.CYAN}DETALHES POR TIPO DE RECURSO:")
-        for resource_type, resources in self.resources.items():
-            if resources:
-                type_size = sum(resource.get('size', 0) for resource in resources)
-                type_time = sum(resource.get('load_time', 0) for resource in resources)
-                print(f"\n{Fore.YELLOW}{resource_type.upper()}:")
-                print(f"  Quantidade: {len(resources)}")
-                print(f"  Tamanho total: {type_size/1024:.2f} KB")
-                print(f"  Tempo médio de carregamento: {type_time/len(resources):.2f} segundos")
-                
-                # Estatísticas específicas para cada tipo de recurso
-                if resource_type == 'images' and resources:
-                    # Calcular tamanho médio de imagens
-                    avg_img_size = type_size / len(resources) / 1024  # em KB
-                    print(f"  Tamanho médio das imagens: {avg_img_size:.2f} KB")
-                    
-                    # Contar imagens por formato
-                    formats = {}
-                    for img in resources:
-                        fmt = img.get('img_format', 'Unknown')
-                        formats[fmt] = formats.get(fmt, 0) + 1
-                    
-                    print(f"  Formatos de imagens:")
-                    for fmt, count in formats.items():
-                        if fmt != 'Unknown':
-                            print(f"    - {fmt}: {count}")
-                    
-                    # Imagens sem texto alternativo
-                    no_alt = sum(1 for img in resources if not img.get('alt_text'))
-                    if no_alt > 0:
-                        print(f"  {Fore.RED}Imagens sem texto alternativo: {no_alt} ({no_alt/len(resources)*100:.1f}%)")
-                
-                elif resource_type == 'js':
-                    # Contar scripts async/defer
-                    async_scripts = sum(1 for js in resources if js.get('async') == 'async')
-                    defer_scripts = sum(1 for js in resources if js.get('defer') == 'defer')
-                    
-                    if async_scripts > 0:
-                        print(f"  Scripts assíncronos: {async_scripts} ({async_scripts/len(resources)*100:.1f}%)")
-                    if defer_scripts > 0:
-                        print(f"  Scripts com defer: {defer_scripts} ({defer_scripts/len(resources)*100:.1f}%)")
-        
-        # Resumo de APIs detectadas
-        if total_apis > 0:
-            print(f"\n{Fore.CYAN}APIS E ENDPOINTS DETECTADOS:")
-            for api_type, apis in self.apis.items():
-                analyzed_apis = [api for api in apis if api.get('analyzed', False)]
-                if analyzed_apis:
-                    avg_time = sum(api.get('load_time', 0) for api in analyzed_apis) / len(analyzed_apis)
-                    print(f"\n{Fore.YELLOW}{api_type.upper()}:")
-                    print(f"  Quantidade: {len(analyzed_apis)}")
-                    print(f"  Tempo médio de resposta: {avg_time:.3f} segundos")
-                    
-                    # Listar URLs das APIs (limitado a 5 para não sobrecarregar o console)
-                    if len(analyzed_apis) <= 5:
-                        for api in analyzed_apis:
-                            status = api.get('status_code', 0)
-                            status_color = Fore.GREEN if status == 200 else (
-                                           Fore.YELLOW if 300 <= status < 400 else Fore.RED)
-                            print(f"  - {status_color}{api['url']} ({status})")
-                    else:
-                        print(f"  {len(analyzed_apis)} endpoints encontrados. Veja o relatório para detalhes.")
-        
-        # Estatísticas de cache
-        cached_resources = sum(1 for resource_type in self.resources.values() 
-                              for resource in resource_type 
-                              if 'max-age' in resource.get('cache_control', ''))
-        
-        # Estatísticas de compressão
-        compressed_resources = sum(1 for resource_type in self.resources.values() 
-                                  for resource in resource_type 
-                                  if resource.get('content_encoding') not in ['none', None, ''])
-        
-        print(f"\n{Fore.CYAN}OTIMIZAÇÃO DO SITE:")
-        if cached_resources > 0:
-            cached_percent = cached_resources / total_resources * 100
-            print(f"{Fore.GREEN}Recursos com cache configurado: {cached_resources} ({cached_percent:.1f}%)")
-        
-        if compressed_resources > 0:
-            compressed_percent = compressed_resources / total_resources * 100
-            print(f"{Fore.GREEN}Recursos comprimidos: {compressed_resources} ({compressed_percent:.1f}%)")
-        
-        # Tempos médios de carregamento
-        if self.http_stats['response_times']:
-            slow_resources = sum(1 for resource_type in self.resources.values() 
-                                for resource in resource_type 
-                                if resource.get('load_time', 0) > 0.5)
-            
-            if slow_resources > 0:
-                slow_percent = slow_resources / total_resources * 100
-                print(f"{Fore.YELLOW}Recursos lentos (>0.5s): {slow_resources} ({slow_percent:.1f}%)")
-        
-        print(f"\n{Fore.CYAN}{'=' * 70}\n")
+        print(f"Taxa pedida: {self.rate:g} req/s; enviadas {schedule['sent']} de {schedule['scheduled']} "
+              f"agendadas ({schedule['achieved_rate']:.1f} req/s) em {self.recorder.elapsed:.1f} segundos")
+        color = Fore.RED if schedule['late_rate'] > 0.01 else Fore.GREEN
+        print(f"{color}Atrasadas em relação ao agendamento: {schedule['late']} "
+              f"({schedule['late_rate'] * 100:.1f}%); atraso de envio P50 {schedule['lag_p50'] * 1000:.1f} ms, "
+              f"P99 {schedule['lag_p99'] * 1000:.1f} ms, máximo {schedule['lag_max'] * 1000:.1f} ms")
+        print(f"\n{Fore.MAGENTA}LATÊNCIA A PARTIR DO ENVIO AGENDADO:")
+        self.recorder.print_table()
+        total = self.service_recorder.summary().get(LoadTestRecorder.TOTAL)
+        if total:
+            print(f"\nTempo de serviço (do envio real): p50 {total['p50'] * 1000:.0f} ms, "
+                  f"p99 {total['p99'] * 1000:.0f} ms, máximo {total['max'] * 1000:.0f} ms")
 
 
 def main():
@@ -1848,7 +6964,14 @@ def main():
     Função principal
     """
     parser = argparse.ArgumentParser(description='Analisador de Performance de Websites')
-    parser.add_argument('--url', required=True, help='URL do site a ser analisado')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--url', help='URL do site a ser analisado')
+    source.add_argument('--sitemap',
+                        help='URL de um sitemap.xml (ou índice de sitemaps, .xml.gz aceito) cujas páginas '
+                             'serão analisadas, lidas em streaming; gera o relatório do site')
+    source.add_argument('--batch',
+                        help='Arquivo com URLs a analisar, uma por linha, em um pool de processos; gera um '
+                             'CSV e um JSONL combinados com uma linha por URL e um resumo do lote')
     parser.add_argument('--output', default='reports', help='Diretório para salvar relatórios (padrão: reports)')
     parser.add_argument('--detail-level', choices=['basic', 'full'], default='full', 
                         help='Nível de detalhe das métricas (basic: métricas básicas, full: todas as métricas)')
@@ -1864,24 +6987,174 @@ def main():
                         help='Formato da lista de recursos (text: exibe no terminal, csv: salva em arquivo)')
     parser.add_argument('--assets-table', action='store_true',
                         help='Exibe uma tabela completa com todos os assets, tamanhos em KB e tempos em ms')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Número máximo de requisições simultâneas na análise de recursos '
+                             '(padrão: 8 com backend requests, 100 com asyncio)')
+    parser.add_argument('--max-per-host', type=int, default=4,
+                        help='Número máximo de requisições simultâneas por host (padrão: 4)')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Analisa os recursos um a um, sem concorrência (para comparação)')
+    parser.add_argument('--adaptive-concurrency', action='store_true',
+                        help='Ajusta o limite por host durante a análise: cresce enquanto o TTFB se mantém '
+                             'estável e recua em 429/503 (respeitando Retry-After), TTFB em alta ou erros')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Executa as etapas simultaneamente: recursos são baixados assim que aparecem '
+                             'no HTML e APIs encontradas nos scripts voltam para a fila de downloads')
+    parser.add_argument('--backend', choices=sorted(TRANSPORT_BACKENDS), default='requests',
+                        help='Transporte HTTP (requests: pool de threads, asyncio: event loop com aiohttp)')
+    parser.add_argument('--image-metadata-only', action='store_true',
+                        help='Lê apenas o cabeçalho das imagens via Range (dimensões e formato), sem baixá-las inteiras')
+    parser.add_argument('--max-resource-mb', type=float, default=None,
+                        help='Limite de MB lidos por recurso; acima disso o download é interrompido e marcado como truncado')
+    parser.add_argument('--deadline', type=float, default=None,
+                        help='Tempo máximo em segundos para toda a análise; requisições pendentes ao fim do prazo '
+                             'são ignoradas e listadas no relatório')
+    parser.add_argument('--scan-processes', type=int, default=0,
+                        help='Processos para detectar APIs em scripts grandes (>= 256 KB) fora da thread '
+                             'principal (padrão: 0, desativado)')
+    parser.add_argument('--html-parser', choices=HTML_PARSERS, default='stream',
+                        help='Extração de recursos do HTML (stream: passada única sem montar a árvore, '
+                             'bs4: BeautifulSoup)')
+    parser.add_argument('--probe-wordlist', default=None,
+                        help='Arquivo com os caminhos a sondar em busca de APIs, um por linha '
+                             '(padrão: lista interna com 18 caminhos comuns)')
+    parser.add_argument('--probe-deadline', type=float, default=15,
+                        help='Tempo máximo em segundos de toda a sondagem de endpoints (padrão: 15)')
+    parser.add_argument('--no-dns-prefetch', action='store_true',
+                        help='Não resolve antecipadamente os hosts dos recursos; cada conexão resolve o seu')
+    parser.add_argument('--exclude-dns', action='store_true',
+                        help='Deixa a resolução DNS fora do TTFB e do tempo total das requisições, para '
+                             'comparar execuções; os tempos de DNS por host continuam no relatório')
+    parser.add_argument('--dns-ttl', type=float, default=60,
+                        help='Validade em segundos das resoluções em cache quando o TTL do registro não é '
+                             'conhecido (padrão: 60; com dnspython instalado vale o TTL do registro)')
+    parser.add_argument('--crawl', action='store_true',
+                        help='Varre o site a partir da URL, seguindo links da mesma origem, e gera um '
+                             'relatório do site com estatísticas por página e agregadas')
+    parser.add_argument('--max-pages', type=int, default=20,
+                        help='Máximo de páginas analisadas na varredura (padrão: 20)')
+    parser.add_argument('--max-depth', type=int, default=2,
+                        help='Máximo de links de distância da página inicial na varredura (padrão: 2)')
+    parser.add_argument('--include', action='append', default=None,
+                        help='Expressão regular de caminhos a analisar na varredura (pode repetir)')
+    parser.add_argument('--exclude', action='append', default=None,
+                        help='Expressão regular de caminhos a ignorar na varredura (pode repetir)')
+    parser.add_argument('--page-workers', type=int, default=2,
+                        help='Páginas analisadas simultaneamente na varredura (padrão: 2)')
+    parser.add_argument('--since', default=None,
+                        help='Com --sitemap, analisa apenas URLs com lastmod a partir desta data (AAAA-MM-DD)')
+    parser.add_argument('--sample', type=float, default=None,
+                        help='Com --sitemap, fração das URLs analisadas (0 a 1), escolhidas pelo hash da URL')
+    parser.add_argument('--sample-seed', default='0',
+                        help='Semente da amostragem do sitemap; a mesma semente repete a amostra (padrão: 0)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Com --batch, processos analisando URLs ao mesmo tempo (padrão: número de CPUs, até 4)')
+    parser.add_argument('--url-timeout', type=float, default=300,
+                        help='Com --batch, tempo máximo em segundos da análise de uma URL; ao exceder, o '
+                             'processo é encerrado e a URL marcada como tempo esgotado (padrão: 300)')
+    parser.add_argument('--load-users', type=int, default=0,
+                        help='Após a análise, executa um teste de carga com este número de usuários virtuais, '
+                             'cada um repetindo o HTML e os recursos encontrados (padrão: 0, desativado)')
+    parser.add_argument('--load-duration', type=float, default=60,
+                        help='Duração em segundos do teste de carga, incluindo a rampa (padrão: 60)')
+    parser.add_argument('--ramp-up', type=float, default=0,
+                        help='Tempo em segundos até todos os usuários virtuais estarem ativos (padrão: 0)')
+    parser.add_argument('--think-time', type=float, default=1.0,
+                        help='Pausa média em segundos entre as repetições de cada usuário virtual (padrão: 1)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Após a análise, envia requisições a esta taxa constante (req/s) durante '
+                             '--load-duration, sem esperar as respostas (padrão: 0, desativado)')
+    parser.add_argument('--rate-targets', choices=LoadTest.PLAN_TARGETS, default='apis',
+                        help='URLs do teste de taxa constante: APIs detectadas (padrão), recursos ou a página inteira')
+    parser.add_argument('--rate-urls', default=None,
+                        help='Arquivo com as URLs do teste de taxa constante, uma por linha (substitui --rate-targets)')
+    parser.add_argument('--max-inflight', type=int, default=256,
+                        help='Requisições simultâneas no máximo no teste de taxa constante (padrão: 256)')
+    parser.add_argument('--load-interval', type=float, default=5,
+                        help='Intervalo em segundos da linha do tempo do teste de carga (padrão: 5)')
+    parser.add_argument('--samples', type=int, default=1,
+                        help='Medições de cada recurso; com mais de uma, o relatório ordena os recursos pela '
+                             'mediana das medições quentes e mostra a medição fria à parte (padrão: 1)')
+    parser.add_argument('--response-cache-mb', type=float, default=64,
+                        help='Limite de memória (MB) do cache de respostas compartilhado entre as etapas (padrão: 64)')
     
     args = parser.parse_args()
+    if args.since:
+        try:
+            datetime.strptime(args.since, '%Y-%m-%d')
+        except ValueError:
+            parser.error('--since deve estar no formato AAAA-MM-DD')
+    if args.sample is not None and not 0 < args.sample <= 1:
+        parser.error('--sample deve estar entre 0 (exclusivo) e 1')
+    if args.samples < 1:
+        parser.error('--samples deve ser pelo menos 1')
     
     print(f"{Fore.CYAN}{'=' * 70}")
     print(f"{Fore.CYAN}{'ANALISADOR DE PERFORMANCE DE WEBSITES':^70}")
     print(f"{Fore.CYAN}{'=' * 70}")
     
-    tester = WebsitePerformanceTester(args.url, args.output)
+    tester_options = dict(max_workers=args.workers,
+                          max_per_host=args.max_per_host,
+                          sequential=args.sequential,
+                          backend=args.backend,
+                          response_cache_bytes=int(args.response_cache_mb * 1024 * 1024),
+                          image_metadata_only=args.image_metadata_only,
+                          max_resource_bytes=int(args.max_resource_mb * 1024 * 1024) if args.max_resource_mb else None,
+                          request_timeout=args.timeout,
+                          deadline=args.deadline,
+                          scan_processes=args.scan_processes,
+                          html_parser=args.html_parser,
+                          pipeline=args.pipeline,
+                          probe_wordlist=args.probe_wordlist,
+                          probe_deadline=args.probe_deadline,
+                          adaptive_concurrency=args.adaptive_concurrency,
+                          dns_prefetch=not args.no_dns_prefetch,
+                          exclude_dns=args.exclude_dns,
+                          dns_ttl=args.dns_ttl,
+                          samples=args.samples)
+    
+    if args.batch:
+        runner = BatchRunner(BatchRunner.read_url_file(args.batch), args.output, processes=args.processes,
+                             url_timeout=args.url_timeout, user_agent=args.user_agent, **tester_options)
+        runner.run()
+        summary_report = runner.generate_report()
+        runner.print_summary()
+        print(f"{Fore.GREEN}Lote completo! Resultados: {runner.csv_filename} e {runner.jsonl_filename}")
+        print(f"{Fore.GREEN}Resumo do lote: {summary_report}")
+        return
+    
+    if args.crawl or args.sitemap:
+        url_source = None
+        if args.sitemap:
+            sitemap_session = requests.Session()
+            if args.user_agent:
+                sitemap_session.headers.update({'User-Agent': args.user_agent})
+            url_source = SitemapReader(args.sitemap, sitemap_session, timeout=args.timeout, since=args.since,
+                                       sample=args.sample, sample_seed=args.sample_seed)
+        crawler = SiteCrawler(args.sitemap or args.url, args.output, max_pages=args.max_pages,
+                              max_depth=args.max_depth, include=args.include, exclude=args.exclude,
+                              page_workers=args.page_workers, user_agent=args.user_agent,
+                              url_source=url_source, **tester_options)
+        crawler.crawl()
+        csv_report, html_report = crawler.generate_report()
+        crawler.print_summary()
+        print(f"{Fore.GREEN}Varredura completa! Relatório do site: {csv_report}")
+        if html_report:
+            print(f"{Fore.GREEN}Relatório HTML do site: {html_report}")
+        return
+    
+    tester = WebsitePerformanceTester(args.url, args.output, **tester_options)
     
-    # Configurar timeout personalizado se especificado
-    if args.timeout != 30:
-        tester.session.timeout = args.timeout
-        
     # Configurar User-Agent personalizado se especificado
     if args.user_agent:
         tester.session.headers.update({'User-Agent': args.user_agent})
     
-    tester.analyze_website()
+    try:
+        tester.analyze_website()
+    except requests.RequestException:
+        sys.exit(1)
+    finally:
+        tester.close()
     
     # Gerar lista rápida de recursos se solicitado
     if args.list_resources:
@@ -1924,6 +7197,31 @@ def main():
             print(f"{Fore.RED}O relatório HTML não foi encontrado no caminho esperado.")
     else:
         print(f"{Fore.RED}Relatório HTML não foi gerado devido a um erro. Verifique o log para detalhes.")
+    
+    # Teste de carga sobre as requisições descobertas na análise
+    if args.load_users > 0:
+        load_test = LoadTest(tester, users=args.load_users, duration=args.load_duration, ramp_up=args.ramp_up,
+                             think_time=args.think_time, interval=args.load_interval, timeout=args.timeout)
+        load_test.run()
+        load_test.print_summary()
+        print(f"{Fore.GREEN}Relatório do teste de carga: {load_test.generate_report()}")
+    
+    # Teste de taxa constante (malha aberta)
+    if args.rate > 0:
+        if args.rate_urls:
+            rate_urls = [('urls', url) for url in BatchRunner.read_url_file(args.rate_urls)]
+        else:
+            rate_urls = LoadTest.request_plan(tester, args.rate_targets)
+        if not rate_urls:
+            print(f"{Fore.YELLOW}Nenhuma URL para o teste de taxa constante ({args.rate_targets}); usando a página")
+            rate_urls = [('html', tester.url)]
+        rate_test = OpenLoopLoadTest(rate_urls, args.rate, duration=args.load_duration,
+                                     max_inflight=args.max_inflight, interval=args.load_interval,
+                                     timeout=args.timeout, headers=tester.session.headers,
+                                     output_dir=args.output, name=tester.domain)
+        rate_test.run()
+        rate_test.print_summary()
+        print(f"{Fore.GREEN}Relatório do teste de taxa constante: {rate_test.generate_report()}")
 
 
 if __name__ == "__main__":
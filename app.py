@@ -3,7 +3,7 @@ import os
 import uuid
 import threading
 import time
-from _pyFormanceTest import WebsitePerformanceTester
+from _pyFormanceTest import WebsitePerformanceTester, SharedConnectionPool, TRANSPORT_BACKENDS
 
 app = Flask(__name__)
 
@@ -16,12 +16,21 @@ def serve_report(filename):
 # Global dictionary to store analysis jobs
 analysis_jobs = {}
 
-def analyze_website_task(job_id, url):
+# Processes shared by all jobs for scanning large scripts, so the regex work does
+# not hold the GIL of the request and progress-polling threads
+SCAN_PROCESSES = max(1, (os.cpu_count() or 2) - 1)
+
+# Connections kept across jobs (requests backend), so analyzing many pages on the same
+# domains does not pay new TCP/TLS handshakes to the same CDNs on every job
+CONNECTION_POOL = SharedConnectionPool.shared(pool_maxsize=16, max_hosts=100, idle_timeout=60)
+
+def analyze_website_task(job_id, url, backend='requests', cold=False):
     """
     Function to run the website analysis in a separate thread
     """
     job = analysis_jobs[job_id]
     job['status'] = 'running'
+    tester = None
     
     try:
         # Create a WebsitePerformanceTester instance with the progress callback
@@ -31,7 +40,11 @@ def analyze_website_task(job_id, url):
             job['resource_info'] = resource_info
         
         # Initialize the tester with the callback
-        tester = WebsitePerformanceTester(url, progress_callback=progress_update)
+        # Cold jobs open their own connections to measure a true first visit
+        connection_pool = CONNECTION_POOL if backend == 'requests' and not cold else None
+        tester = WebsitePerformanceTester(url, progress_callback=progress_update, backend=backend,
+                                          scan_processes=SCAN_PROCESSES,
+                                          connection_pool=connection_pool)
         
         # Run the analysis
         tester.analyze_website()
@@ -64,6 +77,9 @@ def analyze_website_task(job_id, url):
         job['error'] = str(e)
         job['message'] = f"Erro na análise: {str(e)}"
         print(f"Erro na análise: {str(e)}")
+    finally:
+        if tester is not None:
+            tester.close()
 
 @app.route('/')
 def index():
@@ -77,12 +93,20 @@ def analyze():
     if not url:
         return jsonify({'error': 'URL is required'}), 400
     
+    backend = request.form.get('backend', 'requests')
+    if backend not in TRANSPORT_BACKENDS:
+        return jsonify({'error': f'Unknown backend: {backend}'}), 400
+    
+    cold = request.form.get('cold') == '1'
+    
     # Create a new job ID
     job_id = str(uuid.uuid4())
     
     # Initialize job data
     analysis_jobs[job_id] = {
         'url': url,
+        'backend': backend,
+        'cold': cold,
         'status': 'initialized',
         'progress': 0,
         'message': 'Iniciando análise...',
@@ -93,7 +117,7 @@ def analyze():
     }
     
     # Start the analysis in a separate thread
-    thread = threading.Thread(target=analyze_website_task, args=(job_id, url))
+    thread = threading.Thread(target=analyze_website_task, args=(job_id, url, backend, cold))
     thread.daemon = True
     thread.start()
     
@@ -123,6 +147,11 @@ def job_status(job_id):
         'error': job['error']
     })
 
+@app.route('/connection_pool')
+def connection_pool_stats():
+    """API endpoint with the shared connection pool usage per host"""
+    return jsonify(CONNECTION_POOL.stats())
+
 @app.route('/results/<job_id>')
 def results(job_id):
     """Show the analysis results"""
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks das rotinas de análise do _pyFormanceTest
+
+Uso:
+    python benchmark.py js-scanner                      # bundles sintéticos de 2 e 5 MB
+    python benchmark.py js-scanner --sizes 1 3 5        # outros tamanhos (MB)
+    python benchmark.py js-scanner --files app.min.js   # bundles reais
+    python benchmark.py html-extractor                  # páginas sintéticas de 1 e 3 MB
+    python benchmark.py html-extractor --files page.html
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from colorama import Fore, init
+
+from _pyFormanceTest import JsApiScanner, HtmlResourceExtractor, extract_page_resources_bs4
+
+init(autoreset=True)
+
+
+# Implementação anterior de _analyze_js_for_api_calls (um re.findall por padrão),
+# mantida como referência de desempenho e de resultados
+LEGACY_API_PATTERNS = {
+    "fetch": r'fetch\([\'"]([^\'"]+)[\'"]',
+    "xhr": r'\.open\([\'"](?:GET|POST|PUT|DELETE)[\'"],\s*[\'"]([^\'"]+)[\'"]',
+    "ajax": r'\.ajax\(\s*{\s*url:\s*[\'"]([^\'"]+)[\'"]',
+    "axios": r'axios\.(?:get|post|put|delete)\([\'"]([^\'"]+)[\'"]',
+    "api_url": r'(?:api_url|apiUrl|API_URL|url|URL)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
+    "endpoint": r'(?:endpoint|Endpoint|ENDPOINT)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
+    "service_url": r'(?:service|serviceUrl|service_url)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
+    "graphql": r'(?:graphql|GraphQL)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]',
+    "products": r'(?:products|product|productId|productIds)[\'"]?\s*(?:=|:)\s*[\'"]([^\'"]+)[\'"]'
+}
+
+
+def legacy_scan(js_content):
+    """
+    Detecção de APIs como era feita antes do JsApiScanner
+    """
+    matches = []
+    for pattern_name, pattern in LEGACY_API_PATTERNS.items():
+        for match in re.findall(pattern, js_content):
+            matches.append((pattern_name, match))
+    return matches
+
+
+# Trechos que imitam um bundle minificado: muito código sem interesse e,
+# de vez em quando, uma chamada de API
+FILLER_WORDS = ['function', 'return', 'var', 'this', 'e', 't', 'n', 'r', 'url', 'data',
+                'length', 'push', 'call', 'apply', 'then', 'catch', 'prototype', 'Object',
+                'window', 'document', 'product', 'service', 'config', 'options', 'request',
+                'response', 'headers', 'JSON', 'parse', '"use strict"', '"click"', "'div'"]
+FILLER_SEPARATORS = ['.', '(', ')', ',', ';', '=', '{', '}', '&&', '||', ':', '?', '!0', '[', ']']
+API_SNIPPETS = [
+    'fetch("/api/v1/items/{n}")',
+    'x.open("GET","/rest/orders/{n}",!0)',
+    '$.ajax({{url:"/services/cart/{n}"}})',
+    'axios.get("/api/users/{n}")',
+    'apiUrl:"https://api.example.com/v2/{n}"',
+    'endpoint="/graphql/{n}"',
+    'productId:"sku-{n}"',
+    'service_url:"/svc/{n}"'
+]
+
+
+def generate_bundle(size, seed=0):
+    """
+    Gera um JavaScript minificado sintético com aproximadamente size caracteres
+    """
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.005:
+            part = rng.choice(API_SNIPPETS).format(n=rng.randint(0, 9999))
+        else:
+            part = (rng.choice(FILLER_WORDS) + rng.choice(FILLER_SEPARATORS)
+                    + rng.choice(string.ascii_letters))
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)
+
+
+# Blocos de uma página renderizada no servidor (listagem de produtos de e-commerce)
+PAGE_HEAD = """<!DOCTYPE html><html lang="pt-br"><head><meta charset="utf-8"><title>Loja</title>
+<link rel="stylesheet" href="/static/css/main.css"><link rel="preload font" href="/static/fonts/inter.woff2">
+<style>@import "/static/css/theme.css"; .card{{display:flex}}</style>
+<script src="/static/js/vendor.js" defer></script><script src="/static/js/app.js" async></script>
+<script>window.__STATE__={{"apiUrl":"/api/v1/state"}};</script></head><body>
+"""
+PAGE_ITEM = """<div class="card product" data-id="{n}"><a href="/produto/{n}">
+<picture><source srcset="/img/p{n}.webp 1x, /img/p{n}@2x.webp 2x" type="image/webp">
+<img src="/img/p{n}.jpg" alt="Produto {n}" width="300" height="300" loading="lazy"
+ srcset="/img/p{n}-480.jpg 480w, /img/p{n}-960.jpg 960w"></picture></a>
+<h3 class="title">Produto {n} &amp; acessórios</h3><p class="price">R$ {n},90</p>
+<ul class="specs"><li>Cor: azul</li><li>Tamanho: M</li><li>Garantia: 12 meses</li></ul>
+<button class="buy" onclick="addToCart({n})">Comprar</button></div>
+"""
+PAGE_EXTRA = """<script>dataLayer.push({{"event":"view","id":{n}}});</script>
+<iframe src="/widgets/review/{n}" loading="lazy"></iframe><video src="/media/v{n}.mp4" muted></video>
+"""
+
+
+def generate_page(size, seed=0):
+    """
+    Gera um HTML sintético renderizado no servidor com aproximadamente size caracteres
+    """
+    rng = random.Random(seed)
+    parts = [PAGE_HEAD.format()]
+    total = len(parts[0])
+    n = 0
+    while total < size:
+        part = PAGE_ITEM.format(n=n)
+        if rng.random() < 0.05:
+            part += PAGE_EXTRA.format(n=n)
+        parts.append(part)
+        total += len(part)
+        n += 1
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def best_time(function, argument, repeat):
+    """
+    Menor tempo de execução entre as repetições e o resultado da última
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_js_scanner(args):
+    """
+    Compara o JsApiScanner (passada única) com a implementação anterior
+    """
+    bundles = []
+    for path in args.files or []:
+        with open(path, encoding='utf-8', errors='replace') as js_file:
+            bundles.append((path, js_file.read()))
+    if not bundles:
+        for size_mb in args.sizes:
+            bundles.append((f"sintético {size_mb} MB", generate_bundle(int(size_mb * 1024 * 1024))))
+
+    scanner = JsApiScanner()
+    print(f"{Fore.CYAN}{'Bundle':<30}{'Tamanho':>12}{'Anterior (s)':>15}{'Scanner (s)':>15}{'Ganho':>9}  Resultados")
+    for label, js_content in bundles:
+        legacy_time, legacy_matches = best_time(legacy_scan, js_content, args.repeat)
+        scanner_time, scanner_matches = best_time(scanner.scan, js_content, args.repeat)
+
+        # Mesmo conjunto de (padrão, url) nas duas implementações
+        same = set(legacy_matches) == {(name, url) for name, url, _ in scanner_matches}
+        status = f"{Fore.GREEN}iguais" if same else f"{Fore.RED}DIFERENTES"
+        speedup = legacy_time / scanner_time if scanner_time else 0
+        print(f"{label[-30:]:<30}{len(js_content) / 1024 / 1024:>10.2f}MB"
+              f"{legacy_time:>15.3f}{scanner_time:>15.3f}{speedup:>8.1f}x  {status} ({len(scanner_matches)})")
+
+
+def benchmark_html_extractor(args):
+    """
+    Compara o HtmlResourceExtractor (passada única) com o caminho do BeautifulSoup
+    """
+    pages = []
+    for path in args.files or []:
+        with open(path, encoding='utf-8', errors='replace') as html_file:
+            pages.append((path, html_file.read()))
+    if not pages:
+        for size_mb in args.sizes:
+            pages.append((f"sintética {size_mb} MB", generate_page(int(size_mb * 1024 * 1024))))
+
+    base_url = 'https://www.exemplo.com.br/'
+    print(f"{Fore.CYAN}{'Página':<30}{'Tamanho':>12}{'BeautifulSoup (s)':>20}{'Passada única (s)':>20}{'Ganho':>9}  Resultados")
+    for label, html in pages:
+        bs4_time, bs4_page = best_time(lambda text: extract_page_resources_bs4(text, base_url), html, args.repeat)
+        stream_time, stream_page = best_time(lambda text: HtmlResourceExtractor.extract(text, base_url), html, args.repeat)
+
+        # Mesmos candidatos, na mesma ordem, nos dois extratores
+        same = vars(bs4_page) == vars(stream_page)
+        status = f"{Fore.GREEN}iguais" if same else f"{Fore.RED}DIFERENTES"
+        total = sum(len(value) for value in vars(stream_page).values() if isinstance(value, list))
+        speedup = bs4_time / stream_time if stream_time else 0
+        print(f"{label[-30:]:<30}{len(html) / 1024 / 1024:>10.2f}MB"
+              f"{bs4_time:>20.3f}{stream_time:>20.3f}{speedup:>8.1f}x  {status} ({total})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do Analisador de Performance de Websites')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    js_parser = subparsers.add_parser('js-scanner', help='Detecção de APIs em JavaScript (JsApiScanner)')
+    js_parser.add_argument('--sizes', type=float, nargs='+', default=[2, 5],
+                           help='Tamanhos em MB dos bundles sintéticos (padrão: 2 5)')
+    js_parser.add_argument('--files', nargs='+', help='Arquivos JavaScript reais a usar no lugar dos sintéticos')
+    js_parser.add_argument('--repeat', type=int, default=3,
+                           help='Repetições por bundle; vale o menor tempo (padrão: 3)')
+    js_parser.set_defaults(function=benchmark_js_scanner)
+
+    html_parser = subparsers.add_parser('html-extractor', help='Extração de recursos do HTML (HtmlResourceExtractor)')
+    html_parser.add_argument('--sizes', type=float, nargs='+', default=[1, 3],
+                             help='Tamanhos em MB das páginas sintéticas (padrão: 1 3)')
+    html_parser.add_argument('--files', nargs='+', help='Arquivos HTML reais a usar no lugar dos sintéticos')
+    html_parser.add_argument('--repeat', type=int, default=3,
+                             help='Repetições por página; vale o menor tempo (padrão: 3)')
+    html_parser.set_defaults(function=benchmark_html_extractor)
+
+    args = parser.parse_args()
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()